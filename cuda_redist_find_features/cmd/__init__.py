@@ -3,15 +3,36 @@ from pathlib import Path
 import click
 from pydantic import HttpUrl
 
-from cuda_redist_find_features.types import LogLevel, Version, VersionConstraint
+from cuda_redist_find_features.types import Engine, LogLevel, Shard, TaskOrder, Version, VersionConstraint
 
 from .argument import manifest_dir_argument, url_argument
 from .option import (
     cleanup_option,
+    detect_jobs_option,
+    disk_budget_option,
+    engine_option,
+    feature_cache_option,
+    feature_cache_path_option,
+    fetch_jobs_option,
+    http_cache_option,
+    http_cache_path_option,
+    http_connections_option,
+    incremental_option,
     log_level_option,
+    max_size_option,
     max_version_option,
+    memory_budget_option,
     min_version_option,
+    nix_batch_size_option,
+    nix_jobs_option,
     no_parallel_option,
+    no_unpack_option,
+    order_option,
+    resume_option,
+    retain_size_option,
+    retention_path_option,
+    shard_option,
+    unpack_jobs_option,
     version_option,
 )
 
@@ -26,6 +47,9 @@ def main() -> None:
 @manifest_dir_argument(file_okay=False, dir_okay=True)
 @log_level_option
 @no_parallel_option
+@http_cache_option
+@http_cache_path_option
+@http_connections_option
 @min_version_option
 @max_version_option
 @version_option
@@ -34,6 +58,9 @@ def download_manifests(
     manifest_dir: Path,
     log_level: LogLevel,
     no_parallel: bool,
+    http_cache: bool,
+    http_cache_path: Path,
+    http_connections: int,
     min_version: None | Version,
     max_version: None | Version,
     version: None | Version,
@@ -51,6 +78,9 @@ def download_manifests(
         url=url,
         manifest_dir=manifest_dir,
         no_parallel=no_parallel,
+        http_cache=http_cache,
+        http_cache_path=http_cache_path,
+        http_connections=http_connections,
         version_constraint=version_constraint,
     )
 
@@ -61,7 +91,24 @@ def download_manifests(
 # @overrides_json_argument
 @log_level_option
 @cleanup_option
+@no_unpack_option
 @no_parallel_option
+@engine_option
+@fetch_jobs_option
+@unpack_jobs_option
+@detect_jobs_option
+@nix_jobs_option
+@nix_batch_size_option
+@order_option
+@disk_budget_option
+@memory_budget_option
+@retain_size_option
+@retention_path_option
+@feature_cache_option
+@feature_cache_path_option
+@resume_option
+@incremental_option
+@shard_option
 @min_version_option
 @max_version_option
 @version_option
@@ -71,11 +118,33 @@ def process_manifests(
     # overrides_json: Path,
     log_level: LogLevel,
     cleanup: bool,
+    no_unpack: bool,
     no_parallel: bool,
+    engine: Engine,
+    fetch_jobs: int,
+    unpack_jobs: None | int,
+    detect_jobs: None | int,
+    nix_jobs: None | int,
+    nix_batch_size: None | int,
+    order: TaskOrder,
+    disk_budget: None | int,
+    memory_budget: None | int,
+    retain_size: None | int,
+    retention_path: Path,
+    feature_cache: bool,
+    feature_cache_path: Path,
+    resume: bool,
+    incremental: bool,
+    shard: None | Shard,
     min_version: None | Version,
     max_version: None | Version,
     version: None | Version,
 ) -> None:
+    if disk_budget is not None and not cleanup:
+        raise click.BadParameter("Cannot specify --disk-budget without --cleanup.", param_hint="--disk-budget")
+    if retain_size is not None and not cleanup:
+        raise click.BadParameter("Cannot specify --retain-size without --cleanup.", param_hint="--retain-size")
+
     # Lazily import so our callback on log_level sets the logging level first.
     from .process_manifests_impl import process_manifests_impl
 
@@ -90,11 +159,74 @@ def process_manifests(
         manifest_dir=manifest_dir,
         # overrides_json=overrides_json,
         cleanup=cleanup,
+        no_unpack=no_unpack,
         no_parallel=no_parallel,
+        engine=engine,
+        fetch_jobs=fetch_jobs,
+        unpack_jobs=unpack_jobs,
+        detect_jobs=detect_jobs,
+        nix_jobs=nix_jobs,
+        nix_batch_size=nix_batch_size,
+        order=order,
+        disk_budget=disk_budget,
+        memory_budget=memory_budget,
+        retain_size=retain_size,
+        retention_path=retention_path,
+        feature_cache=feature_cache,
+        feature_cache_path=feature_cache_path,
+        resume=resume,
+        incremental=incremental,
+        shard=shard,
         version_constraint=version_constraint,
     )
 
 
+@main.command()
+@manifest_dir_argument(file_okay=False, dir_okay=True)
+@log_level_option
+@min_version_option
+@max_version_option
+@version_option
+def merge_features(
+    manifest_dir: Path,
+    log_level: LogLevel,
+    min_version: None | Version,
+    max_version: None | Version,
+    version: None | Version,
+) -> None:
+    # Lazily import so our callback on log_level sets the logging level first.
+    from .merge_features_impl import merge_features_impl
+
+    # Create the version constraint
+    version_constraint = VersionConstraint(
+        version_min=min_version,
+        version_max=max_version,
+        version=version,
+    )
+    merge_features_impl(manifest_dir=manifest_dir, version_constraint=version_constraint)
+
+
+@main.command()
+@log_level_option
+@feature_cache_path_option
+def feature_cache_stats(log_level: LogLevel, feature_cache_path: Path) -> None:
+    # Lazily import so our callback on log_level sets the logging level first.
+    from .feature_cache_impl import feature_cache_stats_impl
+
+    feature_cache_stats_impl(feature_cache_path=feature_cache_path)
+
+
+@main.command()
+@log_level_option
+@feature_cache_path_option
+@max_size_option
+def evict_feature_cache(log_level: LogLevel, feature_cache_path: Path, max_size: int) -> None:
+    # Lazily import so our callback on log_level sets the logging level first.
+    from .feature_cache_impl import evict_feature_cache_impl
+
+    evict_feature_cache_impl(feature_cache_path=feature_cache_path, max_size=max_size)
+
+
 @main.command()
 def print_manifest_schema() -> None:
     import json
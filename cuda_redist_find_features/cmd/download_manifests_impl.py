@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import logging
-import time
-from collections.abc import Iterable, Mapping
-from concurrent.futures import ThreadPoolExecutor
+import os
+from collections.abc import Callable, Mapping, Sequence
+from contextlib import nullcontext
 from functools import partial
+from itertools import islice
 from pathlib import Path
 
 from pydantic import FilePath, HttpUrl
@@ -13,25 +14,33 @@ from rich.table import Table
 
 from cuda_redist_find_features import utilities
 from cuda_redist_find_features.manifest.nvidia import NvidiaManifestRef
-from cuda_redist_find_features.types import Task, VersionConstraint
+from cuda_redist_find_features.types import (
+    FutureStatus,
+    HttpCache,
+    HttpClient,
+    Pipeline,
+    PipelineStage,
+    Task,
+    TaskTracker,
+    VersionConstraint,
+)
 
 MyTask = Task[NvidiaManifestRef[HttpUrl], NvidiaManifestRef[FilePath]]
 
 
-def make_grid(height: int, tasks: Iterable[MyTask]) -> Table:
+def make_grid(height: int, tracker: TaskTracker[NvidiaManifestRef[HttpUrl]]) -> Table:
     grid = Table(box=None, pad_edge=False, expand=True, width=80, min_width=80)
     grid.add_column("Progress", width=10, min_width=10, max_width=10)
     grid.add_column("Version", width=70, min_width=70, max_width=70)
 
-    # Group the tasks by status
-    incomplete_tasks: Iterable[MyTask] = [task for task in tasks if MyTask.is_running(task)] + [
-        task for task in tasks if MyTask.is_waiting(task)
-    ]
-
     # Priorities: running > waiting > completed
     # Print tasks which are in progress before those that are waiting.
-    for task in incomplete_tasks[:height]:
-        grid.add_row(task.status.value, str(task.initial.version))
+    for status in (FutureStatus.RUNNING, FutureStatus.WAITING):
+        for manifest_ref in islice(tracker.keys(status), height):
+            grid.add_row(status.value, str(manifest_ref.version))
+        height -= tracker.count(status)
+        if height <= 0:
+            break
 
     return grid
 
@@ -40,6 +49,9 @@ def download_manifests_impl(
     url: HttpUrl,
     manifest_dir: Path,
     no_parallel: bool,
+    http_cache: bool,
+    http_cache_path: Path,
+    http_connections: int,
     version_constraint: VersionConstraint,
 ) -> None:
     """
@@ -49,44 +61,62 @@ def download_manifests_impl(
 
     Neither MANIFEST_DIR nor its parent directory need to exist.
 
+    Unless --no-http-cache is given, the directory listing and manifests are only downloaded when they have changed
+    since they were last downloaded, and manifests in MANIFEST_DIR are only rewritten when their content changed.
+
     Example:
         download_manifests https://developer.download.nvidia.com/compute/cutensor/redist /tmp/cutensor_manifests
     """
-    # Parse and filter
-    manifest_refs = NvidiaManifestRef[HttpUrl].from_ref(url, version_constraint)
+    with (
+        HttpClient.open(max_connections_per_host=http_connections) as client,
+        HttpCache.open(http_cache_path) if http_cache else nullcontext() as cache,
+    ):
+        # Parse and filter
+        manifest_refs = NvidiaManifestRef[HttpUrl].from_ref(url, version_constraint, client, cache)
+
+        # Ensure directory exists
+        manifest_dir.mkdir(parents=True, exist_ok=True)
 
-    # Ensure directory exists
-    manifest_dir.mkdir(parents=True, exist_ok=True)
+        # Curry
+        fn = partial(NvidiaManifestRef[HttpUrl].download, dir=manifest_dir, http_client=client, http_cache=cache)
+        download_all(manifest_refs, fn, no_parallel)
 
-    # Curry
-    fn = partial(NvidiaManifestRef[HttpUrl].download, dir=manifest_dir)
 
+def download_all(
+    manifest_refs: Sequence[NvidiaManifestRef[HttpUrl]],
+    fn: Callable[[NvidiaManifestRef[HttpUrl]], NvidiaManifestRef[FilePath]],
+    no_parallel: bool,
+) -> None:
+    """
+    Downloads the manifests with `fn`, displaying their progress.
+    """
     # If logging level is less than or equal to warning severity, display the table.
     display_table = utilities.LOGGING_LEVEL >= logging.WARNING
 
+    # Matches the default number of workers of a ThreadPoolExecutor, since downloads are I/O bound.
+    workers = 1 if no_parallel else min(32, (os.cpu_count() or 1) + 4)
+
+    # Futures report their progress to the tracker, so the table is only redrawn when something changes.
+    tracker = TaskTracker[NvidiaManifestRef[HttpUrl]]()
+
     with (
         Live(auto_refresh=False) as live,
-        ThreadPoolExecutor(max_workers=1 if no_parallel else None) as executor,
+        Pipeline[NvidiaManifestRef[HttpUrl], NvidiaManifestRef[FilePath]].start(
+            [PipelineStage("download", fn, workers)], on_start=tracker.notify_running
+        ) as pipeline,
     ):
         # Initial tasks
         tasks: Mapping[HttpUrl, MyTask] = {
-            manifest_ref.ref: Task.submit(
-                executor,
-                manifest_ref,
-                fn,
-            )
+            manifest_ref.ref: MyTask.of_future(manifest_ref, pipeline.submit(manifest_ref))
             for manifest_ref in manifest_refs
         }
+        for task in tasks.values():
+            tracker.track(task.initial, task.future)
 
         if display_table:
-            live.update(make_grid(live.console.height, tasks.values()), refresh=True)
-
-        # Wait for all of the downloads to complete
-        while not all(map(MyTask.is_complete, tasks.values())):
-            # Update the table
-            tasks = {url: task.update_status() for url, task in tasks.items()}
-            if display_table:
-                live.update(make_grid(live.console.height, tasks.values()), refresh=True)
+            live.update(make_grid(live.console.height, tracker), refresh=True)
 
-            # Wait a bit
-            time.sleep(0.1)
+        # Wait for all of the downloads to complete, updating the table as they progress
+        while not tracker.is_complete():
+            if tracker.wait() and display_table:
+                live.update(make_grid(live.console.height, tracker), refresh=True)
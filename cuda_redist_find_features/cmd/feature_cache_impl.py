@@ -0,0 +1,31 @@
+from pathlib import Path
+
+import click
+
+from cuda_redist_find_features.manifest.feature import DETECTOR_VERSION, FeaturePackageCache
+
+
+def feature_cache_stats_impl(feature_cache_path: Path) -> None:
+    """
+    Prints statistics about the feature cache at FEATURE_CACHE_PATH.
+    """
+    with FeaturePackageCache.open(feature_cache_path) as cache:
+        stats = cache.stats()
+
+    click.echo(f"Detector version: {DETECTOR_VERSION}")
+    click.echo(f"Entries: {stats.entries}")
+    click.echo(f"Entries from other detector versions: {stats.stale_entries}")
+    click.echo(f"Size of entries: {stats.size} bytes")
+    click.echo(f"Size of database: {stats.file_size} bytes")
+
+
+def evict_feature_cache_impl(feature_cache_path: Path, max_size: int) -> None:
+    """
+    Evicts entries from the feature cache at FEATURE_CACHE_PATH until the total size of its entries is at most
+    MAX_SIZE bytes, starting with those recorded by other detector versions and then those least recently used.
+    """
+    with FeaturePackageCache.open(feature_cache_path) as cache:
+        evicted = cache.evict(max_size)
+        stats = cache.stats()
+
+    click.echo(f"Evicted {evicted} entries; {stats.entries} entries ({stats.size} bytes) remain.")
@@ -0,0 +1,74 @@
+from collections.abc import Mapping
+from pathlib import Path
+
+from cuda_redist_find_features import utilities
+from cuda_redist_find_features.manifest.feature import FeaturePackageDepsUnresolved, FeaturePackageJournal
+from cuda_redist_find_features.types import PackageId, Shard, VersionConstraint
+
+from .process_manifests_impl import SHARD_RESULTS_NAME_REGEX, load_manifests, order_packages, write_feature_manifests
+
+logger = utilities.get_logger(__name__)
+
+
+def find_shard_results(manifest_dir: Path) -> Mapping[Shard, Path]:
+    """
+    Finds the partial results of every shard in MANIFEST_DIR, ensuring they are of the same run and none are missing.
+    """
+    shard_results: dict[Shard, Path] = {}
+    for path in sorted(manifest_dir.iterdir()):
+        matched = SHARD_RESULTS_NAME_REGEX.fullmatch(path.name)
+        if matched is not None:
+            shard_results[Shard(index=int(matched["index"]), count=int(matched["count"]))] = path
+
+    counts = sorted({shard.count for shard in shard_results})
+    if counts == []:
+        raise RuntimeError(f"Found no shard results in {manifest_dir}.")
+    if len(counts) > 1:
+        raise RuntimeError(f"Found the results of runs with different numbers of shards in {manifest_dir}: {counts}.")
+
+    shards = [Shard(index=index, count=counts[0]) for index in range(counts[0])]
+    missing = [str(shard) for shard in shards if shard not in shard_results]
+    if missing != []:
+        raise RuntimeError(f"Missing the results of shards {', '.join(missing)} in {manifest_dir}.")
+
+    return shard_results
+
+
+def merge_features_impl(manifest_dir: Path, version_constraint: VersionConstraint) -> None:
+    """
+    Combines the partial results written to MANIFEST_DIR by each shard of `process-manifests --shard` into the feature
+    manifests a run without sharding would write.
+
+    Fails without writing anything if the results of a shard are missing, or if a package of the manifests in
+    MANIFEST_DIR is missing from or found in more than one of the shards.
+    """
+    nvidia_manifests = load_manifests(manifest_dir, version_constraint)
+    expected: set[PackageId] = {package_id for package_id, _ in order_packages(nvidia_manifests, "manifest")}
+
+    merged: dict[PackageId, FeaturePackageDepsUnresolved] = {}
+    duplicated: set[PackageId] = set()
+    shard_results = find_shard_results(manifest_dir)
+    for shard, path in sorted(shard_results.items()):
+        logger.info("Loading the results of shard %s from %s...", shard, path)
+        for package_id, feature_package in FeaturePackageJournal.load(path).items():
+            if package_id in merged:
+                duplicated.add(package_id)
+            merged[package_id] = feature_package
+
+    missing = expected - merged.keys()
+    unexpected = merged.keys() - expected
+    for description, package_ids in [
+        ("missing from the shards", missing),
+        ("found in more than one shard", duplicated),
+        ("found in the shards but not the manifests", unexpected),
+    ]:
+        for package_id in sorted(package_ids):
+            logger.error("Package %s is %s.", package_id, description)
+    if missing or duplicated or unexpected:
+        raise RuntimeError(
+            f"Cannot merge shards: {len(missing)} packages are missing, {len(duplicated)} are duplicated, and"
+            f" {len(unexpected)} are unexpected."
+        )
+
+    write_feature_manifests(nvidia_manifests, merged)
+    logger.info("Merged %d shards into %d feature manifests.", len(shard_results), len(nvidia_manifests))
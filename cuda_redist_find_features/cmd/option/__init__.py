@@ -1,15 +1,57 @@
 from ._cleanup import cleanup_option
+from ._detect_jobs import detect_jobs_option
+from ._disk_budget import disk_budget_option
+from ._engine import engine_option
+from ._feature_cache import feature_cache_option
+from ._feature_cache_path import feature_cache_path_option
+from ._fetch_jobs import fetch_jobs_option
+from ._http_cache import http_cache_option
+from ._http_cache_path import http_cache_path_option
+from ._http_connections import http_connections_option
+from ._incremental import incremental_option
 from ._log_level import log_level_option
+from ._max_size import max_size_option
 from ._max_version import max_version_option
+from ._memory_budget import memory_budget_option
 from ._min_version import min_version_option
+from ._nix_batch_size import nix_batch_size_option
+from ._nix_jobs import nix_jobs_option
 from ._no_parallel import no_parallel_option
+from ._no_unpack import no_unpack_option
+from ._order import order_option
+from ._resume import resume_option
+from ._retain_size import retain_size_option
+from ._retention_path import retention_path_option
+from ._shard import shard_option
+from ._unpack_jobs import unpack_jobs_option
 from ._version import version_option
 
 __all__ = [
     "cleanup_option",
+    "detect_jobs_option",
+    "disk_budget_option",
+    "engine_option",
+    "feature_cache_option",
+    "feature_cache_path_option",
+    "fetch_jobs_option",
+    "http_cache_option",
+    "http_cache_path_option",
+    "http_connections_option",
+    "incremental_option",
     "log_level_option",
+    "max_size_option",
     "max_version_option",
+    "memory_budget_option",
     "min_version_option",
+    "nix_batch_size_option",
+    "nix_jobs_option",
     "no_parallel_option",
+    "no_unpack_option",
+    "order_option",
+    "resume_option",
+    "retain_size_option",
+    "retention_path_option",
+    "shard_option",
+    "unpack_jobs_option",
     "version_option",
 ]
@@ -0,0 +1,9 @@
+import click
+
+detect_jobs_option = click.option(
+    "--detect-jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of archives to run the detectors against at once. Ignored with --no-parallel.",
+    show_default="number of CPUs",
+)
@@ -0,0 +1,15 @@
+import click
+
+from cuda_redist_find_features.cmd.types import BYTE_SIZE_PARAM_TYPE
+
+disk_budget_option = click.option(
+    "--disk-budget",
+    type=BYTE_SIZE_PARAM_TYPE,
+    default=None,
+    help=" ".join([
+        "Only start packages while the estimated Nix store footprint of those in progress stays within this size,",
+        "like 50G.",
+        "Requires --cleanup, since otherwise the footprint is never released.",
+        "If not specified, the footprint is unbounded.",
+    ]),
+)
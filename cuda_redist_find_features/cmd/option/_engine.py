@@ -0,0 +1,23 @@
+import click
+
+from cuda_redist_find_features.types import Engine, Engines
+
+
+def _engine_option_callback(ctx: click.Context, param: click.Parameter, engine: Engine) -> Engine:
+    click.echo(f"Using the {engine} engine.")
+    return engine
+
+
+engine_option = click.option(
+    "--engine",
+    type=click.Choice(Engines),
+    default="threads",
+    help=" ".join([
+        "How to run the pipeline.",
+        "threads gives each stage a pool of threads, which block on the Nix commands they run;",
+        "asyncio runs the stages on an event loop and the Nix commands as asyncio subprocesses, so many more archives",
+        "can be fetched and unpacked at once without as many threads.",
+    ]),
+    show_default=True,
+    callback=_engine_option_callback,
+)
@@ -0,0 +1,17 @@
+import click
+
+
+def _feature_cache_option_callback(ctx: click.Context, param: click.Parameter, feature_cache: bool) -> bool:
+    if not feature_cache:
+        click.echo("Not using the feature cache.")
+    return feature_cache
+
+
+feature_cache_option = click.option(
+    "--feature-cache/--no-feature-cache",
+    type=bool,
+    default=True,
+    help="Reuse the features of archives which have already been processed, and record those of new archives.",
+    show_default=True,
+    callback=_feature_cache_option_callback,
+)
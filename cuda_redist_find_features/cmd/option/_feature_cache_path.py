@@ -0,0 +1,27 @@
+import os
+import pathlib
+
+import click
+
+DEFAULT_FEATURE_CACHE_PATH = (
+    pathlib.Path(os.environ.get("XDG_CACHE_HOME", pathlib.Path.home() / ".cache"))
+    / "cuda-redist-find-features"
+    / "features.sqlite"
+)
+
+
+def _feature_cache_path_option_callback(
+    ctx: click.Context, param: click.Parameter, feature_cache_path: pathlib.Path
+) -> pathlib.Path:
+    click.echo(f"Using feature cache {feature_cache_path}")
+    return feature_cache_path
+
+
+feature_cache_path_option = click.option(
+    "--feature-cache-path",
+    type=click.Path(path_type=pathlib.Path, file_okay=True, dir_okay=False),
+    default=DEFAULT_FEATURE_CACHE_PATH,
+    help="The SQLite database backing the feature cache.",
+    show_default="$XDG_CACHE_HOME/cuda-redist-find-features/features.sqlite",
+    callback=_feature_cache_path_option_callback,
+)
@@ -0,0 +1,9 @@
+import click
+
+fetch_jobs_option = click.option(
+    "--fetch-jobs",
+    type=click.IntRange(min=1),
+    default=8,
+    help="Number of archives to download at once. Ignored with --no-parallel.",
+    show_default=True,
+)
@@ -0,0 +1,20 @@
+import click
+
+
+def _http_cache_option_callback(ctx: click.Context, param: click.Parameter, http_cache: bool) -> bool:
+    if not http_cache:
+        click.echo("Not using the HTTP cache.")
+    return http_cache
+
+
+http_cache_option = click.option(
+    "--http-cache/--no-http-cache",
+    type=bool,
+    default=True,
+    help=(
+        "Only download manifests and directory listings which have changed since they were last downloaded, using"
+        " their ETag and Last-Modified headers."
+    ),
+    show_default=True,
+    callback=_http_cache_option_callback,
+)
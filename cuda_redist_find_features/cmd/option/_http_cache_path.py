@@ -0,0 +1,18 @@
+import os
+import pathlib
+
+import click
+
+DEFAULT_HTTP_CACHE_PATH = (
+    pathlib.Path(os.environ.get("XDG_CACHE_HOME", pathlib.Path.home() / ".cache"))
+    / "cuda-redist-find-features"
+    / "http.sqlite"
+)
+
+http_cache_path_option = click.option(
+    "--http-cache-path",
+    type=click.Path(path_type=pathlib.Path, file_okay=True, dir_okay=False),
+    default=DEFAULT_HTTP_CACHE_PATH,
+    help="The SQLite database backing the HTTP cache.",
+    show_default="$XDG_CACHE_HOME/cuda-redist-find-features/http.sqlite",
+)
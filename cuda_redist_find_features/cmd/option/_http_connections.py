@@ -0,0 +1,9 @@
+import click
+
+http_connections_option = click.option(
+    "--http-connections",
+    type=click.IntRange(min=1),
+    default=6,
+    help="Maximum number of connections to open to each host. Connections are kept alive and reused across downloads.",
+    show_default=True,
+)
@@ -0,0 +1,20 @@
+import click
+
+
+def _incremental_option_callback(ctx: click.Context, param: click.Parameter, incremental: bool) -> bool:
+    if incremental:
+        click.echo("Only processing packages which changed since the feature manifests were written.")
+    return incremental
+
+
+incremental_option = click.option(
+    "--incremental/--no-incremental",
+    type=bool,
+    default=False,
+    help=(
+        "Reuse the features in the existing feature manifests for packages whose archives have not changed since they"
+        " were written, and only process new or changed packages."
+    ),
+    show_default=True,
+    callback=_incremental_option_callback,
+)
@@ -0,0 +1,8 @@
+import click
+
+max_size_option = click.option(
+    "--max-size",
+    type=click.IntRange(min=0),
+    required=True,
+    help="The maximum total size, in bytes, of the entries to keep.",
+)
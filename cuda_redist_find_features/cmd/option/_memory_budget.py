@@ -0,0 +1,14 @@
+import click
+
+from cuda_redist_find_features.cmd.types import BYTE_SIZE_PARAM_TYPE
+
+memory_budget_option = click.option(
+    "--memory-budget",
+    type=BYTE_SIZE_PARAM_TYPE,
+    default=None,
+    help=" ".join([
+        "Only start packages while the estimated memory footprint of those in progress stays within this size,",
+        "like 8G.",
+        "If not specified, the footprint is unbounded.",
+    ]),
+)
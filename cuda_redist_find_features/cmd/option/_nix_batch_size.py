@@ -0,0 +1,12 @@
+import click
+
+nix_batch_size_option = click.option(
+    "--nix-batch-size",
+    type=click.IntRange(min=1),
+    default=None,
+    help=(
+        "Maximum number of archives to fetch, or unpack, with a single Nix command. Batches are realised once this many"
+        " requests are waiting, or shortly after the first; by default, each archive gets its own Nix commands."
+    ),
+    show_default="no batching",
+)
@@ -0,0 +1,9 @@
+import click
+
+nix_jobs_option = click.option(
+    "--nix-jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of Nix commands to run at once, across all stages. Only used with --engine asyncio.",
+    show_default="unlimited",
+)
@@ -0,0 +1,17 @@
+import click
+
+
+def _no_unpack_option_callback(ctx: click.Context, param: click.Parameter, no_unpack: bool) -> bool:
+    if no_unpack:
+        click.echo("Detecting features from archive listings instead of unpacking.")
+    return no_unpack
+
+
+no_unpack_option = click.option(
+    "--no-unpack/--unpack",
+    type=bool,
+    default=False,
+    help="Detect features from the listing of each archive instead of unpacking it.",
+    show_default=True,
+    callback=_no_unpack_option_callback,
+)
@@ -0,0 +1,23 @@
+import click
+
+from cuda_redist_find_features.types import TaskOrder, TaskOrders
+
+
+def _order_option_callback(ctx: click.Context, param: click.Parameter, order: TaskOrder) -> TaskOrder:
+    click.echo(f"Processing packages {order}.")
+    return order
+
+
+order_option = click.option(
+    "--order",
+    type=click.Choice(TaskOrders),
+    default="largest-first",
+    help=" ".join([
+        "Order in which to process packages.",
+        "largest-first minimizes the total run time by not leaving the largest archives for last;",
+        "newest-first processes packages from the newest manifests first, largest first within a manifest version;",
+        "manifest processes packages in the order they appear in the manifests.",
+    ]),
+    show_default=True,
+    callback=_order_option_callback,
+)
@@ -0,0 +1,19 @@
+import click
+
+
+def _resume_option_callback(ctx: click.Context, param: click.Parameter, resume: bool) -> bool:
+    if resume:
+        click.echo("Resuming from the journal of the previous run.")
+    return resume
+
+
+resume_option = click.option(
+    "--resume/--no-resume",
+    type=bool,
+    default=False,
+    help=(
+        "Skip the packages recorded in the journal of a previous run which was interrupted, instead of starting over."
+    ),
+    show_default=True,
+    callback=_resume_option_callback,
+)
@@ -0,0 +1,16 @@
+import click
+
+from cuda_redist_find_features.cmd.types import BYTE_SIZE_PARAM_TYPE
+
+retain_size_option = click.option(
+    "--retain-size",
+    type=BYTE_SIZE_PARAM_TYPE,
+    default=None,
+    help=" ".join([
+        "With --cleanup, keep the most recently used archives and unpacked archives in the Nix store, up to this size,",
+        "like 100G, removing only the least recently used ones.",
+        "What is kept is recorded at --retention-path, so later runs reuse it.",
+        "Kept paths are not counted against --disk-budget, so the Nix store can grow to --disk-budget plus this size.",
+        "If not specified, everything is removed.",
+    ]),
+)
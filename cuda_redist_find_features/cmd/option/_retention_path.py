@@ -0,0 +1,18 @@
+import os
+import pathlib
+
+import click
+
+DEFAULT_RETENTION_PATH = (
+    pathlib.Path(os.environ.get("XDG_CACHE_HOME", pathlib.Path.home() / ".cache"))
+    / "cuda-redist-find-features"
+    / "retained_paths.sqlite"
+)
+
+retention_path_option = click.option(
+    "--retention-path",
+    type=click.Path(path_type=pathlib.Path, file_okay=True, dir_okay=False),
+    default=DEFAULT_RETENTION_PATH,
+    help="The SQLite database recording the store paths kept by --retain-size.",
+    show_default="$XDG_CACHE_HOME/cuda-redist-find-features/retained_paths.sqlite",
+)
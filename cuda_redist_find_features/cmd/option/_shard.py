@@ -0,0 +1,23 @@
+import click
+
+from cuda_redist_find_features.cmd.types import SHARD_PARAM_TYPE
+from cuda_redist_find_features.types import Shard
+
+
+def _shard_option_callback(ctx: click.Context, param: click.Parameter, shard: None | Shard) -> None | Shard:
+    if shard is not None:
+        click.echo(f"Processing shard {shard}.")
+    return shard
+
+
+shard_option = click.option(
+    "--shard",
+    type=SHARD_PARAM_TYPE,
+    default=None,
+    help=" ".join([
+        "Only process the packages in shard INDEX of COUNT (e.g., 0/4), writing partial results to MANIFEST_DIR",
+        "instead of feature manifests. Shards are balanced by archive size; combine them with merge-features.",
+    ]),
+    metavar="INDEX/COUNT",
+    callback=_shard_option_callback,
+)
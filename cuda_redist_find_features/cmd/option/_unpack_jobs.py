@@ -0,0 +1,9 @@
+import click
+
+unpack_jobs_option = click.option(
+    "--unpack-jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of archives to unpack at once. Ignored with --no-parallel.",
+    show_default="number of CPUs",
+)
@@ -1,54 +1,606 @@
+import json
 import logging
+import os
+import re
 import time
-from collections.abc import Iterable, Mapping, Sequence
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Callable, Generator, Iterable, Mapping, Sequence, Set
+from concurrent.futures import CancelledError, Future
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
 from functools import partial
+from itertools import islice
 from pathlib import Path
+from typing import Any
 
-from pydantic import FilePath, HttpUrl
+from pydantic import FilePath, HttpUrl, ValidationError
+from rich.console import Group
 from rich.live import Live
 from rich.table import Table
 
 from cuda_redist_find_features import utilities
 from cuda_redist_find_features.manifest.feature import (
+    DETECTOR_VERSION,
     FeatureManifest,
+    FeaturePackageCache,
     FeaturePackageDepsUnresolved,
+    FeaturePackageJournal,
     FeatureRelease,
 )
 from cuda_redist_find_features.manifest.nvidia import NvidiaManifest, NvidiaManifestRef, NvidiaPackage
-from cuda_redist_find_features.types import PackageId, Task, Version, VersionConstraint
+from cuda_redist_find_features.types import (
+    AsyncCommandRunner,
+    AsyncPipeline,
+    ByteBudget,
+    Engine,
+    FutureStatus,
+    NixBatcher,
+    NixReclaimer,
+    NixStoreEntry,
+    NixStoreRetention,
+    PackageId,
+    PackageName,
+    Pipeline,
+    PipelineStage,
+    PipelineStats,
+    Platform,
+    PydanticMapping,
+    PydanticObject,
+    Reservations,
+    Sha256,
+    Shard,
+    Task,
+    TaskOrder,
+    TaskTracker,
+    Version,
+    VersionConstraint,
+)
 
 logger = utilities.get_logger(__name__)
 
 MyTask = Task[NvidiaPackage, FeaturePackageDepsUnresolved]
+MyPipeline = Pipeline[NvidiaPackage, FeaturePackageDepsUnresolved]
+MyAsyncPipeline = AsyncPipeline[NvidiaPackage, FeaturePackageDepsUnresolved]
+
+# The table is redrawn at least this often, so the rates and the ETA stay current while nothing completes.
+_REFRESH_SECONDS = 1.0
+
+_BYTES_PER_KIB = 1024
+
+# Written to MANIFEST_DIR as packages finish, and removed once the feature manifests are written.
+_JOURNAL_NAME = "feature_journal.jsonl"
+
+# The batchers of the fetch and unpack stages, or None when each archive gets its own Nix commands.
+Batchers = tuple[None | NixBatcher[tuple[HttpUrl, Sha256]], None | NixBatcher[NixStoreEntry]]
+
+
+class Sha256Manifest(PydanticObject):
+    """
+    The SHA256 of the archive each package in a feature manifest was processed from, by package name and platform,
+    along with the `DETECTOR_VERSION` its features were detected with.
+    """
+
+    detector_version: int
+    sha256s: PydanticMapping[PackageName, PydanticMapping[Platform, Sha256]]
+
+
+# Sharded runs keep their journal in MANIFEST_DIR as their partial results, under a name identifying the shard.
+SHARD_RESULTS_NAME_REGEX = re.compile(r"feature_shard_(?P<index>\d+)_of_(?P<count>\d+)\.jsonl")
+
+
+def shard_results_name(shard: Shard) -> str:
+    return f"feature_shard_{shard.index}_of_{shard.count}.jsonl"
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < _BYTES_PER_KIB:
+            return f"{size:.1f} {unit}"
+        size /= _BYTES_PER_KIB
+    return f"{size:.1f} TiB"
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s"
+
+
+def _utilization(stage: PipelineStage, stats: PipelineStats, elapsed: float) -> float:
+    return stats.busy_seconds / (stage.workers * elapsed) if elapsed > 0 else 0.0
+
 
+def make_summary(tracker: TaskTracker[PackageId], pipeline: MyPipeline | MyAsyncPipeline) -> Table:
+    """
+    Summarizes the progress of each stage of the pipeline, so it is clear which one is the bottleneck.
+
+    The rates of a stage are the sizes of the archives it finished with, over the time since the pipeline started; the
+    ETA assumes the remaining archives are processed at the same rate as those already processed.
+    """
+    elapsed = time.monotonic() - pipeline.started_at
+    counts = ", ".join(f"{tracker.count(status)} {status.name.lower()}" for status in FutureStatus)
+    summary = Table(title=f"Packages: {counts}", box=None, pad_edge=False, width=80, min_width=80)
+    summary.add_column("Stage")
+    summary.add_column("Busy", justify="right")
+    summary.add_column("Utilization", justify="right")
+    summary.add_column("Queued", justify="right")
+    summary.add_column("Done", justify="right")
+    summary.add_column("Failed", justify="right")
+    summary.add_column("Rate", justify="right")
+
+    for stage, stats in zip(pipeline.stages, pipeline.stage_stats, strict=True):
+        summary.add_row(
+            stage.name,
+            f"{stats.active}/{stage.workers}",
+            f"{_utilization(stage, stats, elapsed):.0%}",
+            str(stats.queued),
+            f"{stats.completed} ({_format_bytes(stats.completed_weight)})",
+            str(stats.failed),
+            f"{_format_bytes(stats.finished_weight / elapsed) if elapsed > 0 else '-'}/s",
+        )
+
+    stats = pipeline.stats
+    tasks_per_minute = 60 * (stats.completed + stats.failed) / elapsed if elapsed > 0 else 0.0
+    summary.add_row(
+        "total",
+        str(stats.active),
+        "",
+        str(stats.queued),
+        f"{stats.completed} ({_format_bytes(stats.completed_weight)})",
+        str(stats.failed),
+        f"{tasks_per_minute:.1f}/min",
+    )
 
-def make_grid(height: int, tasks: Iterable[tuple[PackageId, MyTask]]) -> Table:
+    remaining = stats.submitted_weight - stats.finished_weight
+    if stats.finished_weight > 0 and remaining > 0:
+        eta = _format_duration(remaining * elapsed / stats.finished_weight)
+        summary.caption = f"ETA {eta} for {_format_bytes(remaining)} of archives, after {_format_duration(elapsed)}"
+    else:
+        summary.caption = f"Elapsed {_format_duration(elapsed)}"
+    if stats.active > 0:
+        bottleneck = max(
+            zip(pipeline.stages, pipeline.stage_stats, strict=True),
+            key=lambda item: _utilization(*item, elapsed),
+        )
+        summary.caption += f"; bottleneck: {bottleneck[0].name}"
+
+    return summary
+
+
+def make_grid(height: int, tracker: TaskTracker[PackageId]) -> Table:
     grid = Table(box=None, pad_edge=False, expand=True, width=80, min_width=80)
     grid.add_column("Progress", width=10, min_width=10, max_width=10)
     grid.add_column("Name", width=70, min_width=70, max_width=70)
 
-    # Print tasks which are in progress before those that are waiting.
-    # Group the tasks by status
-    incomplete_tasks: Iterable[tuple[PackageId, MyTask]] = [
-        (key, task) for key, task in tasks if MyTask.is_running(task)
-    ] + [(key, task) for key, task in tasks if MyTask.is_waiting(task)]
+    # When not every task fits, the last row counts those left out. The height is negative on short terminals.
+    pending = tracker.count(FutureStatus.RUNNING) + tracker.count(FutureStatus.WAITING)
+    rows = max(0, height if pending <= height else height - 1)
 
     # Priorities: running > waiting > completed
     # Print tasks which are in progress before those that are waiting.
-    for key, task in incomplete_tasks[:height]:
-        name = " ".join((key.package_name, key.platform, str(key.version)))
-        grid.add_row(task.status.value, name)
+    shown = 0
+    for status in (FutureStatus.RUNNING, FutureStatus.WAITING):
+        for key in islice(tracker.keys(status), rows - shown):
+            name = " ".join((key.package_name, key.platform, str(key.version)))
+            grid.add_row(status.value, name)
+            shown += 1
+
+    if shown < pending:
+        grid.add_row("", f"+{pending - shown} more")
 
     return grid
 
 
+def wait_for_tasks(tracker: TaskTracker[PackageId], pipeline: MyPipeline | MyAsyncPipeline, live: None | Live) -> None:
+    """
+    Waits for every tracked task to complete, redrawing the table on `live`, if given, as they progress.
+    """
+
+    def render(live: Live) -> None:
+        summary = make_summary(tracker, pipeline)
+        # Leave room for the title, the header, the rows of the stages and the total, and the caption.
+        height = live.console.height - len(pipeline.stages) - 4
+        live.update(Group(summary, make_grid(height, tracker)), refresh=True)
+
+    # Update the table
+    if live is not None:
+        render(live)
+
+    while not tracker.is_complete():
+        tracker.wait(timeout=_REFRESH_SECONDS)
+        if live is not None:
+            render(live)
+
+
+def feature_manifest_path_of(nvidia_manifest_path: Path) -> Path:
+    return nvidia_manifest_path.with_stem(nvidia_manifest_path.stem.replace("redistrib", "feature"))
+
+
+def sha256_manifest_path_of(feature_manifest_path: Path) -> Path:
+    # Written next to the feature manifest, so incremental runs can tell which packages changed since it was written.
+    return feature_manifest_path.with_suffix(".sha256.json")
+
+
+def load_unchanged_features(
+    nvidia_manifests: Mapping[FilePath, tuple[Version, NvidiaManifest]],
+) -> Mapping[PackageId, FeaturePackageDepsUnresolved]:
+    """
+    Loads the features of the packages in the existing feature manifests whose archives have the same SHA256 as when
+    the feature manifests were written.
+
+    Packages which are new, changed, or in feature manifests written without a record of the SHA256s or by another
+    `DETECTOR_VERSION` are left out, like the feature cache leaves out entries recorded by another version.
+    """
+    unchanged: dict[PackageId, FeaturePackageDepsUnresolved] = {}
+    for file_path, (version, manifest) in nvidia_manifests.items():
+        feature_manifest_path = feature_manifest_path_of(file_path)
+        sha256_manifest_path = sha256_manifest_path_of(feature_manifest_path)
+        if not (feature_manifest_path.exists() and sha256_manifest_path.exists()):
+            logger.info("Found no previous features for %s.", file_path)
+            continue
+
+        # The fields excluded from the feature manifest are missing, so packages are validated one at a time.
+        try:
+            sha256_manifest = Sha256Manifest.model_validate_json(sha256_manifest_path.read_bytes())
+        except ValidationError:
+            logger.info("Found no record of the detector version of %s.", feature_manifest_path)
+            continue
+        if sha256_manifest.detector_version != DETECTOR_VERSION:
+            logger.info(
+                "Features in %s were detected by detector version %d, not %d.",
+                feature_manifest_path,
+                sha256_manifest.detector_version,
+                DETECTOR_VERSION,
+            )
+            continue
+
+        feature_manifest: Mapping[str, Mapping[str, Mapping[str, Any]]] = json.loads(feature_manifest_path.read_bytes())
+        for package_name, release in manifest.releases.items():
+            feature_release = feature_manifest.get(package_name)
+            sha256s = sha256_manifest.sha256s.get(package_name)
+            if feature_release is None or sha256s is None:
+                continue
+            for platform, package in release.packages.items():
+                feature_package = feature_release.get(platform)
+                if feature_package is not None and sha256s.get(platform) == package.sha256:
+                    unchanged[PackageId(platform, package_name, version)] = (
+                        FeaturePackageDepsUnresolved.from_feature_manifest(feature_package)
+                    )
+
+    return unchanged
+
+
+def load_finished_features(
+    journal_path: Path,
+    nvidia_manifests: Mapping[FilePath, tuple[Version, NvidiaManifest]],
+    packages: Sequence[tuple[PackageId, NvidiaPackage]],
+    resume: bool,
+    incremental: bool,
+) -> tuple[Mapping[PackageId, FeaturePackageDepsUnresolved], Mapping[PackageId, FeaturePackageDepsUnresolved]]:
+    """
+    Loads the features of the packages which need not be processed again: with `resume`, those in the journal of the
+    run being resumed, and with `incremental`, those unchanged since the feature manifests were written.
+
+    Returns the journaled features, and those along with the unchanged ones.
+    """
+    journaled: Mapping[PackageId, FeaturePackageDepsUnresolved] = (
+        FeaturePackageJournal.load(journal_path) if resume else {}
+    )
+    unchanged: Mapping[PackageId, FeaturePackageDepsUnresolved] = (
+        load_unchanged_features(nvidia_manifests) if incremental else {}
+    )
+    package_ids = {package_id for package_id, _ in packages}
+    if resume:
+        logger.info("Found %d of %d packages in the journal.", len(journaled.keys() & package_ids), len(package_ids))
+    if incremental:
+        logger.info("Found %d of %d packages unchanged.", len(unchanged.keys() & package_ids), len(package_ids))
+    return journaled, {**unchanged, **journaled}
+
+
+def load_manifests(
+    manifest_dir: Path, version_constraint: VersionConstraint
+) -> Mapping[FilePath, tuple[Version, NvidiaManifest]]:
+    """
+    Parses the manifests matching `redistrib_*.json` in MANIFEST_DIR which satisfy the version constraint.
+    """
+    # Parse and filter
+    refs: Sequence[NvidiaManifestRef[FilePath]] = NvidiaManifestRef.from_ref(manifest_dir, version_constraint)
+
+    # Parse references into manifests
+    return {ref.ref: (ref.version, ref.parse()) for ref in refs}
+
+
+def order_packages(
+    nvidia_manifests: Mapping[FilePath, tuple[Version, NvidiaManifest]], order: TaskOrder
+) -> Sequence[tuple[PackageId, NvidiaPackage]]:
+    """
+    Flattens the manifests into a sequence of packages in the given order.
+
+    Ordering by size, largest first, is the longest-processing-time-first heuristic: with a fixed number of workers,
+    starting the largest archives first keeps a single large archive from being the last to finish.
+    """
+    packages: list[tuple[PackageId, NvidiaPackage]] = [
+        (PackageId(platform, package_name, version), package)
+        for _, (version, manifest) in nvidia_manifests.items()
+        for package_name, release in manifest.releases.items()
+        for platform, package in release.packages.items()
+    ]
+    if order == "largest-first":
+        packages.sort(key=lambda item: item[1].size_in_bytes, reverse=True)
+    elif order == "newest-first":
+        packages.sort(key=lambda item: (item[0].version, item[1].size_in_bytes), reverse=True)
+    return packages
+
+
+def shard_packages(
+    packages: Sequence[tuple[PackageId, NvidiaPackage]], shard: Shard
+) -> Sequence[tuple[PackageId, NvidiaPackage]]:
+    """
+    Selects the packages in the given shard, keeping their order.
+
+    Packages sharing an archive are kept in the same shard, so no archive is processed by more than one shard.
+    Archives are assigned largest first to the shard with the least total size so far, which gives every shard about
+    the same amount of work. Ties are broken by SHA256, so every machine arrives at the same assignment given the same
+    manifests.
+    """
+    sizes: dict[Sha256, int] = {package.sha256: package.size_in_bytes for _, package in packages}
+    loads = [0] * shard.count
+    selected: set[Sha256] = set()
+    for sha256, size in sorted(sizes.items(), key=lambda item: (-item[1], item[0])):
+        index = min(range(shard.count), key=lambda index: (loads[index], index))
+        loads[index] += size
+        if index == shard.index:
+            selected.add(sha256)
+
+    logger.info("Shard %s has %d of %d archives.", shard, len(selected), len(sizes))
+    return [(package_id, package) for package_id, package in packages if package.sha256 in selected]
+
+
+def find_present_archives(url: HttpUrl, packages: Iterable[NvidiaPackage]) -> Mapping[Sha256, Path]:
+    """
+    Finds the archives of the packages which are already in the Nix store, so fetching them can be skipped, and
+    returns their store paths by SHA256.
+
+    Their store paths are computed from their hashes and names, and checked in batches.
+    """
+    sha256s_by_store_path: dict[Path, Sha256] = {
+        NixStoreEntry.fixed_output_store_path(
+            FeaturePackageDepsUnresolved.archive_url(url, package), package.sha256
+        ): package.sha256
+        for package in packages
+    }
+    valid = NixStoreEntry.valid_store_paths(sha256s_by_store_path.keys())
+    logger.info("Found %d of %d archives in the Nix store.", len(valid), len(sha256s_by_store_path))
+    return {sha256s_by_store_path[store_path]: store_path for store_path in valid}
+
+
+@contextmanager
+def start_batchers(
+    nix_batch_size: None | int, fetch_jobs: int, unpack_jobs: None | int
+) -> Generator[Batchers, None, None]:
+    """
+    Starts the batchers of the fetch and unpack stages if `nix_batch_size` is given.
+
+    A stage's workers wait on their batch, so a batch holds at most as many archives as its stage has workers. Each
+    batcher gets enough workers to realise the batches of all of the stage's workers at once.
+    """
+    if nix_batch_size is None:
+        yield None, None
+        return
+
+    unpack_jobs = unpack_jobs or os.cpu_count() or 1
+    with (
+        NixBatcher[tuple[HttpUrl, Sha256]].start(
+            NixStoreEntry.from_urls,
+            lambda request: NixStoreEntry.from_url(*request),
+            nix_batch_size,
+            workers=-(-fetch_jobs // nix_batch_size),
+        ) as fetcher,
+        NixBatcher[NixStoreEntry].start(
+            NixStoreEntry.unpack_archives,
+            NixStoreEntry.unpack_archive,
+            nix_batch_size,
+            workers=-(-unpack_jobs // nix_batch_size),
+        ) as unpacker,
+    ):
+        yield fetcher, unpacker
+
+
+def make_stages(
+    url: HttpUrl,
+    present: Set[Sha256],
+    batchers: Batchers,
+    cleanup: bool,
+    reclaimer: None | NixReclaimer,
+    no_unpack: bool,
+    no_parallel: bool,
+    engine: Engine,
+    fetch_jobs: int,
+    unpack_jobs: None | int,
+    detect_jobs: None | int,
+    nix_jobs: None | int,
+) -> Sequence[PipelineStage]:
+    """
+    Builds the fetch, unpack, and detect stages. Each stage gets its own pool, so the network, the decompressor, and
+    the detectors are kept busy at once.
+
+    With the asyncio engine, the stages are coroutine functions which share an `AsyncCommandRunner`, which runs at
+    most `nix_jobs` Nix commands at once.
+
+    With `batchers`, the fetch and unpack stages hand their archives to them instead of running Nix commands of their
+    own. Likewise, with `reclaimer`, the detect stage leaves cleaning up to it, and if it retains paths, the unpack
+    stage pins each unpacked archive until then.
+    """
+    cpu_count = os.cpu_count() or 1
+    fetcher, unpacker = batchers
+    retention = None if reclaimer is None else reclaimer.retention
+    if engine == "asyncio":
+        runner = AsyncCommandRunner({} if nix_jobs is None else {"nix": nix_jobs})
+        fetch = partial(FeaturePackageDepsUnresolved.fetch_async, url, runner=runner, present=present, fetcher=fetcher)
+        unpack = partial(
+            FeaturePackageDepsUnresolved.unpack_async,
+            runner=runner,
+            no_unpack=no_unpack,
+            unpacker=unpacker,
+            retention=retention,
+        )
+        detect = partial(FeaturePackageDepsUnresolved.detect_async, runner=runner, cleanup=cleanup, reclaimer=reclaimer)
+    else:
+        fetch = partial(FeaturePackageDepsUnresolved.fetch, url, present=present, fetcher=fetcher)
+        unpack = partial(
+            FeaturePackageDepsUnresolved.unpack, no_unpack=no_unpack, unpacker=unpacker, retention=retention
+        )
+        detect = partial(FeaturePackageDepsUnresolved.detect, cleanup=cleanup, reclaimer=reclaimer)
+
+    return [
+        PipelineStage("fetch", fetch, 1 if no_parallel else fetch_jobs),
+        PipelineStage("unpack", unpack, 1 if no_parallel else unpack_jobs or cpu_count),
+        PipelineStage("detect", detect, 1 if no_parallel else detect_jobs or cpu_count),
+    ]
+
+
+def make_admit(disk: ByteBudget, memory: ByteBudget, no_unpack: bool) -> Callable[[NvidiaPackage], Reservations]:
+    """
+    Builds the admission check of the pipeline, which keeps the packages in progress within the given budgets.
+    """
+
+    # Packages are charged the space their archive and its unpacked contents take up in the Nix store, and the size of
+    # their archive against memory, until they finish.
+    def admit(package: NvidiaPackage) -> Reservations:
+        return [
+            (disk, FeaturePackageDepsUnresolved.estimate_store_size(package, no_unpack=no_unpack)),
+            (memory, package.size_in_bytes),
+        ]
+
+    return admit
+
+
+def write_feature_manifest(
+    file_path: FilePath,
+    version: Version,
+    manifest: NvidiaManifest,
+    flattened_unresolved_tree: Mapping[PackageId, FeaturePackageDepsUnresolved],
+) -> None:
+    """
+    Writes a feature manifest next to the NVIDIA manifest, made up of the features of its packages.
+    """
+    # Organize the results
+    feature_manifest = FeatureManifest[FeaturePackageDepsUnresolved].model_validate({
+        package_name: FeatureRelease[FeaturePackageDepsUnresolved].model_validate({
+            platform: flattened_unresolved_tree[PackageId(platform, package_name, version)]
+            for platform in release.packages.keys()
+        })
+        for package_name, release in manifest.releases.items()
+    })
+
+    # Write the results, along with the SHA256s and detector version they were processed with
+    feature_manifest_path = feature_manifest_path_of(file_path)
+    if feature_manifest.write(feature_manifest_path):
+        logger.info("Wrote feature manifest %s.", feature_manifest_path)
+    else:
+        logger.info("Feature manifest %s is unchanged.", feature_manifest_path)
+    sha256_manifest = Sha256Manifest.model_validate({
+        "detector_version": DETECTOR_VERSION,
+        "sha256s": {
+            package_name: {platform: package.sha256 for platform, package in release.packages.items()}
+            for package_name, release in manifest.releases.items()
+        },
+    })
+    content = json.dumps(sha256_manifest.model_dump(mode="json"), indent=2, sort_keys=True) + "\n"
+    utilities.write_if_changed(sha256_manifest_path_of(feature_manifest_path), content.encode())
+
+
+def write_feature_manifests(
+    nvidia_manifests: Mapping[FilePath, tuple[Version, NvidiaManifest]],
+    flattened_unresolved_tree: Mapping[PackageId, FeaturePackageDepsUnresolved],
+) -> None:
+    """
+    Writes a feature manifest next to each NVIDIA manifest, made up of the features of its packages.
+    """
+    for file_path, (version, manifest) in nvidia_manifests.items():
+        write_feature_manifest(file_path, version, manifest, flattened_unresolved_tree)
+
+
+@dataclass
+class FeatureManifestWriter:
+    """
+    Collects the features of the packages of each NVIDIA manifest as they complete, and writes its feature manifest as
+    soon as the last of them does, rather than once every package of every manifest has. The features are dropped once
+    written.
+
+    If `write` is not set, nothing is collected or written, only failures are.
+
+    Not thread-safe; `complete` should be called from one thread, like through `TaskTracker.on_complete`.
+    """
+
+    nvidia_manifests: Mapping[FilePath, tuple[Version, NvidiaManifest]]
+    write: bool = True
+    remaining: dict[FilePath, set[PackageId]] = field(default_factory=dict[FilePath, set[PackageId]])
+    results: dict[FilePath, dict[PackageId, FeaturePackageDepsUnresolved]] = field(
+        default_factory=dict[FilePath, dict[PackageId, FeaturePackageDepsUnresolved]]
+    )
+    failures: dict[PackageId, BaseException] = field(default_factory=dict[PackageId, BaseException])
+    written: int = 0
+    _file_paths: dict[Version, FilePath] = field(default_factory=dict[Version, FilePath], repr=False)
+
+    def __post_init__(self) -> None:
+        for file_path, (version, manifest) in self.nvidia_manifests.items():
+            self._file_paths[version] = file_path
+            self.results[file_path] = {}
+            self.remaining[file_path] = {
+                PackageId(platform, package_name, version)
+                for package_name, release in manifest.releases.items()
+                for platform in release.packages.keys()
+            }
+
+    def complete(self, package_id: PackageId, future: Future[FeaturePackageDepsUnresolved]) -> None:
+        """
+        Records the outcome of a package, writing the feature manifest it belongs to if it was the last one.
+        """
+        file_path = self._file_paths[package_id.version]
+        remaining = self.remaining[file_path]
+        remaining.discard(package_id)
+        if future.cancelled():
+            self.failures[package_id] = CancelledError()
+        elif (exception := future.exception()) is not None:
+            self.failures[package_id] = exception
+        elif self.write:
+            self.results[file_path][package_id] = future.result()
+
+        if remaining or not self.write or len(self.results[file_path]) < self._package_count(file_path):
+            return
+
+        version, manifest = self.nvidia_manifests[file_path]
+        write_feature_manifest(file_path, version, manifest, self.results.pop(file_path))
+        self.written += 1
+
+    def _package_count(self, file_path: FilePath) -> int:
+        _, manifest = self.nvidia_manifests[file_path]
+        return sum(len(release.packages) for release in manifest.releases.values())
+
+
 def process_manifests_impl(
     url: HttpUrl,
     manifest_dir: Path,
     # overrides_json: Path,
     cleanup: bool,
+    no_unpack: bool,
     no_parallel: bool,
+    engine: Engine,
+    fetch_jobs: int,
+    unpack_jobs: None | int,
+    detect_jobs: None | int,
+    nix_jobs: None | int,
+    nix_batch_size: None | int,
+    order: TaskOrder,
+    disk_budget: None | int,
+    memory_budget: None | int,
+    retain_size: None | int,
+    retention_path: Path,
+    feature_cache: bool,
+    feature_cache_path: Path,
+    resume: bool,
+    incremental: bool,
+    shard: None | Shard,
     version_constraint: VersionConstraint,
 ) -> None:
     """
@@ -61,14 +613,36 @@ def process_manifests_impl(
     URL should not include a trailing slash.
 
     MANIFEST_DIR should be a directory containing JSON manifest(s).
-    """
-    # Parse and filter
-    refs: Sequence[NvidiaManifestRef[FilePath]] = NvidiaManifestRef.from_ref(manifest_dir, version_constraint)
 
-    # Parse references into manifests
-    nvidia_manifests: Mapping[FilePath, tuple[Version, NvidiaManifest]] = {
-        ref.ref: (ref.version, ref.parse()) for ref in refs
-    }
+    Packages are downloaded, unpacked, and checked by separate pools of FETCH_JOBS, UNPACK_JOBS, and DETECT_JOBS
+    workers, so archives are downloaded while earlier ones are unpacked and checked. UNPACK_JOBS and DETECT_JOBS default
+    to the number of CPUs.
+
+    The pipeline runs on the given ENGINE. With the asyncio engine, at most NIX_JOBS Nix commands run at once.
+
+    If NIX_BATCH_SIZE is given, archives are fetched and unpacked in batches of up to that many, with one Nix command
+    per batch.
+
+    Packages are submitted in the given ORDER.
+
+    Packages only start while the estimated footprints of those in progress fit within DISK_BUDGET and MEMORY_BUDGET.
+
+    With CLEANUP and RETAIN_SIZE, the most recently used store paths, up to RETAIN_SIZE bytes, are kept rather than
+    removed, and recorded in RETENTION_PATH so later runs reuse them. Kept paths are not counted against DISK_BUDGET,
+    so the Nix store can grow to DISK_BUDGET plus RETAIN_SIZE.
+
+    Packages whose archives are in the feature cache are not downloaded; their features are taken from the cache.
+
+    The features of each package are recorded in a journal in MANIFEST_DIR as soon as they are known. If the run is
+    interrupted, RESUME skips the packages recorded in the journal.
+
+    If INCREMENTAL is given, the features of packages whose archives are unchanged since the feature manifests in
+    MANIFEST_DIR were written are taken from them, and only new or changed packages are processed.
+
+    If SHARD is given, only the packages in that shard are processed, and the journal is kept in MANIFEST_DIR as the
+    partial results of the shard instead of writing feature manifests. Use `merge-features` to combine the shards.
+    """
+    nvidia_manifests = load_manifests(manifest_dir, version_constraint)
 
     # TODO(@connorbaker): Dependency resolution is excluded for now because it is not used downstream.
     # No need to bloat the feature manifests.
@@ -79,45 +653,111 @@ def process_manifests_impl(
     # else:
     #     dep_resolver = FeaturePackageDepsResolver.model_validate({})
 
-    # Curry
-    fn = partial(FeaturePackageDepsUnresolved.of, url, cleanup=cleanup)
+    # With cleanup, the reclaimer holds the disk budget of each package until its paths are deleted.
+    disk = ByteBudget("disk", disk_budget)
+    admit = make_admit(disk, ByteBudget("memory", memory_budget), no_unpack)
 
     # If logging level is less than or equal to warning severity, display the table.
     display_table = utilities.LOGGING_LEVEL >= logging.WARNING
 
+    # Futures report their progress to the tracker, so the table is only redrawn when something changes. Each feature
+    # manifest is written as soon as the last of its packages completes; sharded runs only write their journal.
+    writer = FeatureManifestWriter(nvidia_manifests, write=shard is None)
+    tracker = TaskTracker[PackageId](on_complete=writer.complete)
+
+    journal_path = manifest_dir / (_JOURNAL_NAME if shard is None else shard_results_name(shard))
+    packages = order_packages(nvidia_manifests, order)
+    if shard is not None:
+        packages = shard_packages(packages, shard)
+    journaled, finished = load_finished_features(journal_path, nvidia_manifests, packages, resume, incremental)
+
+    # Archives already in the Nix store are found with one batched check, rather than a prefetch for each. They, and the
+    # store paths they were unpacked to, are pinned in the retention record, so they are not evicted before their
+    # packages are processed.
+    present = find_present_archives(url, (package for package_id, package in packages if package_id not in finished))
+
     with (
+        FeaturePackageCache.open(feature_cache_path) if feature_cache else nullcontext() as cache,
+        FeaturePackageJournal.open(journal_path, resume=resume) as journal,
         Live(auto_refresh=False) as live,
-        ThreadPoolExecutor(max_workers=1 if no_parallel else None) as executor,
+        start_batchers(nix_batch_size, fetch_jobs, unpack_jobs) as batchers,
+        NixStoreRetention.open(retention_path, retain_size, present.values())
+        if retain_size is not None
+        else nullcontext() as retention,
+        NixReclaimer.start(disk, retention) if cleanup else nullcontext() as reclaimer,
+        (MyAsyncPipeline if engine == "asyncio" else MyPipeline).start(
+            make_stages(
+                url,
+                present.keys(),
+                batchers,
+                cleanup,
+                reclaimer,
+                no_unpack,
+                no_parallel,
+                engine,
+                fetch_jobs,
+                unpack_jobs,
+                detect_jobs,
+                nix_jobs,
+            ),
+            admit,
+            on_start=tracker.notify_running,
+            weigh=lambda package: package.size_in_bytes,
+        ) as pipeline,
     ):
-        # Initial tasks
-        tasks: Mapping[PackageId, MyTask] = {
-            PackageId(platform, package_name, version): Task.submit(
-                executor,
-                package,
-                fn,
-            )
-            for _, (version, manifest) in nvidia_manifests.items()
-            for package_name, release in manifest.releases.items()
-            for platform, package in release.packages.items()
-        }
+        # NVIDIA often reuses the same archive across manifests, so packages sharing an archive share a task as well.
+        # This avoids downloading and unpacking the same archive concurrently, which would race when cleaning up.
+        tasks_by_sha256: dict[Sha256, MyTask] = {}
+        cached_sha256s: set[Sha256] = set()
 
-        # Update the table
-        if display_table:
-            live.update(make_grid(live.console.height, tasks.items()), refresh=True)
+        def submit(package: NvidiaPackage) -> MyTask:
+            if package.sha256 not in tasks_by_sha256:
+                cached = None if cache is None else cache.get(package.sha256)
+                if cached is None:
+                    tasks_by_sha256[package.sha256] = Task.of_future(package, pipeline.submit(package))
+                    tasks_by_sha256[package.sha256].future.add_done_callback(partial(store, package.sha256))
+                else:
+                    cached_sha256s.add(package.sha256)
+                    tasks_by_sha256[package.sha256] = Task.of_result(package, cached)
+            return tasks_by_sha256[package.sha256]
 
-        # Wait for all of the downloads to complete
-        while not all(map(MyTask.is_complete, tasks.values())):
-            # Update the table
-            tasks = {url: task.update_status() for url, task in tasks.items()}
-            if display_table:
-                live.update(make_grid(live.console.height, tasks.items()), refresh=True)
+        # Results are recorded as they come, before any failures are surfaced, so they are not lost.
+        def record(package_id: PackageId, future: Future[FeaturePackageDepsUnresolved]) -> None:
+            if not future.cancelled() and future.exception() is None:
+                journal.append(package_id, future.result())
 
-            # Wait a bit
-            time.sleep(0.1)
+        def store(sha256: Sha256, future: Future[FeaturePackageDepsUnresolved]) -> None:
+            if cache is not None and not future.cancelled() and future.exception() is None:
+                cache.put(sha256, future.result())
 
-    flattened_unresolved_tree: Mapping[PackageId, FeaturePackageDepsUnresolved] = {
-        package_id: task.future.result() for package_id, task in tasks.items()
-    }
+        # Initial tasks, skipping those which were journaled by the run being resumed or are unchanged. The journal
+        # holds every result of the run, so the unchanged are journaled as well.
+        for package_id, package in packages:
+            if package_id in finished:
+                task = MyTask.of_result(package, finished[package_id])
+                if package_id not in journaled:
+                    journal.append(package_id, finished[package_id])
+            else:
+                task = submit(package)
+                task.future.add_done_callback(partial(record, package_id))
+            tracker.track(package_id, task.future)
+        logger.info("Found %d unique archives among %d packages.", len(tasks_by_sha256), len(packages))
+        if cache is not None:
+            logger.info("Found %d of %d archives in the feature cache.", len(cached_sha256s), len(tasks_by_sha256))
+
+        # The tasks are only shared while submitting; dropping them lets results go once their manifest is written.
+        tasks_by_sha256.clear()
+
+        # Wait for all of the downloads to complete, updating the table as they progress
+        wait_for_tasks(tracker, pipeline, live if display_table else None)
+
+    if writer.failures:
+        for package_id, exception in writer.failures.items():
+            logger.error("Failed to process %s: %s", package_id, exception)
+        raise RuntimeError(
+            f"Failed to process {len(writer.failures)} packages; wrote {writer.written} of {len(nvidia_manifests)}"
+            " feature manifests."
+        ) from next(iter(writer.failures.values()))
 
     # Update DependenciesResolver with the content of dependencies (that is, the new feature manifest we are in
     # the process of constructing)
@@ -132,23 +772,9 @@ def process_manifests_impl(
     #     for package_id, feature_package in flattened_unresolved_tree.items()
     # }
 
-    # Organize the results
-    feature_manifests: Mapping[FilePath, FeatureManifest[FeaturePackageDepsUnresolved]] = {
-        file_path: FeatureManifest[FeaturePackageDepsUnresolved].model_validate(
-            {
-                package_name: FeatureRelease[FeaturePackageDepsUnresolved].model_validate(
-                    {
-                        platform: flattened_unresolved_tree[PackageId(platform, package_name, version)]
-                        for platform in release.packages.keys()
-                    }
-                )
-                for package_name, release in manifest.releases.items()
-            }
-        )
-        for file_path, (version, manifest) in nvidia_manifests.items()
-    }
+    if shard is not None:
+        logger.info("Wrote the features of %d packages to %s.", len(packages), journal_path)
+        return
 
-    # Write the results
-    for file_path, feature_manifest in feature_manifests.items():
-        feature_manifest_path = file_path.with_stem(file_path.stem.replace("redistrib", "feature"))
-        feature_manifest.write(feature_manifest_path)
+    # The feature manifests hold everything the journal did.
+    journal_path.unlink()
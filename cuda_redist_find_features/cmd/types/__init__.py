@@ -1,4 +1,6 @@
+from ._byte_size import BYTE_SIZE_PARAM_TYPE
 from ._http_url import HTTP_URL_PARAM_TYPE
+from ._shard import SHARD_PARAM_TYPE
 from ._version import VERSION_PARAM_TYPE, NoneOrVersion
 
-__all__ = ["HTTP_URL_PARAM_TYPE", "VERSION_PARAM_TYPE", "NoneOrVersion"]
+__all__ = ["BYTE_SIZE_PARAM_TYPE", "HTTP_URL_PARAM_TYPE", "SHARD_PARAM_TYPE", "VERSION_PARAM_TYPE", "NoneOrVersion"]
@@ -0,0 +1,26 @@
+import re
+
+import click
+
+_BYTE_SIZE_REGEX = re.compile(r"(?P<value>\d+)\s*(?P<unit>[KMGT]?)(?:i?B)?", re.IGNORECASE)
+_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+class ByteSize(click.ParamType):
+    name: str = "size"
+
+    def convert(self, value: str | int, param: None | click.Parameter, ctx: None | click.Context) -> int:
+        if isinstance(value, int):
+            return value
+
+        matched = _BYTE_SIZE_REGEX.fullmatch(value.strip())
+        if matched is None:
+            self.fail(
+                f"{value} is not a valid size; expected a number of bytes, optionally suffixed with K, M, G, or T",
+                param,
+                ctx,
+            )
+        return int(matched["value"]) * _UNITS[matched["unit"].upper()]
+
+
+BYTE_SIZE_PARAM_TYPE = ByteSize()
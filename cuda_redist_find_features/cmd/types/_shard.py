@@ -0,0 +1,20 @@
+import click
+
+from cuda_redist_find_features.types import Shard as _Shard
+
+
+class Shard(click.ParamType):
+    name: str = "shard"
+
+    def convert(self, value: str | _Shard, param: None | click.Parameter, ctx: None | click.Context) -> _Shard:
+        if isinstance(value, _Shard):
+            return value
+
+        index, _, count = value.partition("/")
+        try:
+            return _Shard(index=int(index), count=int(count))
+        except ValueError:
+            self.fail(f"{value} is not a valid shard; expected INDEX/COUNT with 0 <= INDEX < COUNT", param, ctx)
+
+
+SHARD_PARAM_TYPE = Shard()
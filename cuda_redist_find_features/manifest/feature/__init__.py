@@ -1,21 +1,31 @@
 from .manifest import FeatureManifest
 from .outputs import FeatureOutputs
 from .package import (
+    DETECTOR_VERSION,
     FeaturePackage,
+    FeaturePackageCache,
+    FeaturePackageCacheStats,
     FeaturePackageDepsResolved,
     FeaturePackageDepsResolver,
     FeaturePackageDepsUnresolved,
+    FeaturePackageJournal,
     FeaturePackageTy,
+    UnpackedArchive,
 )
 from .release import FeatureRelease
 
 __all__ = [
+    "DETECTOR_VERSION",
     "FeatureManifest",
     "FeatureOutputs",
     "FeaturePackage",
+    "FeaturePackageCache",
+    "FeaturePackageCacheStats",
     "FeaturePackageDepsResolved",
     "FeaturePackageDepsResolver",
     "FeaturePackageDepsUnresolved",
+    "FeaturePackageJournal",
     "FeaturePackageTy",
     "FeatureRelease",
+    "UnpackedArchive",
 ]
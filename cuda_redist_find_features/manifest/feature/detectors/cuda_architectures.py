@@ -1,22 +1,20 @@
-import re
-import subprocess
 import time
 from collections.abc import Mapping, Sequence, Set
-from dataclasses import dataclass, field
-from pathlib import Path
+from dataclasses import dataclass
 
 from typing_extensions import override
 
 from cuda_redist_find_features.types import CudaArch, CudaArchTA
 from cuda_redist_find_features.utilities import get_logger
 
-from .groupable_feature_detector import GroupableFeatureDetector
+from .elf_feature_detector import ElfFeatureDetector
+from .utilities import ElfAnalysis, FileTree
 
 logger = get_logger(__name__)
 
 
 @dataclass
-class CudaArchitecturesDetector(GroupableFeatureDetector[CudaArch]):
+class CudaArchitecturesDetector(ElfFeatureDetector[CudaArch]):
     """
     Either:
 
@@ -24,14 +22,11 @@ class CudaArchitecturesDetector(GroupableFeatureDetector[CudaArch]):
     - Mapping from subdirectory name to list of architectures supported by the libraries in that subdirectory.
     """
 
-    dir: Path = Path("lib")
-    ignored_dirs: Set[Path] = field(default_factory=lambda: set(map(Path, ("stubs", "cmake", "Win32", "x64"))))
-
-    @staticmethod
     @override
-    def path_feature_detector(path: Path) -> Set[CudaArch]:
+    def elf_feature_detector(self, analysis: ElfAnalysis) -> Set[CudaArch]:
         """
-        Equivalent to the following bash snippet, sans ordering:
+        Returns the architectures found in the fatbin of the analyzed library, equivalent to the following bash snippet,
+        sans ordering:
 
         ```console
         $ cuobjdump libcublas.so | grep 'arch =' | sort -u
@@ -40,42 +35,24 @@ class CudaArchitecturesDetector(GroupableFeatureDetector[CudaArch]):
         arch = sm_86
         arch = sm_90
         ```
-        """
-        logger.debug("Running cuobjdmp on %s...", path)
-        start_time = time.time()
-        result = subprocess.run(
-            ["cuobjdump", path],
-            capture_output=True,
-            check=False,
-        )
-        end_time = time.time()
-        logger.debug("Ran cuobjdump on %s in %d seconds.", path, end_time - start_time)
 
-        # Handle failure and the case where the library is GPU-agnostic.
-        if result.returncode != 0:
-            err_msg = result.stderr.decode("utf-8")
-            if "does not contain device code" in err_msg:
-                logger.debug("%s is GPU-agnostic.", path)
-                return set()
-
-            raise RuntimeError(f"Failed to run cuobjdump on {path}: {err_msg}")
+        NOTE: The suffix of architecture-specific targets (e.g., `sm_90a`) can only be recovered from uncompressed
+        entries.
+        """
+        # Handle the case where the library is GPU-agnostic.
+        if not analysis.cuda_architectures:
+            logger.debug("Library is GPU-agnostic.")
+            return set()
 
-        output = result.stdout.decode("utf-8")
-        architecture_strs: set[str] = set(re.findall(r"^arch = (.+)$", output, re.MULTILINE))
-        architectures: set[CudaArch] = set(map(CudaArchTA.validate_python, architecture_strs))
+        architectures: set[CudaArch] = set(map(CudaArchTA.validate_python, analysis.cuda_architectures))
         logger.debug("Found architectures: %s", architectures)
         return architectures
 
-    @staticmethod
-    @override
-    def path_filter(path: Path) -> bool:
-        return path.suffix == ".so"
-
     @override
-    def find(self, store_path: Path) -> None | Sequence[CudaArch] | Mapping[str, Sequence[CudaArch]]:
-        logger.debug("Getting supported CUDA architectures for %s...", store_path)
+    def find(self, tree: FileTree) -> None | Sequence[CudaArch] | Mapping[str, Sequence[CudaArch]]:
+        logger.debug("Getting supported CUDA architectures for %s...", tree.root)
         start_time = time.time()
-        ret = super().find(store_path)
+        ret = super().find(tree)
         end_time = time.time()
-        logger.debug("Got supported CUDA architectures for %s in %d seconds.", store_path, end_time - start_time)
+        logger.debug("Got supported CUDA architectures for %s in %d seconds.", tree.root, end_time - start_time)
         return ret
@@ -7,11 +7,7 @@ from typing_extensions import override
 from cuda_redist_find_features.utilities import get_logger
 
 from .types import FeatureDetector
-from .utilities import (
-    cached_path_exists,
-    cached_path_has_contents,
-    cached_path_is_dir,
-)
+from .utilities import FileTree
 
 logger = get_logger(__name__)
 
@@ -25,13 +21,14 @@ class DirDetector(FeatureDetector[Path]):
     dir: Path
 
     @override
-    def find(self, store_path: Path) -> None | Path:
+    def find(self, tree: FileTree) -> None | Path:
         """
-        Finds the path to a non-empty directory within the given Nix store path.
+        Finds the path to a non-empty directory within the given file tree.
         """
+        store_path = tree.root
         dir_path = store_path / self.dir
         satisfied = all(
-            all(test(parent) for test in (cached_path_exists, cached_path_has_contents, cached_path_is_dir))
+            all(test(parent) for test in (tree.exists, tree.has_contents, tree.is_dir))
             # Get parents from root to path (reverse order), starting with the store path.
             # This excludes the parents of the store path, like `/`, `/nix`, and `/nix/store`.
             for parent in chain(dir_path.parents[::-1], (dir_path,))
@@ -8,7 +8,7 @@ from cuda_redist_find_features.utilities import get_logger
 
 from .dir import DirDetector
 from .types import FeatureDetector
-from .utilities import cached_path_rglob
+from .utilities import FileTree
 
 logger = get_logger(__name__)
 
@@ -20,15 +20,15 @@ class DynamicLibraryDetector(FeatureDetector[Sequence[Path]]):
     """
 
     @override
-    def find(self, store_path: Path) -> None | Sequence[Path]:
+    def find(self, tree: FileTree) -> None | Sequence[Path]:
         """
-        Finds paths of dynamic libraries under `lib` within the given Nix store path.
+        Finds paths of dynamic libraries under `lib` within the given file tree.
         """
-        lib_dir = DirDetector(Path("lib")).find(store_path)
+        lib_dir = DirDetector(Path("lib")).find(tree)
         if lib_dir is None:
             return None
 
-        dynamic_libraries = cached_path_rglob(lib_dir, "*.so", files_only=True)
+        dynamic_libraries = tree.rglob(lib_dir, "*.so", files_only=True)
         if [] != dynamic_libraries:
             logger.debug("Found dynamic libraries: %s.", dynamic_libraries)
             return dynamic_libraries
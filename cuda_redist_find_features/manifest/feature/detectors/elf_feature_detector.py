@@ -0,0 +1,48 @@
+import re
+from abc import abstractmethod
+from collections.abc import Set
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from typing_extensions import override
+
+from cuda_redist_find_features.utilities import get_logger
+
+from .groupable_feature_detector import GroupableFeatureDetector, RichlyComparable
+from .utilities import ElfAnalyses, ElfAnalysis
+
+logger = get_logger(__name__)
+
+_SHARED_LIBRARY_REGEX = re.compile(r".+\.so(?:\.\d+)*")
+
+
+@dataclass
+class ElfFeatureDetector(GroupableFeatureDetector[RichlyComparable]):
+    """
+    A detector for features of the shared libraries under `lib`, read from their `ElfAnalysis`.
+
+    Detectors sharing an `ElfAnalyses` instance read each library only once between them.
+    """
+
+    dir: Path = Path("lib")
+    ignored_dirs: Set[Path] = field(default_factory=lambda: set(map(Path, ("stubs", "cmake", "Win32", "x64"))))
+    elf_analyses: ElfAnalyses = field(default_factory=ElfAnalyses)
+
+    @abstractmethod
+    def elf_feature_detector(self, analysis: ElfAnalysis) -> Set[RichlyComparable]:
+        raise NotImplementedError
+
+    @override
+    def path_feature_detector(self, path: Path) -> Set[RichlyComparable]:
+        analysis = self.elf_analyses.get(path)
+        if analysis is None:
+            return set()
+        return self.elf_feature_detector(analysis)
+
+    @staticmethod
+    @override
+    def path_filter(path: Path) -> bool:
+        """
+        Matches both unversioned and versioned names, like `libfoo.so` and `libfoo.so.12.3.1`.
+        """
+        return _SHARED_LIBRARY_REGEX.fullmatch(path.name) is not None
@@ -8,7 +8,7 @@ from cuda_redist_find_features.utilities import get_logger
 
 from .dir import DirDetector
 from .types import FeatureDetector
-from .utilities import cached_path_rglob
+from .utilities import FileTree
 
 logger = get_logger(__name__)
 
@@ -20,28 +20,28 @@ class ExecutableDetector(FeatureDetector[Sequence[Path]]):
     """
 
     @staticmethod
-    def file_is_unix_executable(file: Path) -> bool:
-        return bool(file.stat().st_mode | 0o111)
+    def file_is_unix_executable(tree: FileTree, file: Path) -> bool:
+        return bool(tree.mode(file) | 0o111)
 
     @staticmethod
-    def file_is_windows_executable(file: Path) -> bool:
+    def file_is_windows_executable(tree: FileTree, file: Path) -> bool:
         # Yes, I know DLLs are not executables, but they are okay to exist in the bin directory.
         return file.suffix in {".bat", ".dll", ".exe"}
 
     @override
-    def find(self, store_path: Path) -> None | Sequence[Path]:
+    def find(self, tree: FileTree) -> None | Sequence[Path]:
         """
-        Finds paths of executables under `bin` within the given Nix store path.
+        Finds paths of executables under `bin` within the given file tree.
         """
-        bin_dir = DirDetector(Path("bin")).find(store_path)
+        bin_dir = DirDetector(Path("bin")).find(tree)
         if bin_dir is None:
             return None
 
         executables = [
             executable
-            for executable in cached_path_rglob(bin_dir, "*", files_only=True)
+            for executable in tree.rglob(bin_dir, "*", files_only=True)
             if any(
-                test(executable)
+                test(tree, executable)
                 for test in (ExecutableDetector.file_is_unix_executable, ExecutableDetector.file_is_windows_executable)
             )
         ]
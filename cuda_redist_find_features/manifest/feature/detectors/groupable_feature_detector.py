@@ -9,7 +9,7 @@ from cuda_redist_find_features.utilities import get_logger
 
 from .dir import DirDetector
 from .types import FeatureDetector
-from .utilities import cached_path_is_dir, cached_path_iterdir
+from .utilities import FileTree
 
 logger = get_logger(__name__)
 
@@ -33,9 +33,8 @@ class GroupableFeatureDetector(FeatureDetector[Sequence[RichlyComparable] | Mapp
     dir: Path
     ignored_dirs: Set[Path]
 
-    @staticmethod
     @abstractmethod
-    def path_feature_detector(path: Path) -> Set[RichlyComparable]:
+    def path_feature_detector(self, path: Path) -> Set[RichlyComparable]:
         raise NotImplementedError
 
     @staticmethod
@@ -43,25 +42,38 @@ class GroupableFeatureDetector(FeatureDetector[Sequence[RichlyComparable] | Mapp
     def path_filter(path: Path) -> bool:
         raise NotImplementedError
 
-    def paths_func(self, paths: Iterable[Path]) -> Sequence[RichlyComparable]:
+    def paths_func(self, tree: FileTree, paths: Iterable[Path]) -> Sequence[RichlyComparable]:
         """
         Operates on a list of paths and accumulates the results of `self.path_feature_detector` on each path.
 
-        Applies `self.path_filter` to each path before passing it to `self.path_feature_detector`.
+        Applies `self.path_filter` to each path before passing it to `self.path_feature_detector`. Paths are resolved
+        first, so `self.path_feature_detector` runs once per file rather than once per link in a chain like
+        `libfoo.so -> libfoo.so.12 -> libfoo.so.12.3.1`; every alias shares the result of the file it points to.
 
         Returns a sorted, deduplicated list of features.
         """
+        features_by_file: dict[Path, Set[RichlyComparable]] = {}
+        for path in filter(self.path_filter, paths):
+            file = tree.resolve(path)
+            if file is None or not tree.is_file(file):
+                logger.debug("Skipping %s, which is not a file...", path)
+                continue
+            if file in features_by_file:
+                logger.debug("Reusing features of %s for %s...", file, path)
+                continue
+            features_by_file[file] = self.path_feature_detector(file)
+
         return sorted(
             reduce(
                 set.union,  # type: ignore[arg-type]
-                map(self.path_feature_detector, filter(self.path_filter, paths)),
+                features_by_file.values(),
                 cast(set[RichlyComparable], set()),
             )
         )
 
-    def find(self, store_path: Path) -> None | Sequence[RichlyComparable] | Mapping[str, Sequence[RichlyComparable]]:
-        # Ensure that store_path is a directory which exists and is non-empty.
-        absolute_dir: None | Path = DirDetector(self.dir).find(store_path)
+    def find(self, tree: FileTree) -> None | Sequence[RichlyComparable] | Mapping[str, Sequence[RichlyComparable]]:
+        # Ensure that the directory exists and is non-empty.
+        absolute_dir: None | Path = DirDetector(self.dir).find(tree)
         if absolute_dir is None:
             return None
 
@@ -70,8 +82,8 @@ class GroupableFeatureDetector(FeatureDetector[Sequence[RichlyComparable] | Mapp
 
         items: list[Path] = []
 
-        for item in cached_path_iterdir(absolute_dir):
-            if cached_path_is_dir(item):
+        for item in tree.iterdir(absolute_dir):
+            if tree.is_dir(item):
                 if item in absolute_ignored_dirs:
                     logger.debug("Skipping ignored directory %s...", item)
                 else:
@@ -79,6 +91,8 @@ class GroupableFeatureDetector(FeatureDetector[Sequence[RichlyComparable] | Mapp
                     items.append(item)
             elif not self.path_filter(item):
                 logger.debug("Skipping ignored file %s...", item)
+            elif not tree.exists(item):
+                logger.debug("Skipping dangling symlink %s...", item)
             else:
                 logger.debug("Found file %s...", item)
                 items.append(item)
@@ -88,13 +102,13 @@ class GroupableFeatureDetector(FeatureDetector[Sequence[RichlyComparable] | Mapp
             return None
 
         # If there are no subdirectories, return a list of features.
-        if all(item.is_file() for item in items):
-            return self.paths_func(items)
+        if all(tree.is_file(item) for item in items):
+            return self.paths_func(tree, items)
 
         # If there are no files, return a dictionary mapping each subdirectory to a list of features.
-        if all(item.is_dir() for item in items):
+        if all(tree.is_dir(item) for item in items):
             return {
-                subdir.relative_to(absolute_dir).as_posix(): self.paths_func(cached_path_iterdir(subdir))
+                subdir.relative_to(absolute_dir).as_posix(): self.paths_func(tree, tree.iterdir(subdir))
                 for subdir in items
             }
 
@@ -8,7 +8,7 @@ from cuda_redist_find_features.utilities import get_logger
 
 from .dir import DirDetector
 from .types import FeatureDetector
-from .utilities import cached_path_rglob
+from .utilities import FileTree
 
 logger = get_logger(__name__)
 
@@ -20,17 +20,17 @@ class HeaderDetector(FeatureDetector[Sequence[Path]]):
     """
 
     @override
-    def find(self, store_path: Path) -> None | Sequence[Path]:
+    def find(self, tree: FileTree) -> None | Sequence[Path]:
         """
-        Finds paths of headers under `include` within the given Nix store path.
+        Finds paths of headers under `include` within the given file tree.
         """
-        include_dir = DirDetector(Path("include")).find(store_path)
+        include_dir = DirDetector(Path("include")).find(tree)
         if include_dir is None:
             return None
 
         headers = [
             header
-            for header in cached_path_rglob(include_dir, "*.h*", files_only=True)
+            for header in tree.rglob(include_dir, "*.h*", files_only=True)
             if header.suffix in {".h", ".hh", ".hpp", ".hxx"}
         ]
         if [] != headers:
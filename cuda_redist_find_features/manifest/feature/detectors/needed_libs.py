@@ -1,21 +1,20 @@
-import subprocess
 import time
 from collections.abc import Mapping, Sequence, Set
-from dataclasses import dataclass, field
-from pathlib import Path
+from dataclasses import dataclass
 
 from typing_extensions import override
 
 from cuda_redist_find_features.types import LibSoName, LibSoNameTA
 from cuda_redist_find_features.utilities import get_logger
 
-from .groupable_feature_detector import GroupableFeatureDetector
+from .elf_feature_detector import ElfFeatureDetector
+from .utilities import ElfAnalysis, FileTree
 
 logger = get_logger(__name__)
 
 
 @dataclass
-class NeededLibsDetector(GroupableFeatureDetector[LibSoName]):
+class NeededLibsDetector(ElfFeatureDetector[LibSoName]):
     """
     Either:
 
@@ -23,14 +22,10 @@ class NeededLibsDetector(GroupableFeatureDetector[LibSoName]):
     - Mapping from subdirectory name to list of libs needed by the libraries in that subdirectory.
     """
 
-    dir: Path = Path("lib")
-    ignored_dirs: Set[Path] = field(default_factory=lambda: set(map(Path, ("stubs", "cmake", "Win32", "x64"))))
-
-    @staticmethod
     @override
-    def path_feature_detector(path: Path) -> Set[LibSoName]:
+    def elf_feature_detector(self, analysis: ElfAnalysis) -> Set[LibSoName]:
         """
-        Returns a values equivalent to the following bash snippet:
+        Returns the DT_NEEDED entries of the analyzed library, equivalent to the following bash snippet:
 
         ```console
         $ patchelf --print-needed ./libcusolver/lib/libcusolver.so
@@ -45,31 +40,15 @@ class NeededLibsDetector(GroupableFeatureDetector[LibSoName]):
         ld-linux-x86-64.so.2
         ```
         """
-        logger.debug("Running patchelf --print-needed on %s...", path)
-        start_time = time.time()
-        result = subprocess.run(
-            ["patchelf", "--print-needed", path],
-            capture_output=True,
-            check=True,
-        )
-        end_time = time.time()
-        logger.debug("Ran patchelf --print-needed on %s in %s seconds.", path, end_time - start_time)
-        libs_needed: set[LibSoName] = {
-            LibSoNameTA.validate_python(name) for name in result.stdout.decode("utf-8").splitlines() if name
-        }
+        libs_needed: set[LibSoName] = {LibSoNameTA.validate_python(name) for name in analysis.needed if name}
         logger.debug("Libs needed: %s.", libs_needed)
         return libs_needed
 
-    @staticmethod
-    @override
-    def path_filter(path: Path) -> bool:
-        return path.suffix == ".so"
-
     @override
-    def find(self, store_path: Path) -> None | Sequence[LibSoName] | Mapping[str, Sequence[LibSoName]]:
-        logger.debug("Getting needed libs for %s...", store_path)
+    def find(self, tree: FileTree) -> None | Sequence[LibSoName] | Mapping[str, Sequence[LibSoName]]:
+        logger.debug("Getting needed libs for %s...", tree.root)
         start_time = time.time()
-        ret = super().find(store_path)
+        ret = super().find(tree)
         end_time = time.time()
-        logger.debug("Got needed libs for %s in %s seconds.", store_path, end_time - start_time)
+        logger.debug("Got needed libs for %s in %s seconds.", tree.root, end_time - start_time)
         return ret
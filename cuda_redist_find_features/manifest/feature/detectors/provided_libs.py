@@ -1,21 +1,20 @@
-import subprocess
 import time
 from collections.abc import Mapping, Sequence, Set
-from dataclasses import dataclass, field
-from pathlib import Path
+from dataclasses import dataclass
 
 from typing_extensions import override
 
 from cuda_redist_find_features.types import LibSoName, LibSoNameTA
 from cuda_redist_find_features.utilities import get_logger
 
-from .groupable_feature_detector import GroupableFeatureDetector
+from .elf_feature_detector import ElfFeatureDetector
+from .utilities import ElfAnalysis, FileTree
 
 logger = get_logger(__name__)
 
 
 @dataclass
-class ProvidedLibsDetector(GroupableFeatureDetector[LibSoName]):
+class ProvidedLibsDetector(ElfFeatureDetector[LibSoName]):
     """
     Either:
 
@@ -23,14 +22,10 @@ class ProvidedLibsDetector(GroupableFeatureDetector[LibSoName]):
     - Mapping from subdirectory name to list of libs provided by the libraries in that subdirectory.
     """
 
-    dir: Path = Path("lib")
-    ignored_dirs: Set[Path] = field(default_factory=lambda: set(map(Path, ("stubs", "cmake", "Win32", "x64"))))
-
-    @staticmethod
     @override
-    def path_feature_detector(path: Path) -> Set[LibSoName]:
+    def elf_feature_detector(self, analysis: ElfAnalysis) -> Set[LibSoName]:
         """
-        Returns the soname of the given library.
+        Returns the soname of the analyzed library, read from its DT_SONAME entry.
 
         The value is equivalent to the following bash snippet:
 
@@ -39,34 +34,19 @@ class ProvidedLibsDetector(GroupableFeatureDetector[LibSoName]):
         libcusolver.so.11
         ```
         """
-        logger.debug("Running patchelf --print-soname on %s...", path)
-        start_time = time.time()
-        result = subprocess.run(
-            ["patchelf", "--print-soname", path],
-            capture_output=True,
-            check=True,
-        )
-        end_time = time.time()
-        logger.debug("Ran patchelf --print-soname on %s in %s seconds.", path, end_time - start_time)
-        name: str = result.stdout.decode("utf-8").strip()
-        if name:
-            lib_so_name: LibSoName = LibSoNameTA.validate_python(name)
+        if analysis.soname:
+            lib_so_name: LibSoName = LibSoNameTA.validate_python(analysis.soname)
             logger.debug("Lib soname: %s.", lib_so_name)
             return set((lib_so_name,))
         else:
-            logger.info("No lib soname found for %s.", path)
+            logger.info("No lib soname found.")
             return set()
 
-    @staticmethod
-    @override
-    def path_filter(path: Path) -> bool:
-        return path.suffix == ".so"
-
     @override
-    def find(self, store_path: Path) -> None | Sequence[LibSoName] | Mapping[str, Sequence[LibSoName]]:
-        logger.debug("Getting needed libs for %s...", store_path)
+    def find(self, tree: FileTree) -> None | Sequence[LibSoName] | Mapping[str, Sequence[LibSoName]]:
+        logger.debug("Getting needed libs for %s...", tree.root)
         start_time = time.time()
-        ret = super().find(store_path)
+        ret = super().find(tree)
         end_time = time.time()
-        logger.debug("Got needed libs for %s in %s seconds.", store_path, end_time - start_time)
+        logger.debug("Got needed libs for %s in %s seconds.", tree.root, end_time - start_time)
         return ret
@@ -8,7 +8,7 @@ from cuda_redist_find_features.utilities import get_logger
 
 from .dir import DirDetector
 from .types import FeatureDetector
-from .utilities import cached_path_rglob
+from .utilities import FileTree
 
 logger = get_logger(__name__)
 
@@ -20,11 +20,11 @@ class PythonModuleDetector(FeatureDetector[Sequence[Path]]):
     """
 
     @override
-    def find(self, store_path: Path) -> None | Sequence[Path]:
+    def find(self, tree: FileTree) -> None | Sequence[Path]:
         """
-        Finds paths of python modules under `site-packages` directory under `lib` within the given Nix store path.
+        Finds paths of python modules under `site-packages` directory under `lib` within the given file tree.
         """
-        lib_dir = DirDetector(Path("lib")).find(store_path)
+        lib_dir = DirDetector(Path("lib")).find(tree)
         if lib_dir is None:
             return None
 
@@ -32,10 +32,10 @@ class PythonModuleDetector(FeatureDetector[Sequence[Path]]):
         # There should only be one.
         site_packages_dirs = [
             subsubdir
-            for subdir in lib_dir.iterdir()
-            if subdir.is_dir() and subdir.name.startswith("python")
-            for subsubdir in subdir.iterdir()
-            if subsubdir.is_dir() and subsubdir.name == "site-packages"
+            for subdir in tree.iterdir(lib_dir)
+            if tree.is_dir(subdir) and subdir.name.startswith("python")
+            for subsubdir in tree.iterdir(subdir)
+            if tree.is_dir(subsubdir) and subsubdir.name == "site-packages"
         ]
 
         # If there are no lib subdirs, we can't have python modules.
@@ -51,11 +51,11 @@ class PythonModuleDetector(FeatureDetector[Sequence[Path]]):
         site_packages_dir = site_packages_dirs[0]
 
         # Python modules must be non-empty.
-        if not any(site_packages_dir.iterdir()):
+        if not tree.has_contents(site_packages_dir):
             raise RuntimeError(f"Found empty site-packages dir: {site_packages_dir}")
 
         # Get the python modules.
-        python_modules = cached_path_rglob(site_packages_dir, "*.py", files_only=True)
+        python_modules = tree.rglob(site_packages_dir, "*.py", files_only=True)
         if [] != python_modules:
             logger.debug("Found python modules: %s.", python_modules)
             return python_modules
@@ -1,21 +1,23 @@
 from abc import ABC, abstractmethod
-from pathlib import Path
 from typing import Generic, TypeVar
 
+from cuda_redist_find_features.manifest.feature.detectors.utilities import FileTree
+
 T = TypeVar("T")
 
 
 class FeatureDetector(ABC, Generic[T]):
     """
-    A generic feature detector which can detect the presence of a type `T` within a Nix store path.
+    A generic feature detector which can detect the presence of a type `T` within a file tree, either an unpacked Nix
+    store path or the listing of an archive.
 
     1. Retrieves a list of paths of interest using `gather`.
     2. Applies
     """
 
     @abstractmethod
-    def find(self, store_path: Path) -> None | T:
+    def find(self, tree: FileTree) -> None | T:
         raise NotImplementedError
 
-    def detect(self, store_path: Path) -> bool:
-        return self.find(store_path) is not None
+    def detect(self, tree: FileTree) -> bool:
+        return self.find(tree) is not None
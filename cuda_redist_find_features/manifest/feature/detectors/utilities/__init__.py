@@ -1,13 +1,20 @@
-from ._cached_path import exists as cached_path_exists
-from ._cached_path import has_contents as cached_path_has_contents
-from ._cached_path import is_dir as cached_path_is_dir
-from ._cached_path import iterdir as cached_path_iterdir
-from ._cached_path import rglob as cached_path_rglob
+from ._archive_tree import ArchiveTree
+from ._elf import ElfDynamic, ElfFile, ElfSection
+from ._elf_analysis import ElfAnalyses, ElfAnalysis
+from ._fatbin import FatbinEntry, fatbin_entries
+from ._file_tree import FileTree
+from ._snapshot_tree import SnapshotEntry, SnapshotTree
 
 __all__ = [
-    "cached_path_exists",
-    "cached_path_has_contents",
-    "cached_path_is_dir",
-    "cached_path_iterdir",
-    "cached_path_rglob",
+    "ArchiveTree",
+    "ElfAnalyses",
+    "ElfAnalysis",
+    "ElfDynamic",
+    "ElfFile",
+    "ElfSection",
+    "FatbinEntry",
+    "FileTree",
+    "SnapshotEntry",
+    "SnapshotTree",
+    "fatbin_entries",
 ]
@@ -0,0 +1,102 @@
+import stat
+import tarfile
+import time
+import zipfile
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Self
+
+from typing_extensions import override
+
+from cuda_redist_find_features.utilities import get_logger
+
+from ._snapshot_tree import SnapshotEntry, SnapshotTree
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class ArchiveTree(SnapshotTree):
+    """
+    A `SnapshotTree` built from the member listing of a tar or zip archive, without unpacking it.
+
+    Like `nix flake prefetch`, a single top-level directory shared by every member is stripped, so paths line up with
+    those of the unpacked store path. `root` is a virtual path; nothing is read from beneath it.
+    """
+
+    @classmethod
+    @override
+    def of(cls, root: Path) -> Self:
+        """
+        Lists the members of the archive at `root`, dispatching on its format.
+        """
+        logger.info("Listing %s...", root)
+        start_time = time.time()
+        if zipfile.is_zipfile(root):
+            tree = cls.of_members(root, cls._zip_members(root))
+        else:
+            tree = cls.of_members(root, cls._tar_members(root))
+        end_time = time.time()
+        logger.info("Listed %d members of %s in %d seconds.", len(tree.entries), root, end_time - start_time)
+        return tree
+
+    @staticmethod
+    def _tar_members(archive: Path) -> Iterable[tuple[str, SnapshotEntry]]:
+        """
+        Streams the member index of a (possibly compressed) tarball.
+        """
+        with tarfile.open(archive, mode="r|*") as tar:
+            for info in tar:
+                permissions = info.mode & 0o7777
+                if info.isdir():
+                    yield info.name, SnapshotEntry(stat.S_IFDIR | permissions, 0)
+                elif info.issym():
+                    yield info.name, SnapshotEntry(stat.S_IFLNK | permissions, 0, info.linkname)
+                elif info.isreg() or info.islnk():
+                    # Hard links are indistinguishable from regular files once unpacked.
+                    yield info.name, SnapshotEntry(stat.S_IFREG | permissions, info.size)
+                else:
+                    logger.debug("Skipping special file %s in %s.", info.name, archive)
+
+    @staticmethod
+    def _zip_members(archive: Path) -> Iterable[tuple[str, SnapshotEntry]]:
+        """
+        Reads the central directory of a zip file.
+        """
+        with zipfile.ZipFile(archive) as zip_file:
+            for info in zip_file.infolist():
+                unix_mode = info.external_attr >> 16
+                permissions = stat.S_IMODE(unix_mode)
+                if info.is_dir():
+                    yield info.filename, SnapshotEntry(stat.S_IFDIR | (permissions or 0o755), 0)
+                elif stat.S_ISLNK(unix_mode):
+                    # Zip files store the target of a symlink as its content.
+                    target = zip_file.read(info).decode("utf-8")
+                    yield info.filename, SnapshotEntry(stat.S_IFLNK | permissions, 0, target)
+                else:
+                    yield info.filename, SnapshotEntry(stat.S_IFREG | (permissions or 0o644), info.file_size)
+
+    @classmethod
+    def of_members(cls, root: Path, listing: Iterable[tuple[str, SnapshotEntry]]) -> Self:
+        """
+        Builds a tree from archive member names and metadata, adding any parent directories the archive omits.
+        """
+        members: dict[PurePosixPath, SnapshotEntry] = {}
+        for name, member in listing:
+            path = PurePosixPath(name.lstrip("/"))
+            if path == PurePosixPath():
+                continue
+            members[path] = member
+            for parent in path.parents[:-1]:
+                members.setdefault(parent, SnapshotEntry(stat.S_IFDIR | 0o755, 0))
+
+        # Strip a single top-level directory.
+        top_level = {path.parts[0] for path in members}
+        if len(top_level) == 1:
+            top_dir = PurePosixPath(top_level.pop())
+            if stat.S_ISDIR(members[top_dir].mode):
+                members = {path.relative_to(top_dir): member for path, member in members.items() if path != top_dir}
+
+        members[PurePosixPath()] = SnapshotEntry(stat.S_IFDIR | 0o755, 0)
+        return cls.of_entries(root, members)
@@ -0,0 +1,262 @@
+import mmap
+import struct
+from collections.abc import Generator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal, NamedTuple, Self
+
+# See https://refspecs.linuxfoundation.org/elf/gabi4+/ch4.eheader.html for the layout of the structures below.
+_ELF_MAGIC = b"\x7fELF"
+_EI_CLASS_64 = 2
+_EI_DATA_MSB = 2
+_EI_NIDENT = 16
+
+_SHN_XINDEX = 0xFFFF
+_SHT_DYNAMIC = 6
+_PT_LOAD = 1
+_PT_DYNAMIC = 2
+
+_DT_NULL = 0
+_DT_NEEDED = 1
+_DT_STRTAB = 5
+_DT_SONAME = 14
+
+
+@dataclass(frozen=True, slots=True)
+class _ElfLayout:
+    """
+    The `struct` formats of the ELF structures for a given class (32 or 64-bit) and data encoding (endianness).
+    """
+
+    header: struct.Struct
+    section_header: struct.Struct
+    program_header: struct.Struct
+    dynamic_entry: struct.Struct
+
+    @classmethod
+    def of(cls, is_64_bit: bool, byte_order: Literal["<", ">"]) -> Self:
+        if is_64_bit:
+            return cls(
+                header=struct.Struct(byte_order + "HHIQQQIHHHHHH"),
+                section_header=struct.Struct(byte_order + "IIQQQQIIQQ"),
+                program_header=struct.Struct(byte_order + "IIQQQQQQ"),
+                dynamic_entry=struct.Struct(byte_order + "qQ"),
+            )
+        return cls(
+            header=struct.Struct(byte_order + "HHIIIIIHHHHHH"),
+            section_header=struct.Struct(byte_order + "IIIIIIIIII"),
+            program_header=struct.Struct(byte_order + "IIIIIIII"),
+            dynamic_entry=struct.Struct(byte_order + "iI"),
+        )
+
+
+class _ElfHeader(NamedTuple):
+    e_type: int
+    e_machine: int
+    e_version: int
+    e_entry: int
+    e_phoff: int
+    e_shoff: int
+    e_flags: int
+    e_ehsize: int
+    e_phentsize: int
+    e_phnum: int
+    e_shentsize: int
+    e_shnum: int
+    e_shstrndx: int
+
+
+class _ElfSectionHeader(NamedTuple):
+    sh_name: int
+    sh_type: int
+    sh_flags: int
+    sh_addr: int
+    sh_offset: int
+    sh_size: int
+    sh_link: int
+    sh_info: int
+    sh_addralign: int
+    sh_entsize: int
+
+
+@dataclass(frozen=True, slots=True)
+class ElfSection:
+    name: str
+    type: int
+    offset: int
+    size: int
+    link: int
+
+
+@dataclass(frozen=True, slots=True)
+class ElfSegment:
+    type: int
+    offset: int
+    vaddr: int
+    filesz: int
+
+
+@dataclass(frozen=True, slots=True)
+class ElfDynamic:
+    """
+    The entries of the dynamic section of an ELF file we care about.
+    """
+
+    soname: None | str
+    needed: Sequence[str]
+
+
+@dataclass(frozen=True)
+class ElfFile:
+    """
+    A minimal, read-only ELF reader which works directly on a memory-mapped file.
+
+    Supports both 32 and 64-bit files of either endianness.
+    """
+
+    data: mmap.mmap
+    layout: _ElfLayout
+    flags: int
+    sections: Sequence[ElfSection]
+    segments: Sequence[ElfSegment]
+
+    @classmethod
+    @contextmanager
+    def open(cls, path: Path) -> Generator[None | Self, None, None]:
+        """
+        Memory-maps the file at the given path, yielding None if it is not an ELF file.
+        """
+        with path.open("rb") as file:
+            if path.stat().st_size < _EI_NIDENT:
+                yield None
+                return
+
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if data[:4] != _ELF_MAGIC:
+                    yield None
+                else:
+                    yield cls.of(data)
+
+    @classmethod
+    def of(cls, data: mmap.mmap) -> Self:
+        is_64_bit = data[4] == _EI_CLASS_64
+        byte_order: Literal["<", ">"] = ">" if data[5] == _EI_DATA_MSB else "<"
+        layout = _ElfLayout.of(is_64_bit, byte_order)
+        header = _ElfHeader._make(layout.header.unpack_from(data, _EI_NIDENT))
+        return cls(
+            data=data,
+            layout=layout,
+            flags=header.e_flags,
+            sections=_read_sections(data, layout, header),
+            segments=_read_segments(data, layout, header, is_64_bit),
+        )
+
+    def section(self, name: str) -> None | ElfSection:
+        """
+        Returns the first section with the given name, if any.
+        """
+        return next((section for section in self.sections if section.name == name), None)
+
+    def _vaddr_to_offset(self, vaddr: int) -> None | int:
+        for segment in self.segments:
+            if segment.type == _PT_LOAD and segment.vaddr <= vaddr < segment.vaddr + segment.filesz:
+                return vaddr - segment.vaddr + segment.offset
+        return None
+
+    def dynamic(self) -> ElfDynamic:
+        """
+        Reads DT_SONAME and DT_NEEDED from the dynamic section.
+
+        Equivalent to `patchelf --print-soname` and `patchelf --print-needed`, respectively.
+        """
+        # Prefer the section headers, falling back to the program headers for files whose section headers were
+        # stripped.
+        strtab_offset: None | int = None
+        dynamic_offset: None | int = None
+        dynamic_size: int = 0
+        dynamic_section = next((section for section in self.sections if section.type == _SHT_DYNAMIC), None)
+        if dynamic_section is not None:
+            dynamic_offset, dynamic_size = dynamic_section.offset, dynamic_section.size
+            strtab_offset = self.sections[dynamic_section.link].offset
+        else:
+            dynamic_segment = next((segment for segment in self.segments if segment.type == _PT_DYNAMIC), None)
+            if dynamic_segment is not None:
+                dynamic_offset, dynamic_size = dynamic_segment.offset, dynamic_segment.filesz
+
+        # Statically linked.
+        if dynamic_offset is None:
+            return ElfDynamic(soname=None, needed=[])
+
+        soname_index: None | int = None
+        needed_indices: list[int] = []
+        entry_size = self.layout.dynamic_entry.size
+        for offset in range(dynamic_offset, dynamic_offset + dynamic_size - entry_size + 1, entry_size):
+            d_tag, d_val = self.layout.dynamic_entry.unpack_from(self.data, offset)
+            if d_tag == _DT_NULL:
+                break
+            elif d_tag == _DT_NEEDED:
+                needed_indices.append(d_val)
+            elif d_tag == _DT_SONAME:
+                soname_index = d_val
+            elif d_tag == _DT_STRTAB and strtab_offset is None:
+                strtab_offset = self._vaddr_to_offset(d_val)
+
+        if strtab_offset is None:
+            raise RuntimeError("Found a dynamic section without a string table.")
+
+        return ElfDynamic(
+            soname=None if soname_index is None else _read_str(self.data, strtab_offset + soname_index),
+            needed=[_read_str(self.data, strtab_offset + index) for index in needed_indices],
+        )
+
+
+def _read_sections(data: mmap.mmap, layout: _ElfLayout, header: _ElfHeader) -> Sequence[ElfSection]:
+    if header.e_shoff == 0:
+        return []
+
+    def section_header(index: int) -> _ElfSectionHeader:
+        return _ElfSectionHeader._make(
+            layout.section_header.unpack_from(data, header.e_shoff + index * header.e_shentsize)
+        )
+
+    # Handle extended section numbering, where the real values are stored in the first section header.
+    num_sections = header.e_shnum or section_header(0).sh_size
+    names_index = header.e_shstrndx if header.e_shstrndx != _SHN_XINDEX else section_header(0).sh_link
+
+    section_headers = [section_header(index) for index in range(num_sections)]
+    names_offset = section_headers[names_index].sh_offset
+    return [
+        ElfSection(
+            name=_read_str(data, names_offset + section.sh_name),
+            type=section.sh_type,
+            offset=section.sh_offset,
+            size=section.sh_size,
+            link=section.sh_link,
+        )
+        for section in section_headers
+    ]
+
+
+def _read_segments(data: mmap.mmap, layout: _ElfLayout, header: _ElfHeader, is_64_bit: bool) -> Sequence[ElfSegment]:
+    if header.e_phoff == 0:
+        return []
+
+    segments: list[ElfSegment] = []
+    for index in range(header.e_phnum):
+        raw = layout.program_header.unpack_from(data, header.e_phoff + index * header.e_phentsize)
+        # Unlike the 32-bit layout, p_flags follows p_type.
+        if is_64_bit:
+            p_type, _p_flags, p_offset, p_vaddr, _p_paddr, p_filesz, *_ = raw
+        else:
+            p_type, p_offset, p_vaddr, _p_paddr, p_filesz, *_ = raw
+        segments.append(ElfSegment(type=p_type, offset=p_offset, vaddr=p_vaddr, filesz=p_filesz))
+    return segments
+
+
+def _read_str(data: mmap.mmap, offset: int) -> str:
+    """
+    Reads a null-terminated string starting at the given offset.
+    """
+    end = data.find(b"\0", offset)
+    return data[offset : end if end != -1 else len(data)].decode("utf-8")
@@ -0,0 +1,61 @@
+import time
+from collections.abc import Sequence, Set
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Self
+
+from cuda_redist_find_features.utilities import get_logger
+
+from ._elf import ElfFile
+from ._fatbin import fatbin_entries
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ElfAnalysis:
+    """
+    Everything the binary detectors need to know about an ELF file, gathered in a single pass over it.
+    """
+
+    soname: None | str
+    needed: Sequence[str]
+    cuda_architectures: Set[str]
+
+    @classmethod
+    def of(cls, path: Path) -> None | Self:
+        """
+        Analyzes the ELF file at the given path, returning None if it is not an ELF file.
+        """
+        logger.debug("Analyzing %s...", path)
+        start_time = time.time()
+        with ElfFile.open(path) as elf:
+            if elf is None:
+                logger.info("%s is not an ELF file.", path)
+                return None
+
+            dynamic = elf.dynamic()
+            analysis = cls(
+                soname=dynamic.soname,
+                needed=dynamic.needed,
+                cuda_architectures={entry.cuda_arch for entry in fatbin_entries(elf)},
+            )
+        end_time = time.time()
+        logger.debug("Analyzed %s in %s seconds.", path, end_time - start_time)
+        return analysis
+
+
+@dataclass
+class ElfAnalyses:
+    """
+    Memoizes `ElfAnalysis.of` so detectors sharing an instance analyze each file once.
+
+    Meant to live only as long as the store path whose files it analyzes.
+    """
+
+    analyses: dict[Path, None | ElfAnalysis] = field(default_factory=dict[Path, None | ElfAnalysis])
+
+    def get(self, path: Path) -> None | ElfAnalysis:
+        if path not in self.analyses:
+            self.analyses[path] = ElfAnalysis.of(path)
+        return self.analyses[path]
@@ -0,0 +1,130 @@
+import re
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import NamedTuple
+
+from ._elf import ElfFile
+
+# The fatbin format is undocumented; these layouts match those used by cuobjdump-compatible tools. CUDA only targets
+# little-endian hosts, so the fatbin structures are always little-endian.
+_FATBIN_SECTION = ".nv_fatbin"
+_FATBIN_MAGIC = 0xBA55ED50
+_FATBIN_ALIGNMENT = 8
+
+# magic, version, header_size, fat_size
+_FATBIN_HEADER = struct.Struct("<IHHQ")
+
+_FATBIN_ENTRY_HEADER = struct.Struct("<HHIQIIHHIIIQQQ")
+
+_FATBIN_KIND_PTX = 1
+_FATBIN_KIND_ELF = 2
+_FATBIN_FLAG_COMPRESSED = 0x2000
+
+# Cubins are 64-bit, little-endian ELF files; e_flags is set in the architecture-specific targets, like sm_90a.
+_ELF_MAGIC = b"\x7fELF"
+_ELF64_E_FLAGS = struct.Struct("<I")
+_ELF64_E_FLAGS_OFFSET = 48
+_EF_CUDA_ACCELERATORS = 0x800
+
+# Only the start of a payload is kept, which is enough to find the ELF header of a cubin or the .target directive
+# of PTX.
+_PAYLOAD_PREFIX_LIMIT = 4096
+_PTX_TARGET_REGEX = re.compile(rb"^\s*\.target\s+sm_\d+([a-z]?)\b", re.MULTILINE)
+
+
+class _FatbinEntryHeader(NamedTuple):
+    kind: int
+    unknown0: int
+    header_size: int
+    size: int
+    compressed_size: int
+    unknown1: int
+    minor: int
+    major: int
+    arch: int
+    obj_name_offset: int
+    obj_name_len: int
+    flags: int
+    zero: int
+    decompressed_size: int
+
+
+@dataclass(frozen=True, slots=True)
+class FatbinEntry:
+    """
+    A single PTX or cubin entry within a fatbin.
+    """
+
+    kind: int
+    arch: int
+    flags: int
+    payload_prefix: bytes
+
+    @property
+    def is_compressed(self) -> bool:
+        return bool(self.flags & _FATBIN_FLAG_COMPRESSED)
+
+    @property
+    def arch_suffix(self) -> str:
+        """
+        The suffix of an architecture-specific target (e.g., the `a` in `sm_90a`), if it can be recovered.
+
+        Compressed payloads cannot be inspected, so their suffix is always empty.
+        """
+        if self.is_compressed:
+            return ""
+
+        if self.kind == _FATBIN_KIND_PTX:
+            matched = _PTX_TARGET_REGEX.search(self.payload_prefix)
+            return "" if matched is None else matched.group(1).decode("utf-8")
+
+        if self.kind == _FATBIN_KIND_ELF and self.payload_prefix.startswith(_ELF_MAGIC):
+            (e_flags,) = _ELF64_E_FLAGS.unpack_from(self.payload_prefix, _ELF64_E_FLAGS_OFFSET)
+            return "a" if e_flags & _EF_CUDA_ACCELERATORS else ""
+
+        return ""
+
+    @property
+    def cuda_arch(self) -> str:
+        return f"sm_{self.arch}{self.arch_suffix}"
+
+
+def fatbin_entries(elf: ElfFile) -> Iterator[FatbinEntry]:
+    """
+    Walks the fatbin containers in the `.nv_fatbin` section of the given ELF file, yielding each entry.
+
+    Yields nothing if there is no such section, as is the case for GPU-agnostic libraries.
+    """
+    section = elf.section(_FATBIN_SECTION)
+    if section is None:
+        return
+
+    data = elf.data
+    offset = section.offset
+    section_end = section.offset + section.size
+    while offset + _FATBIN_HEADER.size <= section_end:
+        magic, _version, header_size, fat_size = _FATBIN_HEADER.unpack_from(data, offset)
+        # Containers are aligned, so skip any padding between them.
+        if magic != _FATBIN_MAGIC or header_size == 0:
+            offset += _FATBIN_ALIGNMENT
+            continue
+
+        entry_offset = offset + header_size
+        end = min(entry_offset + fat_size, section_end)
+        while entry_offset + _FATBIN_ENTRY_HEADER.size <= end:
+            header = _FatbinEntryHeader._make(_FATBIN_ENTRY_HEADER.unpack_from(data, entry_offset))
+            # Guard against looping forever on a corrupt entry.
+            if header.header_size == 0:
+                break
+            payload_offset = entry_offset + header.header_size
+            if header.kind in {_FATBIN_KIND_PTX, _FATBIN_KIND_ELF}:
+                yield FatbinEntry(
+                    kind=header.kind,
+                    arch=header.arch,
+                    flags=header.flags,
+                    payload_prefix=data[payload_offset : payload_offset + min(header.size, _PAYLOAD_PREFIX_LIMIT)],
+                )
+            entry_offset = payload_offset + header.size
+
+        offset = offset + header_size + fat_size
@@ -0,0 +1,69 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+
+class FileTree(ABC):
+    """
+    A read-only view of the files under `root`.
+
+    Detectors query a `FileTree` instead of the filesystem so they can run against either an unpacked store path or
+    the member listing of an archive. All paths passed to and returned from a `FileTree` are absolute, rooted at
+    `root`.
+    """
+
+    root: Path
+
+    @abstractmethod
+    def exists(self, path: Path) -> bool:
+        """
+        Returns whether the given path exists, following symlinks.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def is_dir(self, path: Path) -> bool:
+        """
+        Returns whether the given path is a directory, following symlinks.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def is_file(self, path: Path) -> bool:
+        """
+        Returns whether the given path is a regular file, following symlinks.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def iterdir(self, path: Path) -> list[Path]:
+        """
+        Returns the contents of the given directory.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def rglob(self, path: Path, pattern: str, files_only: bool = False) -> list[Path]:
+        """
+        Returns a sorted list of paths under the given directory whose names match the given pattern.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def resolve(self, path: Path) -> None | Path:
+        """
+        Returns the path the given path refers to after following symlinks, or None if it does not exist.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def mode(self, path: Path) -> int:
+        """
+        Returns the mode bits of the given path, following symlinks.
+        """
+        raise NotImplementedError
+
+    def has_contents(self, path: Path) -> bool:
+        """
+        Returns whether the given directory has contents.
+        """
+        return [] != self.iterdir(path)
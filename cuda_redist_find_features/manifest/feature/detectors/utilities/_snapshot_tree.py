@@ -0,0 +1,194 @@
+import os
+import stat
+import time
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path, PurePosixPath
+from typing import Self
+
+from typing_extensions import override
+
+from cuda_redist_find_features.utilities import get_logger
+
+from ._file_tree import FileTree
+
+logger = get_logger(__name__)
+
+# Same limit Linux uses when resolving symlinks.
+_MAX_SYMLINK_DEPTH = 40
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotEntry:
+    """
+    The metadata of a single file, directory, or symlink within a snapshot.
+
+    `mode` includes the file type bits, so it can be inspected with the functions in `stat`.
+    """
+
+    mode: int
+    size: int
+    link_target: None | str = None
+
+
+@dataclass(frozen=True)
+class SnapshotTree(FileTree):
+    """
+    A `FileTree` answering every query from an in-memory snapshot of the entries under `root`.
+
+    The snapshot is taken once, up front; nothing beneath `root` is touched afterwards. It holds no global state, so it
+    is released along with the last reference to it.
+    """
+
+    root: Path
+    entries: Mapping[PurePosixPath, SnapshotEntry]
+    children: Mapping[PurePosixPath, Sequence[str]]
+
+    @classmethod
+    def of(cls, root: Path) -> Self:
+        """
+        Walks the directory at `root` with `os.scandir`, recording the `lstat` result of each entry.
+
+        Symlinks are recorded rather than followed. Absolute targets within `root` are made relative so they can be
+        resolved within the snapshot; all other absolute targets are treated as dangling.
+        """
+        logger.info("Taking a snapshot of %s...", root)
+        start_time = time.time()
+        entries: dict[PurePosixPath, SnapshotEntry] = {PurePosixPath(): SnapshotEntry(stat.S_IFDIR | 0o755, 0)}
+        stack: list[PurePosixPath] = [PurePosixPath()]
+        while stack:
+            dir_key = stack.pop()
+            with os.scandir(root / dir_key) as dir_entries:
+                for dir_entry in dir_entries:
+                    key = dir_key / dir_entry.name
+                    entry_stat = dir_entry.stat(follow_symlinks=False)
+                    link_target: None | str = None
+                    if dir_entry.is_symlink():
+                        link_target = os.readlink(dir_entry.path)
+                        if Path(link_target).is_relative_to(root):
+                            link_target = os.path.relpath(link_target, Path(dir_entry.path).parent)
+                    elif dir_entry.is_dir(follow_symlinks=False):
+                        stack.append(key)
+                    entries[key] = SnapshotEntry(entry_stat.st_mode, entry_stat.st_size, link_target)
+        tree = cls.of_entries(root, entries)
+        end_time = time.time()
+        logger.info("Took a snapshot of %d entries of %s in %d seconds.", len(entries), root, end_time - start_time)
+        return tree
+
+    @classmethod
+    def of_entries(cls, root: Path, entries: Mapping[PurePosixPath, SnapshotEntry]) -> Self:
+        """
+        Builds a tree from entries keyed by their path relative to `root`, which must include the root itself and the
+        parent of every entry.
+        """
+        children: dict[PurePosixPath, list[str]] = {}
+        for path in entries:
+            if path != PurePosixPath():
+                children.setdefault(path.parent, []).append(path.name)
+        for names in children.values():
+            names.sort()
+
+        return cls(root=root, entries=entries, children=children)
+
+    @property
+    def size(self) -> int:
+        """
+        The total size of the entries, in bytes, as reported by `lstat` when the snapshot was taken.
+        """
+        return sum(entry.size for entry in self.entries.values())
+
+    def _resolve(self, path: Path) -> None | PurePosixPath:
+        """
+        Returns the key of the entry the given path refers to after following symlinks, or None if it does not exist
+        within the snapshot.
+        """
+        if not path.is_relative_to(self.root):
+            return None
+
+        resolved = PurePosixPath()
+        parts = list(path.relative_to(self.root).parts)
+        depth = 0
+        while parts:
+            part = parts.pop(0)
+            if part == ".":
+                continue
+            if part == "..":
+                if resolved == PurePosixPath():
+                    return None
+                resolved = resolved.parent
+                continue
+
+            candidate = resolved / part
+            entry = self.entries.get(candidate)
+            if entry is None:
+                return None
+            if entry.link_target is not None:
+                depth += 1
+                target = PurePosixPath(entry.link_target)
+                # Absolute targets point outside of the snapshot.
+                if depth > _MAX_SYMLINK_DEPTH or target.is_absolute():
+                    return None
+                parts = list(target.parts) + parts
+                continue
+            resolved = candidate
+
+        return resolved
+
+    def _entry(self, path: Path) -> None | SnapshotEntry:
+        resolved = self._resolve(path)
+        return None if resolved is None else self.entries[resolved]
+
+    @override
+    def exists(self, path: Path) -> bool:
+        return self._resolve(path) is not None
+
+    @override
+    def is_dir(self, path: Path) -> bool:
+        entry = self._entry(path)
+        return entry is not None and stat.S_ISDIR(entry.mode)
+
+    @override
+    def is_file(self, path: Path) -> bool:
+        entry = self._entry(path)
+        return entry is not None and stat.S_ISREG(entry.mode)
+
+    @override
+    def iterdir(self, path: Path) -> list[Path]:
+        resolved = self._resolve(path)
+        if resolved is None or not stat.S_ISDIR(self.entries[resolved].mode):
+            raise NotADirectoryError(path)
+        return [path / name for name in self.children.get(resolved, ())]
+
+    @override
+    def rglob(self, path: Path, pattern: str, files_only: bool = False) -> list[Path]:
+        resolved = self._resolve(path)
+        if resolved is None:
+            return []
+
+        # Like Path.rglob, symlinks to directories are matched but not descended into.
+        matched: list[Path] = []
+        stack: list[tuple[Path, PurePosixPath]] = [(path, resolved)]
+        while stack:
+            dir_path, dir_key = stack.pop()
+            for name in self.children.get(dir_key, ()):
+                child_path = dir_path / name
+                child_key = dir_key / name
+                if fnmatchcase(name, pattern) and (not files_only or self.is_file(child_path)):
+                    matched.append(child_path)
+                if stat.S_ISDIR(self.entries[child_key].mode):
+                    stack.append((child_path, child_key))
+
+        return sorted(matched)
+
+    @override
+    def resolve(self, path: Path) -> None | Path:
+        resolved = self._resolve(path)
+        return None if resolved is None else self.root / resolved
+
+    @override
+    def mode(self, path: Path) -> int:
+        entry = self._entry(path)
+        if entry is None:
+            raise FileNotFoundError(path)
+        return entry.mode
@@ -1,6 +1,7 @@
 from pathlib import Path
 
 from cuda_redist_find_features.types import PackageName, PydanticMapping
+from cuda_redist_find_features.utilities import write_if_changed
 
 from .package import FeaturePackageTy
 from .release import FeatureRelease
@@ -11,12 +12,13 @@ class FeatureManifest(PydanticMapping[PackageName, FeatureRelease[FeaturePackage
     Represents the manifest file containing releases.
     """
 
-    def write(self, path: Path) -> None:
+    def write(self, path: Path) -> bool:
         """
-        Writes the manifest to the given path.
+        Writes the manifest to the given path, unless it already holds the same manifest.
+
+        Returns whether the file was written.
         """
         import json
 
-        with path.open("w") as f:
-            json.dump(self.model_dump(mode="json", by_alias=True), f, indent=2, sort_keys=True)
-            f.write("\n")
+        content = json.dumps(self.model_dump(mode="json", by_alias=True), indent=2, sort_keys=True) + "\n"
+        return write_if_changed(path, content.encode())
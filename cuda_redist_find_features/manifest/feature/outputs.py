@@ -9,6 +9,7 @@ from .detectors import (
     ExecutableDetector,
     StaticLibraryDetector,
 )
+from .detectors.utilities import FileTree
 
 
 class FeatureOutputs(PydanticObject):
@@ -27,26 +28,26 @@ class FeatureOutputs(PydanticObject):
     sample: bool
 
     @classmethod
-    def of(cls, store_path: Path) -> Self:
+    def of(cls, tree: FileTree) -> Self:
         return cls(
-            bin=cls.check_bin(store_path),
-            dev=cls.check_dev(store_path),
-            doc=cls.check_doc(store_path),
-            lib=cls.check_lib(store_path),
-            static=cls.check_static(store_path),
-            sample=cls.check_sample(store_path),
+            bin=cls.check_bin(tree),
+            dev=cls.check_dev(tree),
+            doc=cls.check_doc(tree),
+            lib=cls.check_lib(tree),
+            static=cls.check_static(tree),
+            sample=cls.check_sample(tree),
         )
 
     @staticmethod
-    def check_bin(store_path: Path) -> bool:
+    def check_bin(tree: FileTree) -> bool:
         """
         A `bin` output requires that we have a non-empty `bin` directory containing at least one file with the
         executable bit set.
         """
-        return ExecutableDetector().detect(store_path)
+        return ExecutableDetector().detect(tree)
 
     @staticmethod
-    def check_dev(store_path: Path) -> bool:
+    def check_dev(tree: FileTree) -> bool:
         """
         A `dev` output requires that we have at least one of the following non-empty directories:
 
@@ -57,7 +58,7 @@ class FeatureOutputs(PydanticObject):
         - `share/aclocal`
         """
         return any(
-            DirDetector(dir).detect(store_path)
+            DirDetector(dir).detect(tree)
             for dir in (
                 Path("include"),
                 Path("lib", "pkgconfig"),
@@ -68,7 +69,7 @@ class FeatureOutputs(PydanticObject):
         )
 
     @staticmethod
-    def check_doc(store_path: Path) -> bool:
+    def check_doc(tree: FileTree) -> bool:
         """
         A `doc` output requires that we have at least one of the following non-empty directories:
 
@@ -79,26 +80,26 @@ class FeatureOutputs(PydanticObject):
         - `share/man`
         """
         return any(
-            DirDetector(Path("share") / dir).detect(store_path) for dir in ("info", "doc", "gtk-doc", "devhelp", "man")
+            DirDetector(Path("share") / dir).detect(tree) for dir in ("info", "doc", "gtk-doc", "devhelp", "man")
         )
 
     @staticmethod
-    def check_lib(store_path: Path) -> bool:
+    def check_lib(tree: FileTree) -> bool:
         """
         A `lib` output requires that we have a non-empty lib directory containing at least one shared library.
         """
-        return DynamicLibraryDetector().detect(store_path)
+        return DynamicLibraryDetector().detect(tree)
 
     @staticmethod
-    def check_static(store_path: Path) -> bool:
+    def check_static(tree: FileTree) -> bool:
         """
         A `static` output requires that we have a non-empty lib directory containing at least one static library.
         """
-        return StaticLibraryDetector().detect(store_path)
+        return StaticLibraryDetector().detect(tree)
 
     @staticmethod
-    def check_sample(store_path: Path) -> bool:
+    def check_sample(tree: FileTree) -> bool:
         """
         A `sample` output requires that we have a non-empty `samples` directory.
         """
-        return DirDetector(Path("samples")).detect(store_path)
+        return DirDetector(Path("samples")).detect(tree)
@@ -1,12 +1,23 @@
 from .package import FeaturePackage, FeaturePackageTy
+from .package_cache import (
+    DETECTOR_VERSION,
+    FeaturePackageCache,
+    FeaturePackageCacheStats,
+)
 from .package_deps_resolved import FeaturePackageDepsResolved
 from .package_deps_resolver import FeaturePackageDepsResolver
-from .package_deps_unresolved import FeaturePackageDepsUnresolved
+from .package_deps_unresolved import FeaturePackageDepsUnresolved, UnpackedArchive
+from .package_journal import FeaturePackageJournal
 
 __all__ = [
+    "DETECTOR_VERSION",
     "FeaturePackage",
+    "FeaturePackageCache",
+    "FeaturePackageCacheStats",
     "FeaturePackageDepsResolved",
     "FeaturePackageDepsResolver",
     "FeaturePackageDepsUnresolved",
+    "FeaturePackageJournal",
     "FeaturePackageTy",
+    "UnpackedArchive",
 ]
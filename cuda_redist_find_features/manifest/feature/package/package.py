@@ -1,5 +1,5 @@
 from collections.abc import Mapping, Sequence
-from typing import TypeVar
+from typing import Any, Self, TypeVar
 
 from pydantic.alias_generators import to_camel
 
@@ -63,5 +63,25 @@ class FeaturePackage(PydanticObject, alias_generator=to_camel):
         exclude=True,
     )
 
+    def dump_all(self) -> Mapping[str, Any]:
+        """
+        Dumps every field, including those excluded from the feature manifests, such that the result can be
+        validated by `model_validate`.
+        """
+        return {
+            "outputs": self.outputs.model_dump(mode="json"),
+            "cudaArchitectures": self.cuda_architectures,
+            "providedLibs": self.provided_libs,
+            "neededLibs": self.needed_libs,
+        }
+
+    @classmethod
+    def from_feature_manifest(cls, data: Mapping[str, Any]) -> Self:
+        """
+        Validates a package as written to a feature manifest, which leaves out the excluded fields; they are taken to
+        be empty.
+        """
+        return cls.model_validate({"cudaArchitectures": [], "providedLibs": [], "neededLibs": [], **data})
+
 
 FeaturePackageTy = TypeVar("FeaturePackageTy", bound=FeaturePackage)
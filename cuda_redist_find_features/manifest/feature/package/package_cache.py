@@ -0,0 +1,144 @@
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Self
+
+from cuda_redist_find_features.types import Sha256
+from cuda_redist_find_features.utilities import get_logger
+
+from .package_deps_unresolved import FeaturePackageDepsUnresolved
+
+logger = get_logger(__name__)
+
+# Bump whenever a change to the detectors could change their results; entries recorded by other versions are ignored
+# and are the first to be evicted.
+DETECTOR_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feature_packages (
+    sha256 TEXT NOT NULL,
+    detector_version INTEGER NOT NULL,
+    feature_package TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (sha256, detector_version)
+) WITHOUT ROWID
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class FeaturePackageCacheStats:
+    entries: int
+    stale_entries: int
+    size: int
+    file_size: int
+
+
+@dataclass(frozen=True)
+class FeaturePackageCache:
+    """
+    A persistent mapping from the SHA256 of an archive and `DETECTOR_VERSION` to the features detected in it.
+
+    Archives are content-addressed, so an entry never needs to be invalidated unless the detectors change. The cache
+    is backed by SQLite; `get` and `put` are thread-safe and commit immediately, so results are recorded as they
+    complete and are kept even if the run fails, and other processes can use the cache meanwhile.
+    """
+
+    path: Path
+    connection: sqlite3.Connection
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @classmethod
+    @contextmanager
+    def open(cls, path: Path) -> Generator[Self, None, None]:
+        """
+        Opens (creating, if necessary) the cache at the given path.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(path, check_same_thread=False)
+        try:
+            with connection:
+                connection.execute(_SCHEMA)
+            yield cls(path=path, connection=connection)
+        finally:
+            connection.close()
+
+    def get(self, sha256: Sha256) -> None | FeaturePackageDepsUnresolved:
+        """
+        Returns the cached features of the archive with the given SHA256, if any, marking the entry as used.
+        """
+        with self._lock, self.connection:
+            row: None | tuple[str] = self.connection.execute(
+                "SELECT feature_package FROM feature_packages WHERE sha256 = ? AND detector_version = ?",
+                (sha256, DETECTOR_VERSION),
+            ).fetchone()
+            if row is None:
+                logger.debug("Cache miss for %s.", sha256)
+                return None
+
+            logger.debug("Cache hit for %s.", sha256)
+            self.connection.execute(
+                "UPDATE feature_packages SET last_used = ? WHERE sha256 = ? AND detector_version = ?",
+                (time.time(), sha256, DETECTOR_VERSION),
+            )
+        return FeaturePackageDepsUnresolved.model_validate(json.loads(row[0]))
+
+    def put(self, sha256: Sha256, feature_package: FeaturePackageDepsUnresolved) -> None:
+        """
+        Records the features of the archive with the given SHA256.
+        """
+        serialized = json.dumps(feature_package.dump_all())
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO feature_packages VALUES (?, ?, ?, ?)",
+                (sha256, DETECTOR_VERSION, serialized, time.time()),
+            )
+
+    def stats(self) -> FeaturePackageCacheStats:
+        entries, stale_entries, size = self.connection.execute(
+            "SELECT COUNT(*), COUNT(*) FILTER (WHERE detector_version != ?), COALESCE(SUM(LENGTH(feature_package)), 0)"
+            " FROM feature_packages",
+            (DETECTOR_VERSION,),
+        ).fetchone()
+        return FeaturePackageCacheStats(
+            entries=entries,
+            stale_entries=stale_entries,
+            size=size,
+            file_size=self.path.stat().st_size,
+        )
+
+    def evict(self, max_size: int) -> int:
+        """
+        Removes entries recorded by other detector versions, then the least recently used entries until the total size
+        of the remaining entries is at most `max_size` bytes.
+
+        Returns the number of entries removed.
+        """
+        logger.info("Evicting entries from %s...", self.path)
+        start_time = time.time()
+        with self.connection:
+            evicted = self.connection.execute(
+                "DELETE FROM feature_packages WHERE detector_version != ?", (DETECTOR_VERSION,)
+            ).rowcount
+
+            size = 0
+            lru: list[tuple[str, int]] = []
+            for sha256, entry_size in self.connection.execute(
+                "SELECT sha256, LENGTH(feature_package) FROM feature_packages ORDER BY last_used DESC"
+            ):
+                size += entry_size
+                if size > max_size:
+                    lru.append((sha256, DETECTOR_VERSION))
+
+            self.connection.executemany("DELETE FROM feature_packages WHERE sha256 = ? AND detector_version = ?", lru)
+            evicted += len(lru)
+
+        # Give the freed pages back to the filesystem.
+        self.connection.execute("VACUUM")
+        end_time = time.time()
+        logger.info("Evicted %d entries from %s in %d seconds.", evicted, self.path, end_time - start_time)
+        return evicted
@@ -10,7 +10,7 @@ from pathlib import Path
 from typing import Self, TypeAlias
 
 from cuda_redist_find_features.types import LibSoName, PackageId, Platform, PydanticMapping, Version
-from cuda_redist_find_features.utilities import get_logger
+from cuda_redist_find_features.utilities import get_logger, write_if_changed
 
 from .package import FeaturePackage
 
@@ -141,12 +141,13 @@ class FeaturePackageDepsResolver(_FeaturePackageDepsResolverPydanticTy):
     def add_lib_provider(self, package_id: PackageId, feature_package: FeaturePackage) -> Self:
         return self.bulk_add_lib_provider({package_id: feature_package})
 
-    def write(self, path: Path) -> None:
+    def write(self, path: Path) -> bool:
         """
-        Writes the dependency db to the given path.
+        Writes the dependency db to the given path, unless it already holds the same db.
+
+        Returns whether the file was written.
         """
         import json
 
-        with path.open("w+") as f:
-            json.dump(self.model_dump(mode="json", by_alias=True), f, indent=2, sort_keys=True)
-            f.write("\n")
+        content = json.dumps(self.model_dump(mode="json", by_alias=True), indent=2, sort_keys=True) + "\n"
+        return write_if_changed(path, content.encode())
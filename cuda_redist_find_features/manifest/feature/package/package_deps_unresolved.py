@@ -1,12 +1,21 @@
+import asyncio
+from collections.abc import Set
+from dataclasses import dataclass
 from typing import Self
 
 from pydantic import HttpUrl
 
+from cuda_redist_find_features.manifest.feature.detectors.utilities import ArchiveTree, FileTree, SnapshotTree
 from cuda_redist_find_features.manifest.feature.outputs import FeatureOutputs
 from cuda_redist_find_features.manifest.nvidia import NvidiaPackage
 from cuda_redist_find_features.types import (
+    AsyncCommandRunner,
     HttpUrlTA,
+    NixBatcher,
+    NixReclaimer,
     NixStoreEntry,
+    NixStoreRetention,
+    Sha256,
 )
 from cuda_redist_find_features.utilities import get_logger
 
@@ -14,37 +23,217 @@ from .package import FeaturePackage
 
 logger = get_logger(__name__)
 
+# The libraries in CUDA redistributables typically unpack to three or four times the size of their archive.
+_UNPACKED_SIZE_RATIO = 4
+
+
+@dataclass(frozen=True)
+class UnpackedArchive:
+    """
+    An archive in the Nix store, along with the tree the detectors run against.
+
+    `unpacked` is None when the tree was built from the archive's listing instead of by unpacking it; otherwise,
+    `unpacked_size` is the number of bytes it takes up.
+    """
+
+    archive: NixStoreEntry
+    unpacked: None | NixStoreEntry
+    tree: FileTree
+    unpacked_size: int = 0
+
 
 class FeaturePackageDepsUnresolved(FeaturePackage):
     @classmethod
-    def of(cls, url_prefix: HttpUrl, nvidia_package: NvidiaPackage, cleanup: bool = False) -> Self:
+    def of(
+        cls, url_prefix: HttpUrl, nvidia_package: NvidiaPackage, cleanup: bool = False, no_unpack: bool = False
+    ) -> Self:
+        """
+        Runs `fetch`, `unpack`, and `detect` in sequence.
+        """
+        return cls.detect(cls.unpack(cls.fetch(url_prefix, nvidia_package), no_unpack=no_unpack), cleanup=cleanup)
+
+    @staticmethod
+    def estimate_store_size(nvidia_package: NvidiaPackage, no_unpack: bool = False) -> int:
+        """
+        Estimates the space the package takes up in the Nix store while it is processed: its archive and, unless
+        `no_unpack` is set, the unpacked archive.
+
+        The archive's headers are only available once it is downloaded, so the size of the unpacked archive is
+        estimated from the size of the archive given in the manifest.
+        """
+        size = nvidia_package.size_in_bytes
+        return size if no_unpack else size + size * _UNPACKED_SIZE_RATIO
+
+    # `fetch`, `unpack`, and `detect` each have an asynchronous variant for `AsyncPipeline`, which runs the Nix
+    # commands through an `AsyncCommandRunner` and everything else in a thread.
+
+    @staticmethod
+    def archive_url(url_prefix: HttpUrl, nvidia_package: NvidiaPackage) -> HttpUrl:
         logger.debug("Relative path: %s", nvidia_package.relative_path)
         logger.debug("SHA256: %s", nvidia_package.sha256)
         logger.debug("MD5: %s", nvidia_package.md5)
         logger.debug("Size: %s", nvidia_package.size)
+        return HttpUrlTA.validate_strings(f"{url_prefix}/{nvidia_package.relative_path}")
+
+    @classmethod
+    def fetch(
+        cls,
+        url_prefix: HttpUrl,
+        nvidia_package: NvidiaPackage,
+        present: Set[Sha256] = frozenset(),
+        fetcher: None | NixBatcher[tuple[HttpUrl, Sha256]] = None,
+    ) -> NixStoreEntry:
+        """
+        Adds the archive of the package to the Nix store.
 
+        Archives whose SHA256 is in `present` are known to be in the Nix store already, so their store path is computed
+        instead. If `fetcher` is given, the archive is added along with those of other packages.
+        """
         # Get the store path for the package.
-        url = HttpUrlTA.validate_strings(f"{url_prefix}/{nvidia_package.relative_path}")
-        archive = NixStoreEntry.from_url(url, nvidia_package.sha256)
-        unpacked = archive.unpack_archive()
-        unpacked_root = unpacked.store_path
+        url = cls.archive_url(url_prefix, nvidia_package)
+        if nvidia_package.sha256 in present:
+            logger.debug("Found %s in the Nix store.", url)
+            return NixStoreEntry.of_fixed_output(url, nvidia_package.sha256)
+        if fetcher is not None:
+            return fetcher.submit((url, nvidia_package.sha256)).result()
+        return NixStoreEntry.from_url(url, nvidia_package.sha256)
+
+    @classmethod
+    async def fetch_async(
+        cls,
+        url_prefix: HttpUrl,
+        nvidia_package: NvidiaPackage,
+        runner: AsyncCommandRunner,
+        present: Set[Sha256] = frozenset(),
+        fetcher: None | NixBatcher[tuple[HttpUrl, Sha256]] = None,
+    ) -> NixStoreEntry:
+        """
+        Adds the archive of the package to the Nix store, like `fetch`.
+        """
+        url = cls.archive_url(url_prefix, nvidia_package)
+        if nvidia_package.sha256 in present:
+            logger.debug("Found %s in the Nix store.", url)
+            return NixStoreEntry.of_fixed_output(url, nvidia_package.sha256)
+        if fetcher is not None:
+            return await asyncio.wrap_future(fetcher.submit((url, nvidia_package.sha256)))
+        return await NixStoreEntry.from_url_async(url, nvidia_package.sha256, runner)
 
+    @staticmethod
+    def unpack(
+        archive: NixStoreEntry,
+        no_unpack: bool = False,
+        unpacker: None | NixBatcher[NixStoreEntry] = None,
+        retention: None | NixStoreRetention = None,
+    ) -> UnpackedArchive:
+        """
+        Builds the tree the detectors run against, unpacking the archive unless `no_unpack` is set.
+
+        If `unpacker` is given, the archive is unpacked along with those of other packages. If `retention` is given,
+        the unpacked archive is pinned in it until the archive is reclaimed, so it is not evicted while in use.
+        """
+        # Only the names, layout, and modes of the files are needed to determine the outputs, all of which are
+        # available from the archive's listing or a snapshot of the unpacked store path. Either is dropped once the
+        # features are detected.
+        if no_unpack:
+            return UnpackedArchive(archive=archive, unpacked=None, tree=ArchiveTree.of(archive.store_path))
+
+        unpacked = archive.unpack_archive() if unpacker is None else unpacker.submit(archive).result()
+        if retention is not None:
+            retention.pin_unpacked(archive.store_path, unpacked.store_path)
+        tree = SnapshotTree.of(unpacked.store_path)
+        return UnpackedArchive(archive=archive, unpacked=unpacked, tree=tree, unpacked_size=tree.size)
+
+    @staticmethod
+    async def unpack_async(
+        archive: NixStoreEntry,
+        runner: AsyncCommandRunner,
+        no_unpack: bool = False,
+        unpacker: None | NixBatcher[NixStoreEntry] = None,
+        retention: None | NixStoreRetention = None,
+    ) -> UnpackedArchive:
+        """
+        Builds the tree the detectors run against, like `unpack`.
+        """
+        if no_unpack:
+            tree = await asyncio.to_thread(ArchiveTree.of, archive.store_path)
+            return UnpackedArchive(archive=archive, unpacked=None, tree=tree)
+
+        if unpacker is None:
+            unpacked = await archive.unpack_archive_async(runner)
+        else:
+            unpacked = await asyncio.wrap_future(unpacker.submit(archive))
+        if retention is not None:
+            await asyncio.to_thread(retention.pin_unpacked, archive.store_path, unpacked.store_path)
+        tree = await asyncio.to_thread(SnapshotTree.of, unpacked.store_path)
+        return UnpackedArchive(archive=archive, unpacked=unpacked, tree=tree, unpacked_size=tree.size)
+
+    @classmethod
+    def detect(
+        cls, unpacked_archive: UnpackedArchive, cleanup: bool = False, reclaimer: None | NixReclaimer = None
+    ) -> Self:
+        """
+        Runs the detectors against the tree of the archive, removing the archive from the Nix store afterwards if
+        `cleanup` is set.
+
+        If `reclaimer` is given, the archive is left to it to remove along with others, rather than removed right away.
+        """
+        feature_package = cls._detect(unpacked_archive.tree)
+        if cleanup and reclaimer is not None:
+            cls._reclaim(unpacked_archive, reclaimer)
+        elif cleanup:
+            if unpacked_archive.unpacked is not None:
+                logger.debug("Cleaning up %s...", unpacked_archive.unpacked.store_path)
+                unpacked_archive.unpacked.delete()
+            logger.debug("Cleaning up %s...", unpacked_archive.archive.store_path)
+            unpacked_archive.archive.delete()
+        return feature_package
+
+    @classmethod
+    async def detect_async(
+        cls,
+        unpacked_archive: UnpackedArchive,
+        runner: AsyncCommandRunner,
+        cleanup: bool = False,
+        reclaimer: None | NixReclaimer = None,
+    ) -> Self:
+        """
+        Runs the detectors against the tree of the archive, like `detect`.
+        """
+        feature_package = await asyncio.to_thread(cls._detect, unpacked_archive.tree)
+        if cleanup and reclaimer is not None:
+            cls._reclaim(unpacked_archive, reclaimer)
+        elif cleanup:
+            if unpacked_archive.unpacked is not None:
+                logger.debug("Cleaning up %s...", unpacked_archive.unpacked.store_path)
+                await unpacked_archive.unpacked.delete_async(runner)
+            logger.debug("Cleaning up %s...", unpacked_archive.archive.store_path)
+            await unpacked_archive.archive.delete_async(runner)
+        return feature_package
+
+    @staticmethod
+    def _reclaim(unpacked_archive: UnpackedArchive, reclaimer: NixReclaimer) -> None:
+        # Charged what the paths actually take up, rather than the estimate the package was admitted with.
+        sizes = {unpacked_archive.archive.store_path: unpacked_archive.archive.store_path.stat().st_size}
+        if unpacked_archive.unpacked is not None:
+            sizes[unpacked_archive.unpacked.store_path] = unpacked_archive.unpacked_size
+        reclaimer.reclaim(sizes)
+
+    @classmethod
+    def _detect(cls, tree: FileTree) -> Self:
         # Get the features
-        outputs = FeatureOutputs.of(unpacked_root)
-        # cuda_architectures = CudaArchitecturesDetector().find(unpacked_root) or []
-        # needed_libs = NeededLibsDetector().find(unpacked_root) or []
-        # provided_libs = ProvidedLibsDetector().find(unpacked_root) or []
+        outputs = FeatureOutputs.of(tree)
+        # NOTE: These detectors read the contents of files, so they require the archive to be unpacked. They share an
+        # ElfAnalyses so each library is read only once.
+        # elf_analyses = ElfAnalyses()
+        # cuda_architectures = CudaArchitecturesDetector(elf_analyses=elf_analyses).find(tree) or []
+        # needed_libs = NeededLibsDetector(elf_analyses=elf_analyses).find(tree) or []
+        # provided_libs = ProvidedLibsDetector(elf_analyses=elf_analyses).find(tree) or []
         # TODO(@connorbaker): Excluded for now because they are not used downstream.
         # No need to bloat the feature manifests.
         cuda_architectures = []
         needed_libs = []
         provided_libs = []
 
-        if cleanup:
-            logger.debug("Cleaning up %s and %s...", archive.store_path, unpacked.store_path)
-            unpacked.delete()
-            archive.delete()
-
         return cls(
             outputs=outputs,
             cuda_architectures=cuda_architectures,
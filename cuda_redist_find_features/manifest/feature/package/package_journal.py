@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+import time
+from collections.abc import Generator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Self
+
+from cuda_redist_find_features.types import PackageId, VersionTA
+from cuda_redist_find_features.utilities import get_logger
+
+from .package_deps_unresolved import FeaturePackageDepsUnresolved
+
+logger = get_logger(__name__)
+
+# Records are flushed as they are written, but only synced to disk once this many have accumulated or this many
+# seconds have passed since the last sync, whichever comes first.
+_SYNC_BATCH_SIZE = 64
+_SYNC_INTERVAL_SECONDS = 5.0
+
+
+@dataclass
+class FeaturePackageJournal:
+    """
+    An append-only log of the features detected for each package, one JSON record per line, so a run which is
+    interrupted can be resumed without redoing the packages it already finished.
+
+    Records may be appended from any thread.
+    """
+
+    path: Path
+    file: IO[str]
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _unsynced: int = 0
+    _last_sync: float = field(default_factory=time.monotonic)
+
+    @staticmethod
+    def load(path: Path) -> Mapping[PackageId, FeaturePackageDepsUnresolved]:
+        """
+        Reads the records of the journal at the given path, if it exists. Later records for a package take precedence.
+
+        A final record which was only partially written when the run was interrupted is ignored.
+        """
+        if not path.exists():
+            return {}
+
+        records: dict[PackageId, FeaturePackageDepsUnresolved] = {}
+        with path.open(encoding="utf-8") as file:
+            for line_number, line in enumerate(file, start=1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Ignoring malformed record on line %d of %s.", line_number, path)
+                    continue
+                package_id = PackageId(
+                    platform=record["platform"],
+                    package_name=record["packageName"],
+                    version=VersionTA.validate_python(record["version"]),
+                )
+                records[package_id] = FeaturePackageDepsUnresolved.model_validate(record["featurePackage"])
+
+        logger.info("Loaded %d records from %s.", len(records), path)
+        return records
+
+    @classmethod
+    @contextmanager
+    def open(cls, path: Path, resume: bool = False) -> Generator[Self, None, None]:
+        """
+        Opens the journal at the given path for appending if `resume` is set, or truncates it otherwise, syncing any
+        outstanding records on exit.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if resume and path.exists():
+            # Drop a partially written final record, so the next record starts on a line of its own.
+            with path.open("rb+") as file:
+                contents = file.read()
+                file.truncate(contents.rfind(b"\n") + 1)
+
+        with path.open("a" if resume else "w", encoding="utf-8") as file:
+            journal = cls(path=path, file=file)
+            try:
+                yield journal
+            finally:
+                journal.sync()
+
+    def append(self, package_id: PackageId, feature_package: FeaturePackageDepsUnresolved) -> None:
+        """
+        Records the features of the package with the given ID.
+        """
+        line = json.dumps({
+            "platform": package_id.platform,
+            "packageName": package_id.package_name,
+            "version": str(package_id.version),
+            "featurePackage": feature_package.dump_all(),
+        })
+        with self._lock:
+            self.file.write(line + "\n")
+            self.file.flush()
+            self._unsynced += 1
+            if self._unsynced >= _SYNC_BATCH_SIZE or time.monotonic() - self._last_sync >= _SYNC_INTERVAL_SECONDS:
+                self._sync()
+
+    def sync(self) -> None:
+        """
+        Forces every record written so far to disk.
+        """
+        with self._lock:
+            self.file.flush()
+            self._sync()
+
+    def _sync(self) -> None:
+        if self._unsynced > 0:
+            os.fsync(self.file.fileno())
+            logger.debug("Synced %d records to %s.", self._unsynced, self.path)
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
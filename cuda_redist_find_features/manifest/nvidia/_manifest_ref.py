@@ -2,22 +2,25 @@ from __future__ import annotations
 
 import re
 import time
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
+from http import HTTPStatus
 from pathlib import Path
 from typing import Generic, TypeVar
-from urllib import request
 
 from pydantic import BaseModel, DirectoryPath, FilePath, HttpUrl
-from pydantic_core import Url
 
 from cuda_redist_find_features.types import (
+    HttpCache,
+    HttpCacheEntry,
+    HttpClient,
     HttpUrlTA,
     PydanticFrozenField,
     Version,
     VersionConstraint,
     VersionTA,
+    model_config,
 )
-from cuda_redist_find_features.utilities import get_logger
+from cuda_redist_find_features.utilities import get_logger, write_if_changed
 
 from ._manifest import NvidiaManifest
 
@@ -27,7 +30,41 @@ logger = get_logger(__name__)
 _T = TypeVar("_T", FilePath, HttpUrl)
 
 
+def _fetch(url: str, http_client: None | HttpClient, http_cache: None | HttpCache) -> bytes:
+    """
+    Fetches the content at the URL with `http_client`, or a client of its own if none is given. If `http_cache` is
+    given, the request is conditional on the content having changed since it was last fetched, and content which has
+    not changed is read from the cache instead.
+    """
+    if http_client is None:
+        with HttpClient.open() as client:
+            return _fetch(url, client, http_cache)
+
+    cached = None if http_cache is None else http_cache.get(url)
+    headers: Mapping[str, str] = {} if cached is None else cached.conditional_headers()
+    response = http_client.get(url, headers)
+    if cached is not None and response.status == HTTPStatus.NOT_MODIFIED:
+        logger.debug("%s is not modified, using the cached copy.", url)
+        return cached.content
+    if response.status != HTTPStatus.OK:
+        raise RuntimeError(f"Failed to fetch url {url}: {response.status} {response.reason}")
+
+    if http_cache is not None:
+        http_cache.put(
+            url,
+            HttpCacheEntry(
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                content=response.content,
+            ),
+        )
+    return response.content
+
+
 class NvidiaManifestRef(BaseModel, Generic[_T]):
+    # Frozen, so references are hashable and can key the task tracker.
+    model_config = model_config
+
     ref: _T = PydanticFrozenField(
         description="A reference to a manifest at a local file or a URL.",
         examples=[
@@ -40,16 +77,19 @@ class NvidiaManifestRef(BaseModel, Generic[_T]):
         examples=["1.7.0"],
     )
 
-    def retrieve(self) -> bytes:
+    def retrieve(self, http_client: None | HttpClient = None, http_cache: None | HttpCache = None) -> bytes:
+        """
+        Reads the manifest, downloading it with `http_client`, if given, and using `http_cache`, if given, to avoid
+        downloading a manifest which has not changed.
+        """
         logger.info("Reading manifest from %s...", self.ref)
+        # Newer versions of Pydantic no longer make HttpUrl a subclass of Url, so anything which is not a path is taken
+        # to be a URL.
         match self.ref:
-            case Url():
-                with request.urlopen(str(self.ref)) as response:
-                    if response.status != 200:  # noqa: PLR2004
-                        raise RuntimeError(f"Failed to fetch url {self.ref}: {response.status} {response.reason}")
-                    return response.read()
             case Path():
                 return self.ref.read_bytes()
+            case _:
+                return _fetch(str(self.ref), http_client, http_cache)
 
     def parse(self) -> NvidiaManifest:
         content_bytes: bytes = self.retrieve()
@@ -60,21 +100,28 @@ class NvidiaManifestRef(BaseModel, Generic[_T]):
         logger.info("Manifest product: %s", manifest.release_product or "unknown")
         return manifest
 
-    def download(self, dir: DirectoryPath) -> NvidiaManifestRef[FilePath]:
+    def download(
+        self, dir: DirectoryPath, http_client: None | HttpClient = None, http_cache: None | HttpCache = None
+    ) -> NvidiaManifestRef[FilePath]:
         """
         Downloads or copies the manifest referenced by `self` to the specified directory.
         """
         filename: str = f"redistrib_{self.version}.json"
         dest_path: Path = dir / filename
-        if dest_path.exists():
-            logger.info("Manifest %s already exists, overwriting...", dest_path)
-        content_bytes: bytes = self.retrieve()
-        dest_path.write_bytes(content_bytes)
-        logger.info("Wrote manifest to %s.", dest_path)
+        content_bytes: bytes = self.retrieve(http_client, http_cache)
+        if write_if_changed(dest_path, content_bytes):
+            logger.info("Wrote manifest to %s.", dest_path)
+        else:
+            logger.info("Manifest %s is unchanged.", dest_path)
         return NvidiaManifestRef(ref=dest_path, version=self.version)
 
     @staticmethod
-    def _from_url(url: HttpUrl, version_constraint: VersionConstraint) -> Sequence[NvidiaManifestRef[HttpUrl]]:
+    def _from_url(
+        url: HttpUrl,
+        version_constraint: VersionConstraint,
+        http_client: None | HttpClient,
+        http_cache: None | HttpCache,
+    ) -> Sequence[NvidiaManifestRef[HttpUrl]]:
         refs: list[NvidiaManifestRef[HttpUrl]] = []
 
         if version_constraint.version is not None:
@@ -82,19 +129,15 @@ class NvidiaManifestRef(BaseModel, Generic[_T]):
         else:
             regex_str = r'href=[\'"]redistrib_(\d+\.\d+\.\d+(?:.\d+)?)\.json[\'"]'
 
-        with request.urlopen(str(url)) as response:
-            if response.status != 200:  # noqa: PLR2004
-                raise RuntimeError(f"Failed to fetch url {url}: {response.status} {response.reason}")
+        s: str = _fetch(str(url), http_client, http_cache).decode("utf-8")
+        logger.debug("Searching with regex %s...", regex_str)
+        for matched in re.finditer(regex_str, s):
+            manifest_version = VersionTA.validate_strings(matched.group(1))
+            if not version_constraint.is_satisfied_by(manifest_version):
+                continue
 
-            s: str = response.read().decode("utf-8")
-            logger.debug("Searching with regex %s...", regex_str)
-            for matched in re.finditer(regex_str, s):
-                manifest_version = VersionTA.validate_strings(matched.group(1))
-                if not version_constraint.is_satisfied_by(manifest_version):
-                    continue
-
-                full_url = HttpUrlTA.validate_python(f"{url}/redistrib_{manifest_version}.json")
-                refs.append(NvidiaManifestRef(ref=full_url, version=manifest_version))
+            full_url = HttpUrlTA.validate_python(f"{url}/redistrib_{manifest_version}.json")
+            refs.append(NvidiaManifestRef(ref=full_url, version=manifest_version))
 
         return refs
 
@@ -121,19 +164,29 @@ class NvidiaManifestRef(BaseModel, Generic[_T]):
         return refs
 
     @staticmethod
-    def from_ref(ref: _T, version_constraint: VersionConstraint) -> Sequence[NvidiaManifestRef[_T]]:
+    def from_ref(
+        ref: _T,
+        version_constraint: VersionConstraint,
+        http_client: None | HttpClient = None,
+        http_cache: None | HttpCache = None,
+    ) -> Sequence[NvidiaManifestRef[_T]]:
+        """
+        Finds the manifests at the URL or in the directory which satisfy the version constraint. The directory listing
+        is downloaded with `http_client`, if given, and `http_cache`, if given, is used to avoid downloading a listing
+        which has not changed.
+        """
         logger.debug("Fetching manifests from %s...", ref)
         start_time = time.time()
         # NOTE: If we move the return statement outside the match, pyright complains that the return type is not
         # compatible with the type annotation.
         match ref:
-            case Url():
-                refs = NvidiaManifestRef._from_url(ref, version_constraint)
+            case Path():
+                refs = NvidiaManifestRef._from_dir(ref, version_constraint)
                 end_time = time.time()
                 logger.debug("Found %d manifests in %d seconds.", len(refs), end_time - start_time)
                 return refs
-            case Path():
-                refs = NvidiaManifestRef._from_dir(ref, version_constraint)
+            case _:
+                refs = NvidiaManifestRef._from_url(ref, version_constraint, http_client, http_cache)
                 end_time = time.time()
                 logger.debug("Found %d manifests in %d seconds.", len(refs), end_time - start_time)
                 return refs
@@ -14,3 +14,7 @@ class NvidiaPackage(PydanticObject):
     sha256: Sha256 = PydanticFrozenField(description="The SHA256 hash of the package.")
     md5: Md5 = PydanticFrozenField(description="The MD5 hash of the package.")
     size: str = PydanticFrozenField(description="The size of the package in bytes, as a string.")
+
+    @property
+    def size_in_bytes(self) -> int:
+        return int(self.size)
@@ -1,12 +1,22 @@
+from ._async_pipeline import AsyncPipeline
+from ._byte_budget import ByteBudget
+from ._command import AsyncCommandRunner
 from ._cuda_arch import CudaArch, CudaArchTA
+from ._engine import Engine, Engines
 from ._future_status import FutureStatus
+from ._http_cache import HttpCache, HttpCacheEntry
+from ._http_client import HttpClient, HttpResponse
 from ._lib_so_name import LibSoName, LibSoNameTA
 from ._log_level import LogLevel, LogLevels
 from ._md5 import Md5, Md5TA
 from ._nix import NixStoreEntry
+from ._nix_batcher import NixBatcher
+from ._nix_reclaimer import NixReclaimer
+from ._nix_retention import NixStoreRetention
 from ._non_negative_int import NonNegativeInt, NonNegativeIntTA
 from ._package_id import PackageId
 from ._package_name import PackageName, PackageNameTA
+from ._pipeline import Pipeline, PipelineStage, PipelineStats, Reservations
 from ._platform import Platform, Platforms, PlatformTA
 from ._pydantic import (
     DirectoryPathTA,
@@ -19,16 +29,28 @@ from ._pydantic import (
     model_config,
 )
 from ._sha256 import Sha256, Sha256TA
+from ._shard import Shard
 from ._task import Task
+from ._task_order import TaskOrder, TaskOrders
+from ._task_tracker import TaskTracker
 from ._version import Version, VersionTA
 from ._version_constraint import VersionConstraint
 
 __all__ = [
+    "AsyncCommandRunner",
+    "AsyncPipeline",
+    "ByteBudget",
     "CudaArch",
     "CudaArchTA",
     "DirectoryPathTA",
+    "Engine",
+    "Engines",
     "FilePathTA",
     "FutureStatus",
+    "HttpCache",
+    "HttpCacheEntry",
+    "HttpClient",
+    "HttpResponse",
     "HttpUrlTA",
     "LibSoName",
     "LibSoNameTA",
@@ -36,12 +58,18 @@ __all__ = [
     "LogLevels",
     "Md5",
     "Md5TA",
+    "NixBatcher",
+    "NixReclaimer",
     "NixStoreEntry",
+    "NixStoreRetention",
     "NonNegativeInt",
     "NonNegativeIntTA",
     "PackageId",
     "PackageName",
     "PackageNameTA",
+    "Pipeline",
+    "PipelineStage",
+    "PipelineStats",
     "Platform",
     "PlatformTA",
     "Platforms",
@@ -50,9 +78,14 @@ __all__ = [
     "PydanticMapping",
     "PydanticObject",
     "PydanticTypeAdapter",
+    "Reservations",
     "Sha256",
     "Sha256TA",
+    "Shard",
     "Task",
+    "TaskOrder",
+    "TaskOrders",
+    "TaskTracker",
     "Version",
     "VersionConstraint",
     "VersionTA",
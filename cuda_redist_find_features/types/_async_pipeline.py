@@ -0,0 +1,196 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable, Generator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Generic, Self, TypeVar
+
+from cuda_redist_find_features.utilities import get_logger
+
+from ._byte_budget import ByteBudget
+from ._pipeline import PipelineStage, PipelineStats, Reservations
+
+logger = get_logger(__name__)
+
+A = TypeVar("A")
+B = TypeVar("B")
+
+# A submitted item: the future for its final result, the item, and its weight. None signals the end of submissions.
+_Submission = None | tuple[Future[Any], Any, int]
+
+
+@dataclass(frozen=True)
+class AsyncPipeline(Generic[A, B]):
+    """
+    A `Pipeline` whose stages are coroutine functions, run on an event loop in a background thread.
+
+    Items waiting on a subprocess or the network do not take up a thread, so a stage can have many more workers than
+    would be reasonable as threads; work which does need a thread is expected to be offloaded by the stage itself, like
+    with `asyncio.to_thread`.
+
+    Each stage runs at most `workers` items at once. As with the bounded queues of `Pipeline`, an item holds its place
+    in a stage until the next stage has room for it, so a stage can only run ahead of the next by as many items as the
+    next stage has workers.
+
+    `admit`, `on_start`, and `weigh` behave as they do for `Pipeline`. If `admit` or `on_start` raises for an item, the
+    exception is set on its future, and the item never enters the first stage.
+    """
+
+    stages: Sequence[PipelineStage]
+    loop: asyncio.AbstractEventLoop
+    admit: None | Callable[[A], Reservations] = None
+    on_start: None | Callable[[Future[Any]], None] = None
+    weigh: None | Callable[[A], int] = None
+    started_at: float = field(default_factory=time.monotonic)
+    stats: PipelineStats = field(default_factory=PipelineStats)
+    stage_stats: Sequence[PipelineStats] = ()
+    _submissions: "asyncio.Queue[_Submission]" = field(default_factory=asyncio.Queue[_Submission], repr=False)
+    _slots: Sequence[asyncio.Semaphore] = field(default=(), repr=False)
+
+    @classmethod
+    @contextmanager
+    def start(
+        cls,
+        stages: Sequence[PipelineStage],
+        admit: None | Callable[[A], Reservations] = None,
+        on_start: None | Callable[[Future[Any]], None] = None,
+        weigh: None | Callable[[A], int] = None,
+    ) -> Generator[Self, None, None]:
+        """
+        Starts the event loop in a background thread, waiting for every submitted item to leave the pipeline on exit.
+        """
+        loop = asyncio.new_event_loop()
+        # The default executor has at most min(32, cpu_count + 4) threads, which can be fewer than the pipeline needs:
+        # every worker of every stage may have offloaded its item to a thread, while admitting the next item ties up one
+        # more waiting on its budgets.
+        loop.set_default_executor(
+            ThreadPoolExecutor(sum(stage.workers for stage in stages) + 1, thread_name_prefix="async-pipeline")
+        )
+        pipeline = cls(
+            stages=stages,
+            loop=loop,
+            admit=admit,
+            on_start=on_start,
+            weigh=weigh,
+            stage_stats=[PipelineStats() for _ in stages],
+            _slots=[asyncio.Semaphore(stage.workers) for stage in stages],
+        )
+        thread = threading.Thread(target=pipeline._main, name="async-pipeline", daemon=True)
+        thread.start()
+        try:
+            yield pipeline
+        finally:
+            pipeline.loop.call_soon_threadsafe(pipeline._submissions.put_nowait, None)
+            thread.join()
+
+    def submit(self, item: A) -> Future[B]:
+        """
+        Enqueues an item for the first stage, returning a future for the output of the last stage.
+        """
+        future: Future[B] = Future()
+        weight = 0 if self.weigh is None else self.weigh(item)
+        self.stats.record_submit(weight)
+        self.stage_stats[0].record_submit(weight)
+        self.loop.call_soon_threadsafe(self._submissions.put_nowait, (future, item, weight))
+        return future
+
+    def _main(self) -> None:
+        try:
+            self.loop.run_until_complete(self._admit_all())
+        finally:
+            self.loop.run_until_complete(self.loop.shutdown_default_executor())
+            self.loop.close()
+
+    async def _admit_all(self) -> None:
+        """
+        Admits items in the order they were submitted as the first stage has room for them, then waits for every item
+        to leave the pipeline.
+        """
+        tasks: set[asyncio.Task[None]] = set()
+        while (submission := await self._submissions.get()) is not None:
+            future, value, weight = submission
+            await self._slots[0].acquire()
+            reservations: list[tuple[ByteBudget, int]] = []
+            try:
+                started = await self._start(future, value, reservations)
+            except Exception as e:
+                logger.debug("Admitting an item failed: %s", e)
+                started = False
+                future.set_exception(e)
+            if not started:
+                self._release(reservations)
+                self._slots[0].release()
+                self.stats.record_cancel(weight)
+                self.stage_stats[0].record_cancel(weight)
+                continue
+
+            task = asyncio.create_task(self._run(future, value, reservations, weight))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.wait(tasks)
+
+    async def _start(self, future: Future[Any], value: Any, reservations: list[tuple[ByteBudget, int]]) -> bool:
+        """
+        Waits for the budgets of an item, appending each to `reservations` once acquired, then starts its future.
+
+        Returns False if the future was cancelled while the item waited.
+        """
+        for budget, size in () if self.admit is None else self.admit(value):
+            # Budgets are shared with threads, so waiting on them takes one up; only one item waits at a time.
+            await asyncio.to_thread(budget.acquire, size)
+            reservations.append((budget, size))
+        if not future.set_running_or_notify_cancel():
+            return False
+        if self.on_start is not None:
+            self.on_start(future)
+        self.stats.record_start()
+        return True
+
+    async def _run(self, future: Future[Any], value: Any, reservations: Reservations, weight: int) -> None:
+        # The index of the stage whose slot the item holds; the item starts out holding a slot of the first stage.
+        held = 0
+        for index in range(len(self.stages)):
+            if index > 0:
+                self.stage_stats[index].record_submit(weight)
+                await self._slots[index].acquire()
+                self._slots[held].release()
+                held = index
+
+            try:
+                value = await self._run_stage(index, value, weight)
+            except Exception as e:
+                self._slots[held].release()
+                self._leave(reservations, weight, failed=True)
+                future.set_exception(e)
+                return
+
+        self._slots[held].release()
+        self._leave(reservations, weight)
+        future.set_result(value)
+
+    async def _run_stage(self, index: int, value: Any, weight: int) -> Any:
+        stage = self.stages[index]
+        stats = self.stage_stats[index]
+        stats.record_start()
+        start_time = time.monotonic()
+        try:
+            result = await stage.fn(value)
+        except Exception as e:
+            logger.debug("Stage %s failed: %s", stage.name, e)
+            stats.record_end(weight, time.monotonic() - start_time, failed=True)
+            raise
+        stats.record_end(weight, time.monotonic() - start_time)
+        return result
+
+    def _leave(self, reservations: Reservations, weight: int, failed: bool = False) -> None:
+        self._release(reservations)
+        self.stats.record_end(weight, failed=failed)
+
+    @staticmethod
+    def _release(reservations: Reservations) -> None:
+        for budget, size in reservations:
+            budget.release(size)
@@ -0,0 +1,53 @@
+import threading
+from dataclasses import dataclass, field
+
+from cuda_redist_find_features.utilities import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ByteBudget:
+    """
+    A thread-safe running total of bytes in use, bounded by `capacity`, or unbounded if `capacity` is None.
+
+    A request larger than the whole budget is admitted once nothing else is in use, so it cannot wait forever.
+    """
+
+    name: str
+    capacity: None | int
+    used: int = 0
+    _condition: threading.Condition = field(default_factory=threading.Condition, repr=False)
+
+    def acquire(self, size: int) -> None:
+        """
+        Blocks until `size` bytes fit within the budget, then reserves them.
+        """
+        with self._condition:
+            if not self._fits(size):
+                logger.info(
+                    "Waiting for %d bytes of %s budget (%d of %s in use)...", size, self.name, self.used, self.capacity
+                )
+                self._condition.wait_for(lambda: self._fits(size))
+            self.used += size
+            logger.debug("Reserved %d bytes of %s budget (%d of %s in use).", size, self.name, self.used, self.capacity)
+
+    def hold(self, size: int) -> None:
+        """
+        Reserves `size` bytes without waiting, for bytes which are already in use and must stay accounted for.
+        """
+        with self._condition:
+            self.used += size
+            logger.debug("Held %d bytes of %s budget (%d of %s in use).", size, self.name, self.used, self.capacity)
+
+    def release(self, size: int) -> None:
+        """
+        Returns `size` previously acquired bytes to the budget, waking anything waiting for room.
+        """
+        with self._condition:
+            self.used -= size
+            logger.debug("Released %d bytes of %s budget (%d of %s in use).", size, self.name, self.used, self.capacity)
+            self._condition.notify_all()
+
+    def _fits(self, size: int) -> bool:
+        return self.capacity is None or self.used == 0 or self.used + size <= self.capacity
@@ -0,0 +1,47 @@
+import asyncio
+import subprocess
+from collections.abc import Mapping, Sequence
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+
+
+def run_command(args: Sequence[str]) -> bytes:
+    """
+    Runs a command to completion, blocking the calling thread, and returns its standard output.
+
+    Raises `subprocess.CalledProcessError` if the command fails.
+    """
+    return subprocess.run(args, capture_output=True, check=True).stdout
+
+
+@dataclass
+class AsyncCommandRunner:
+    """
+    Runs commands as asyncio subprocesses, so waiting on them does not take up a thread.
+
+    At most `limits[tool]` commands of each tool, keyed by the name of the executable, run at once; tools without a
+    limit are unbounded.
+    """
+
+    limits: Mapping[str, int] = field(default_factory=dict[str, int])
+    _semaphores: dict[str, asyncio.Semaphore] = field(default_factory=dict[str, asyncio.Semaphore], repr=False)
+
+    def __post_init__(self) -> None:
+        self._semaphores.update({tool: asyncio.Semaphore(limit) for tool, limit in self.limits.items()})
+
+    async def run(self, args: Sequence[str]) -> bytes:
+        """
+        Runs a command to completion and returns its standard output.
+
+        Raises `subprocess.CalledProcessError` if the command fails.
+        """
+        semaphore = self._semaphores.get(args[0])
+        async with nullcontext() if semaphore is None else semaphore:
+            process = await asyncio.create_subprocess_exec(
+                *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            stdout, stderr = await process.communicate()
+
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode or 0, args, stdout, stderr)
+        return stdout
@@ -0,0 +1,8 @@
+from collections.abc import Sequence
+from typing import Literal, cast, get_args
+
+# - threads: Each stage has a pool of threads, which block on the commands they run.
+# - asyncio: The stages run on an asyncio event loop, and commands are run as asyncio subprocesses, so waiting on them
+#   does not take up a thread.
+Engine = Literal["threads", "asyncio"]
+Engines = cast(Sequence[Engine], get_args(Engine))
@@ -0,0 +1,100 @@
+import sqlite3
+import threading
+import time
+from collections.abc import Generator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Self
+
+from cuda_redist_find_features.utilities import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_responses (
+    url TEXT NOT NULL PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    content BLOB NOT NULL,
+    fetched REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class HttpCacheEntry:
+    etag: None | str
+    last_modified: None | str
+    content: bytes
+
+    def conditional_headers(self) -> Mapping[str, str]:
+        """
+        The headers which make a request for the URL of the entry conditional on it having changed since.
+        """
+        headers: dict[str, str] = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass(frozen=True)
+class HttpCache:
+    """
+    A persistent mapping from a URL to the last response fetched from it, along with its ETag and Last-Modified
+    validators, so later requests for the URL can be made conditional and a 304 (Not Modified) answered from the cache.
+
+    The cache is backed by SQLite; `get` and `put` are thread-safe.
+    """
+
+    path: Path
+    connection: sqlite3.Connection
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @classmethod
+    @contextmanager
+    def open(cls, path: Path) -> Generator[Self, None, None]:
+        """
+        Opens (creating, if necessary) the cache at the given path.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(path, check_same_thread=False)
+        try:
+            with connection:
+                connection.execute(_SCHEMA)
+            yield cls(path=path, connection=connection)
+        finally:
+            connection.close()
+
+    def get(self, url: str) -> None | HttpCacheEntry:
+        """
+        Returns the last response fetched from the URL, if any.
+        """
+        with self._lock:
+            row: None | tuple[None | str, None | str, bytes] = self.connection.execute(
+                "SELECT etag, last_modified, content FROM http_responses WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            logger.debug("HTTP cache miss for %s.", url)
+            return None
+
+        logger.debug("HTTP cache hit for %s.", url)
+        etag, last_modified, content = row
+        return HttpCacheEntry(etag=etag, last_modified=last_modified, content=content)
+
+    def put(self, url: str, entry: HttpCacheEntry) -> None:
+        """
+        Records the response fetched from the URL. Responses without validators are not recorded, since a request for
+        them cannot be made conditional.
+        """
+        if entry.etag is None and entry.last_modified is None:
+            logger.debug("Not caching %s, which has neither an ETag nor a Last-Modified header.", url)
+            return
+
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO http_responses VALUES (?, ?, ?, ?, ?)",
+                (url, entry.etag, entry.last_modified, entry.content, time.time()),
+            )
@@ -0,0 +1,173 @@
+import gzip
+import http.client
+import threading
+import zlib
+from collections.abc import Generator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Self
+from urllib.parse import SplitResult, urljoin, urlsplit
+
+from cuda_redist_find_features.utilities import get_logger
+
+logger = get_logger(__name__)
+
+_MAX_CONNECTIONS_PER_HOST = 6
+_TIMEOUT_SECONDS = 60.0
+_MAX_REDIRECTS = 10
+
+_REDIRECTS = frozenset({
+    HTTPStatus.MOVED_PERMANENTLY,
+    HTTPStatus.FOUND,
+    HTTPStatus.SEE_OTHER,
+    HTTPStatus.TEMPORARY_REDIRECT,
+    HTTPStatus.PERMANENT_REDIRECT,
+})
+
+# Raised when a kept-alive connection was closed by the server while it sat idle.
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+# The scheme, host and port of a URL.
+_Origin = tuple[str, str, None | int]
+
+
+@dataclass(frozen=True, slots=True)
+class HttpResponse:
+    status: int
+    reason: str
+    headers: http.client.HTTPMessage
+    content: bytes
+
+
+@dataclass(frozen=True)
+class _OriginPool:
+    slots: threading.BoundedSemaphore
+    idle: list[http.client.HTTPConnection] = field(default_factory=list[http.client.HTTPConnection])
+
+
+@dataclass(frozen=True)
+class HttpClient:
+    """
+    A thread-safe HTTP client which keeps connections alive and reuses them across requests to the same host, so the
+    TCP and TLS handshakes are only paid once per connection instead of once per request.
+
+    At most `max_connections_per_host` requests to a host are in flight at once; further requests wait for a
+    connection to free up. Responses are requested with gzip or deflate encoding and decoded transparently, and
+    redirects are followed.
+    """
+
+    max_connections_per_host: int
+    timeout: float
+    pools: dict[_Origin, _OriginPool] = field(default_factory=dict[_Origin, _OriginPool])
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @classmethod
+    @contextmanager
+    def open(
+        cls, max_connections_per_host: int = _MAX_CONNECTIONS_PER_HOST, timeout: float = _TIMEOUT_SECONDS
+    ) -> Generator[Self, None, None]:
+        """
+        Creates a client, closing every connection it kept alive on exit.
+        """
+        client = cls(max_connections_per_host=max_connections_per_host, timeout=timeout)
+        try:
+            yield client
+        finally:
+            client.close()
+
+    def get(self, url: str, headers: Mapping[str, str] = {}) -> HttpResponse:
+        """
+        Sends a GET request for the URL with the given headers, following redirects, and returns the response.
+        """
+        for _ in range(_MAX_REDIRECTS):
+            response = self._get_once(urlsplit(url), headers)
+            location = response.headers.get("Location")
+            if response.status not in _REDIRECTS or location is None:
+                return response
+            logger.debug("Following redirect from %s to %s.", url, location)
+            url = urljoin(url, location)
+
+        raise RuntimeError(f"Failed to fetch url {url}: more than {_MAX_REDIRECTS} redirects")
+
+    def close(self) -> None:
+        with self._lock:
+            for pool in self.pools.values():
+                for connection in pool.idle:
+                    connection.close()
+                pool.idle.clear()
+
+    def _get_once(self, parts: SplitResult, headers: Mapping[str, str]) -> HttpResponse:
+        origin: _Origin = (parts.scheme, parts.hostname or "", parts.port)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        request_headers = {"Accept-Encoding": "gzip, deflate", **headers}
+        pool = self._pool(origin)
+        with pool.slots:
+            connection = self._checkout(pool)
+            if connection is not None:
+                try:
+                    return self._request(pool, connection, target, request_headers)
+                except _STALE_CONNECTION_ERRORS:
+                    logger.debug("Kept-alive connection to %s was closed, reconnecting.", parts.netloc)
+
+            return self._request(pool, self._connect(origin), target, request_headers)
+
+    def _pool(self, origin: _Origin) -> _OriginPool:
+        with self._lock:
+            if origin not in self.pools:
+                self.pools[origin] = _OriginPool(slots=threading.BoundedSemaphore(self.max_connections_per_host))
+            return self.pools[origin]
+
+    def _checkout(self, pool: _OriginPool) -> None | http.client.HTTPConnection:
+        with self._lock:
+            return pool.idle.pop() if pool.idle else None
+
+    def _connect(self, origin: _Origin) -> http.client.HTTPConnection:
+        scheme, host, port = origin
+        match scheme:
+            case "https":
+                return http.client.HTTPSConnection(host, port, timeout=self.timeout)
+            case "http":
+                return http.client.HTTPConnection(host, port, timeout=self.timeout)
+            case _:
+                raise RuntimeError(f"Unsupported URL scheme {scheme}")
+
+    def _request(
+        self, pool: _OriginPool, connection: http.client.HTTPConnection, target: str, headers: Mapping[str, str]
+    ) -> HttpResponse:
+        try:
+            connection.request("GET", target, headers=dict(headers))
+            response = connection.getresponse()
+            content = response.read()
+        except BaseException:
+            connection.close()
+            raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            with self._lock:
+                pool.idle.append(connection)
+
+        return HttpResponse(
+            status=response.status,
+            reason=response.reason,
+            headers=response.headers,
+            content=_decode(content, response.headers.get("Content-Encoding")),
+        )
+
+
+def _decode(content: bytes, encoding: None | str) -> bytes:
+    match encoding:
+        case None | "identity":
+            return content
+        case "gzip" | "x-gzip":
+            return gzip.decompress(content)
+        case "deflate":
+            # Servers disagree on whether deflate content is wrapped in a zlib header.
+            try:
+                return zlib.decompress(content)
+            except zlib.error:
+                return zlib.decompress(content, -zlib.MAX_WBITS)
+        case _:
+            raise RuntimeError(f"Unsupported content encoding {encoding}")
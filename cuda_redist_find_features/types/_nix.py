@@ -1,5 +1,11 @@
-import subprocess
+import base64
+import hashlib
+import json
+import os
+import tempfile
 import time
+from collections.abc import Iterable, Sequence, Set
+from itertools import starmap
 from pathlib import Path
 from typing import Annotated, Self
 
@@ -9,62 +15,228 @@ from pydantic.alias_generators import to_camel
 
 from cuda_redist_find_features.utilities import get_logger
 
+from ._command import AsyncCommandRunner, run_command
 from ._pydantic import PydanticObject
 from ._sha256 import Sha256
 
 logger = get_logger(__name__)
 
+# See `nix32Chars` in Nix; the alphabet omits e, o, t, and u.
+_NIX_BASE32_ALPHABET = "0123456789abcdfghijklmnpqrsvwxyz"
+
+# The hash part of a store path is a SHA256 hash compressed to 160 bits.
+_STORE_PATH_HASH_SIZE = 20
+
+# Store paths are passed to commands in batches, so the command line stays well within the limits of the system.
+_PATHS_PER_COMMAND = 1000
+
+# Batches are read from a JSON file next to the expression, rather than passed as arguments, for the same reason.
+# `<nix/fetchurl.nix>` names the path after the URL and adds it flat, so it lands where `nix store prefetch-file` would
+# have put it.
+_FETCH_BATCH_EXPRESSION = """
+map (request: import <nix/fetchurl.nix> { inherit (request) url sha256; })
+  (builtins.fromJSON (builtins.readFile ./batch.json))
+"""
+
+# `nix flake prefetch` unpacks archives with the tarball fetcher, which `builtins.fetchTree` exposes.
+_UNPACK_BATCH_EXPRESSION = """
+map (url: let tree = builtins.fetchTree { type = "tarball"; inherit url; }; in {
+  hash = tree.narHash;
+  storePath = tree.outPath;
+}) (builtins.fromJSON (builtins.readFile ./batch.json))
+"""
+
+
+def _nix_base32(data: bytes) -> str:
+    """
+    Encodes bytes the way Nix does in store paths, which is not the base32 of RFC 4648.
+    """
+    length = (len(data) * 8 - 1) // 5 + 1
+    chars: list[str] = []
+    for n in reversed(range(length)):
+        bit = n * 5
+        i, j = divmod(bit, 8)
+        c = data[i] >> j
+        if i + 1 < len(data):
+            c |= data[i + 1] << (8 - j)
+        chars.append(_NIX_BASE32_ALPHABET[c & 0x1F])
+    return "".join(chars)
+
+
+def _run_batch_command(args: Sequence[str], expression: str, batch: object) -> bytes:
+    """
+    Runs a Nix command against an expression applied to the batch, appending the path of the expression to `args`.
+    """
+    with tempfile.TemporaryDirectory(prefix="nix-batch-") as directory:
+        expression_path = Path(directory) / "default.nix"
+        expression_path.write_text(expression, encoding="utf-8")
+        (Path(directory) / "batch.json").write_text(json.dumps(batch), encoding="utf-8")
+        return run_command([*args, expression_path.as_posix()])
+
+
+def _compress_hash(digest: bytes, size: int) -> bytes:
+    """
+    Folds a hash into `size` bytes by XOR-ing every byte into position `i % size`, like `compressHash` in Nix.
+    """
+    compressed = bytearray(size)
+    for i, byte in enumerate(digest):
+        compressed[i % size] ^= byte
+    return bytes(compressed)
+
 
 class NixStoreEntry(PydanticObject, alias_generator=to_camel):
     hash: str
     store_path: Annotated[Path, Predicate(Path.exists)]
 
+    @staticmethod
+    def store_dir() -> Path:
+        return Path(os.environ.get("NIX_STORE_DIR", "/nix/store"))
+
+    @classmethod
+    def fixed_output_store_path(cls, url: HttpUrl, sha256: Sha256) -> Path:
+        """
+        Computes the store path `nix store prefetch-file` adds the file at the URL to, without running Nix.
+
+        The file is added as a flat, fixed-output path named after the last component of the URL, so the store path
+        only depends on the hash of the file and that name. See `makeFixedOutputPath` and `makeStorePath` in Nix.
+        """
+        store_dir = cls.store_dir()
+        name = str(url).rstrip("/").rsplit("/", 1)[-1]
+        inner = hashlib.sha256(f"fixed:out:sha256:{sha256}:".encode()).hexdigest()
+        fingerprint = f"output:out:sha256:{inner}:{store_dir}:{name}"
+        digest = _compress_hash(hashlib.sha256(fingerprint.encode()).digest(), _STORE_PATH_HASH_SIZE)
+        return store_dir / f"{_nix_base32(digest)}-{name}"
+
+    @classmethod
+    def of_fixed_output(cls, url: HttpUrl, sha256: Sha256) -> Self:
+        """
+        Describes the store path the file at the URL was added to by `from_url`, without running Nix.
+
+        The store path must already exist.
+        """
+        return cls(
+            hash="sha256-" + base64.b64encode(bytes.fromhex(sha256)).decode(),
+            store_path=cls.fixed_output_store_path(url, sha256),
+        )
+
+    @staticmethod
+    def valid_store_paths(paths: Iterable[Path]) -> Set[Path]:
+        """
+        Returns those of the given store paths which are valid, that is, registered in the Nix store, with one command
+        per batch of paths rather than one per path.
+        """
+        logger.info("Checking which store paths are valid...")
+        start_time = time.time()
+        paths = list(paths)
+        valid: set[Path] = set()
+        for start in range(0, len(paths), _PATHS_PER_COMMAND):
+            batch = paths[start : start + _PATHS_PER_COMMAND]
+            stdout = run_command(["nix-store", "--check-validity", "--print-invalid", *map(str, batch)])
+            invalid = {Path(line) for line in stdout.decode().splitlines()}
+            valid.update(path for path in batch if path not in invalid)
+        end_time = time.time()
+        logger.info("Found %d valid store paths in %d seconds.", len(valid), end_time - start_time)
+        return valid
+
+    # Each operation has a blocking variant, which runs in the calling thread, and an asynchronous one, which runs on
+    # an asyncio event loop through an `AsyncCommandRunner`. Both build the same commands.
+
+    @staticmethod
+    def _prefetch_file_command(url: HttpUrl, sha256: Sha256) -> Sequence[str]:
+        # NOTE: By specifying the hash type and expected hash, we avoid redownloading.
+        return ["nix", "store", "prefetch-file", "--json", "--hash-type", "sha256", "--expected-hash", sha256, str(url)]
+
     @classmethod
     def from_url(cls, url: HttpUrl, sha256: Sha256) -> Self:
         """
         Adds a release to the Nix store.
+        """
+        logger.info("Adding %s to the Nix store...", url)
+        start_time = time.time()
+        stdout = run_command(cls._prefetch_file_command(url, sha256))
+        end_time = time.time()
+        logger.info("Added %s to the Nix store in %d seconds.", url, end_time - start_time)
+        return cls.model_validate_json(stdout, strict=False)
 
-        NOTE: By specifying the hash type and expected hash, we avoid redownloading.
+    @classmethod
+    async def from_url_async(cls, url: HttpUrl, sha256: Sha256, runner: AsyncCommandRunner) -> Self:
+        """
+        Adds a release to the Nix store, like `from_url`.
         """
         logger.info("Adding %s to the Nix store...", url)
         start_time = time.time()
-        result = subprocess.run(
-            [
-                "nix",
-                "store",
-                "prefetch-file",
-                "--json",
-                "--hash-type",
-                "sha256",
-                "--expected-hash",
-                sha256,
-                str(url),
-            ],
-            capture_output=True,
-            check=True,
-        )
+        stdout = await runner.run(cls._prefetch_file_command(url, sha256))
         end_time = time.time()
         logger.info("Added %s to the Nix store in %d seconds.", url, end_time - start_time)
-        return cls.model_validate_json(result.stdout, strict=False)
+        return cls.model_validate_json(stdout, strict=False)
+
+    @classmethod
+    def from_urls(cls, requests: Sequence[tuple[HttpUrl, Sha256]]) -> Sequence[Self]:
+        """
+        Adds a batch of releases to the Nix store with one `nix build`, like `from_url` does for each.
+
+        The Nix daemon downloads the releases in parallel. Their store paths are computed from their hashes.
+        """
+        logger.info("Adding a batch of %d releases to the Nix store...", len(requests))
+        start_time = time.time()
+        _run_batch_command(
+            ["nix", "build", "--no-link", "--keep-going", "--impure", "--file"],
+            _FETCH_BATCH_EXPRESSION,
+            [{"url": str(url), "sha256": sha256} for url, sha256 in requests],
+        )
+        end_time = time.time()
+        logger.info(
+            "Added a batch of %d releases to the Nix store in %d seconds.", len(requests), end_time - start_time
+        )
+        return list(starmap(cls.of_fixed_output, requests))
+
+    def _unpack_archive_command(self) -> Sequence[str]:
+        # NOTE: Only operate in the Nix store to avoid redownloading the archive.
+        # NOTE: This command is smart enough to not re-unpack archives.
+        return ["nix", "flake", "prefetch", "--json", self.store_path.as_uri()]
 
     def unpack_archive(self) -> Self:
         """
         Uses nix flake prefetch to unpack an archive.
+        """
+        uri: str = self.store_path.as_uri()
+        logger.info("Unpacking %s...", uri)
+        start_time = time.time()
+        stdout = run_command(self._unpack_archive_command())
+        end_time = time.time()
+        logger.info("Unpacked %s in %d seconds.", uri, end_time - start_time)
+        return self.model_validate_json(stdout)
 
-        NOTE: Only operate in the Nix store to avoid redownloading the archive.
-        NOTE: This command is smart enough to not re-unpack archives.
+    async def unpack_archive_async(self, runner: AsyncCommandRunner) -> Self:
+        """
+        Uses nix flake prefetch to unpack an archive, like `unpack_archive`.
         """
         uri: str = self.store_path.as_uri()
         logger.info("Unpacking %s...", uri)
         start_time = time.time()
-        result = subprocess.run(
-            ["nix", "flake", "prefetch", "--json", uri],
-            capture_output=True,
-            check=True,
-        )
+        stdout = await runner.run(self._unpack_archive_command())
         end_time = time.time()
         logger.info("Unpacked %s in %d seconds.", uri, end_time - start_time)
-        return self.model_validate_json(result.stdout)
+        return self.model_validate_json(stdout)
+
+    @classmethod
+    def unpack_archives(cls, archives: Sequence["NixStoreEntry"]) -> Sequence[Self]:
+        """
+        Unpacks a batch of archives with one `nix eval`, like `unpack_archive` does for each.
+        """
+        logger.info("Unpacking a batch of %d archives...", len(archives))
+        start_time = time.time()
+        stdout = _run_batch_command(
+            ["nix", "eval", "--json", "--impure", "--file"],
+            _UNPACK_BATCH_EXPRESSION,
+            [archive.store_path.as_uri() for archive in archives],
+        )
+        end_time = time.time()
+        logger.info("Unpacked a batch of %d archives in %d seconds.", len(archives), end_time - start_time)
+        return [cls.model_validate(entry, strict=False) for entry in json.loads(stdout)]
+
+    def _delete_command(self) -> Sequence[str]:
+        return ["nix", "store", "delete", self.store_path.as_posix()]
 
     def delete(self) -> None:
         """
@@ -73,10 +245,29 @@ class NixStoreEntry(PydanticObject, alias_generator=to_camel):
         str_path: str = self.store_path.as_posix()
         logger.info("Deleting %s from the Nix store...", str_path)
         start_time = time.time()
-        subprocess.run(
-            ["nix", "store", "delete", str_path],
-            capture_output=True,
-            check=True,
-        )
+        run_command(self._delete_command())
+        end_time = time.time()
+        logger.info("Deleted %s from the Nix store in %d seconds.", str_path, end_time - start_time)
+
+    @staticmethod
+    def delete_all(paths: Sequence[Path]) -> None:
+        """
+        Delete paths from the Nix store, with one command per batch of paths rather than one per path.
+        """
+        logger.info("Deleting %d paths from the Nix store...", len(paths))
+        start_time = time.time()
+        for start in range(0, len(paths), _PATHS_PER_COMMAND):
+            run_command(["nix", "store", "delete", *map(str, paths[start : start + _PATHS_PER_COMMAND])])
+        end_time = time.time()
+        logger.info("Deleted %d paths from the Nix store in %d seconds.", len(paths), end_time - start_time)
+
+    async def delete_async(self, runner: AsyncCommandRunner) -> None:
+        """
+        Delete paths from the Nix store, like `delete`.
+        """
+        str_path: str = self.store_path.as_posix()
+        logger.info("Deleting %s from the Nix store...", str_path)
+        start_time = time.time()
+        await runner.run(self._delete_command())
         end_time = time.time()
         logger.info("Deleted %s from the Nix store in %d seconds.", str_path, end_time - start_time)
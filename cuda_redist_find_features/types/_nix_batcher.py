@@ -0,0 +1,124 @@
+import queue
+import threading
+import time
+from collections.abc import Callable, Generator, Sequence
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Generic, Self, TypeVar
+
+from cuda_redist_find_features.utilities import get_logger
+
+from ._nix import NixStoreEntry
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# How long a batch waits for more requests after its first one arrived.
+_LINGER_SECONDS = 0.1
+
+# A request and the future for its store entry. None signals a worker to exit.
+_Request = None | tuple[T, Future[NixStoreEntry]]
+
+
+@dataclass(frozen=True)
+class NixBatcher(Generic[T]):
+    """
+    Gathers the requests of many threads into batches, and realises each batch with one Nix command through
+    `realise_batch` instead of one command per request.
+
+    A batch is realised once `batch_size` requests are waiting, or `linger` seconds after its first request arrived,
+    whichever comes first. Each of the `workers` threads realises one batch at a time.
+
+    Nix stops at the first failure in a batch, so when `realise_batch` fails, each request of the batch is realised on
+    its own by `realise_one` instead; the failures are then set on the futures of the requests which caused them.
+    """
+
+    realise_batch: Callable[[Sequence[T]], Sequence[NixStoreEntry]]
+    realise_one: Callable[[T], NixStoreEntry]
+    batch_size: int
+    linger: float
+    requests: "queue.SimpleQueue[_Request[T]]"
+    threads: list[threading.Thread]
+
+    @classmethod
+    @contextmanager
+    def start(
+        cls,
+        realise_batch: Callable[[Sequence[T]], Sequence[NixStoreEntry]],
+        realise_one: Callable[[T], NixStoreEntry],
+        batch_size: int,
+        workers: int = 1,
+        linger: float = _LINGER_SECONDS,
+    ) -> Generator[Self, None, None]:
+        """
+        Starts the workers, waiting for every submitted request to be realised on exit.
+        """
+        batcher = cls(
+            realise_batch=realise_batch,
+            realise_one=realise_one,
+            batch_size=batch_size,
+            linger=linger,
+            requests=queue.SimpleQueue(),
+            threads=[],
+        )
+        batcher.threads.extend(
+            threading.Thread(target=batcher._work, name=f"nix-batcher-{worker}", daemon=True)
+            for worker in range(workers)
+        )
+        for thread in batcher.threads:
+            thread.start()
+
+        try:
+            yield batcher
+        finally:
+            batcher.shutdown()
+
+    def submit(self, request: T) -> Future[NixStoreEntry]:
+        """
+        Adds a request to the next batch, returning a future for its store entry.
+        """
+        future: Future[NixStoreEntry] = Future()
+        self.requests.put((request, future))
+        return future
+
+    def shutdown(self) -> None:
+        for _ in self.threads:
+            self.requests.put(None)
+        for thread in self.threads:
+            thread.join()
+
+    def _work(self) -> None:
+        while (first := self.requests.get()) is not None:
+            batch = [first]
+            deadline = time.monotonic() + self.linger
+            stopping = False
+            while len(batch) < self.batch_size and (timeout := deadline - time.monotonic()) > 0:
+                try:
+                    item = self.requests.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._realise(batch)
+            if stopping:
+                return
+
+    def _realise(self, batch: Sequence[tuple[T, Future[NixStoreEntry]]]) -> None:
+        try:
+            entries = self.realise_batch([request for request, _ in batch])
+        except Exception as e:
+            logger.warning("Failed to realise a batch of %d, realising each on its own: %s", len(batch), e)
+            for request, future in batch:
+                try:
+                    future.set_result(self.realise_one(request))
+                except Exception as e:
+                    future.set_exception(e)
+            return
+
+        for (_, future), entry in zip(batch, entries, strict=True):
+            future.set_result(entry)
@@ -0,0 +1,127 @@
+import threading
+from collections.abc import Generator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Self
+
+from cuda_redist_find_features.utilities import get_logger
+
+from ._byte_budget import ByteBudget
+from ._nix import NixStoreEntry
+from ._nix_retention import NixStoreRetention
+
+logger = get_logger(__name__)
+
+# Paths are deleted once this many bytes of them are waiting, or this many seconds after the last deletion, whichever
+# comes first.
+_FLUSH_BYTES = 8 * 1024 * 1024 * 1024
+_FLUSH_SECONDS = 10.0
+
+
+@dataclass
+class NixReclaimer:
+    """
+    Collects store paths which are no longer needed and deletes them from a background thread, in batches, rather
+    than with one `nix store delete` for each path as soon as it is done with.
+
+    Pending paths are deleted once `flush_bytes` of them are waiting or `flush_seconds` after the last deletion, and
+    when the reclaimer is stopped.
+
+    If `budget` is given, the bytes of the pending paths are held against it until they are deleted, so the budget
+    keeps accounting for paths which are only waiting to be deleted. Pending paths are then deleted by the time they
+    take up a quarter of the budget, so packages waiting for room are not held up for long.
+
+    If `retention` is given, paths are only deleted once it evicts them.
+    """
+
+    budget: None | ByteBudget = None
+    retention: None | NixStoreRetention = None
+    flush_bytes: int = _FLUSH_BYTES
+    flush_seconds: float = _FLUSH_SECONDS
+    pending: dict[Path, None] = field(default_factory=dict[Path, None])
+    pending_bytes: int = 0
+    _stopping: bool = False
+    _condition: threading.Condition = field(default_factory=threading.Condition, repr=False)
+    _thread: None | threading.Thread = field(default=None, repr=False)
+
+    @classmethod
+    @contextmanager
+    def start(
+        cls,
+        budget: None | ByteBudget = None,
+        retention: None | NixStoreRetention = None,
+        flush_bytes: int = _FLUSH_BYTES,
+        flush_seconds: float = _FLUSH_SECONDS,
+    ) -> Generator[Self, None, None]:
+        """
+        Starts the background thread, deleting every path still pending on exit.
+        """
+        if budget is not None and budget.capacity is not None:
+            flush_bytes = min(flush_bytes, budget.capacity // 4)
+        reclaimer = cls(budget=budget, retention=retention, flush_bytes=flush_bytes, flush_seconds=flush_seconds)
+        reclaimer._thread = threading.Thread(target=reclaimer._work, name="nix-reclaimer", daemon=True)
+        reclaimer._thread.start()
+
+        try:
+            yield reclaimer
+        finally:
+            reclaimer.shutdown()
+
+    def reclaim(self, sizes: Mapping[Path, int]) -> None:
+        """
+        Schedules the store paths, which take up about the given number of bytes, for deletion.
+        """
+        if self.retention is not None:
+            sizes = self.retention.use(sizes)
+        if not sizes:
+            return
+
+        size = sum(sizes.values())
+        if self.budget is not None:
+            self.budget.hold(size)
+        with self._condition:
+            self.pending.update(dict.fromkeys(sizes))
+            self.pending_bytes += size
+            if self.pending_bytes >= self.flush_bytes:
+                self._condition.notify_all()
+
+    def shutdown(self) -> None:
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._stopping or self.pending_bytes >= self.flush_bytes, timeout=self.flush_seconds
+                )
+                paths = list(self.pending)
+                size = self.pending_bytes
+                stopping = self._stopping
+                self.pending.clear()
+                self.pending_bytes = 0
+
+            if paths:
+                self._delete(paths)
+            if self.budget is not None:
+                self.budget.release(size)
+            if stopping:
+                return
+
+    @staticmethod
+    def _delete(paths: Sequence[Path]) -> None:
+        try:
+            NixStoreEntry.delete_all(paths)
+        except Exception as e:
+            # Nix refuses to delete anything in a batch if it cannot delete one of the paths, so retry them one at a
+            # time to delete the rest.
+            logger.warning("Failed to delete a batch of %d paths, deleting each on its own: %s", len(paths), e)
+            for path in paths:
+                try:
+                    NixStoreEntry.delete_all([path])
+                except Exception as e:
+                    logger.warning("Failed to delete %s: %s", path, e)
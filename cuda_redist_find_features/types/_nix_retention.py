@@ -0,0 +1,145 @@
+import sqlite3
+import threading
+import time
+from collections.abc import Generator, Iterable, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Self
+
+from cuda_redist_find_features.utilities import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS store_paths (
+    store_path TEXT NOT NULL PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+# The store path each archive unpacks to, which depends on the unpacked contents, so it is only known once unpacked.
+_UNPACKED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS unpacked_paths (
+    archive TEXT NOT NULL PRIMARY KEY,
+    unpacked TEXT NOT NULL
+) WITHOUT ROWID
+"""
+
+
+@dataclass(frozen=True)
+class NixStoreRetention:
+    """
+    A persistent record of the store paths kept in the Nix store after use, along with their sizes and when they were
+    last used, which keeps the most recently used paths within `capacity` bytes.
+
+    The record is backed by SQLite and outlives the run, so the paths kept by one run are reused by the next and are
+    evicted in the order they were last used across runs. Unlike `FeaturePackageCache`, it is thread-safe.
+
+    Paths which are pinned are never evicted, so paths still needed later in the run are kept until they are used.
+    Pinning an archive also pins the store path it was last unpacked to, if that is known.
+
+    Only retained paths count towards `capacity`. They are not counted against the disk budget of the pipeline, which
+    only covers the packages in progress.
+    """
+
+    path: Path
+    capacity: int
+    connection: sqlite3.Connection
+    pinned: set[Path] = field(default_factory=set[Path])
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @classmethod
+    @contextmanager
+    def open(cls, path: Path, capacity: int, pinned: Iterable[Path] = ()) -> Generator[Self, None, None]:
+        """
+        Opens (creating, if necessary) the record at the given path, forgetting paths which are no longer in the Nix
+        store, like those removed by the garbage collector. The `pinned` paths, and the store paths they were unpacked
+        to, are pinned from the start.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(path, check_same_thread=False)
+        try:
+            with connection:
+                connection.execute(_SCHEMA)
+                connection.execute(_UNPACKED_SCHEMA)
+                gone = [
+                    (store_path,)
+                    for (store_path,) in connection.execute("SELECT store_path FROM store_paths")
+                    if not Path(store_path).exists()
+                ]
+                connection.executemany("DELETE FROM store_paths WHERE store_path = ?", gone)
+                connection.executemany(
+                    "DELETE FROM unpacked_paths WHERE archive = ?",
+                    [
+                        (archive,)
+                        for archive, unpacked in connection.execute("SELECT archive, unpacked FROM unpacked_paths")
+                        if not (Path(archive).exists() and Path(unpacked).exists())
+                    ],
+                )
+            logger.info("Forgot %d retained paths which are no longer in the Nix store.", len(gone))
+            retention = cls(path=path, capacity=capacity, connection=connection)
+            retention.pin(pinned)
+            yield retention
+        finally:
+            connection.close()
+
+    def pin(self, paths: Iterable[Path]) -> None:
+        """
+        Keeps the store paths, along with the store paths they were unpacked to, from being evicted until they are
+        next used.
+        """
+        paths = list(paths)
+        with self._lock:
+            self.pinned.update(paths)
+            self.pinned.update(
+                Path(unpacked)
+                for path in paths
+                for (unpacked,) in self.connection.execute(
+                    "SELECT unpacked FROM unpacked_paths WHERE archive = ?", (path.as_posix(),)
+                )
+            )
+
+    def pin_unpacked(self, archive: Path, unpacked: Path) -> None:
+        """
+        Records the store path the archive was unpacked to and keeps it from being evicted until it is next used, so
+        it is not deleted while it is still being read.
+        """
+        with self._lock, self.connection:
+            self.pinned.add(unpacked)
+            self.connection.execute(
+                "INSERT OR REPLACE INTO unpacked_paths VALUES (?, ?)", (archive.as_posix(), unpacked.as_posix())
+            )
+
+    def use(self, sizes: Mapping[Path, int]) -> Mapping[Path, int]:
+        """
+        Records the store paths, which take up the given number of bytes, as just used and unpins them, then evicts
+        the least recently used paths which are not pinned until the total size of the remaining paths is at most
+        `capacity` bytes, or only pinned paths remain.
+
+        Returns the evicted paths and their sizes; deleting them is up to the caller.
+        """
+        now = time.time()
+        with self._lock, self.connection:
+            self.pinned.difference_update(sizes)
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO store_paths VALUES (?, ?, ?)",
+                [(store_path.as_posix(), size, now) for store_path, size in sizes.items()],
+            )
+
+            total = 0
+            evicted: dict[Path, int] = {}
+            for store_path, size in self.connection.execute(
+                "SELECT store_path, size FROM store_paths ORDER BY last_used DESC"
+            ):
+                total += size
+                if total > self.capacity and Path(store_path) not in self.pinned:
+                    evicted[Path(store_path)] = size
+
+            self.connection.executemany(
+                "DELETE FROM store_paths WHERE store_path = ?", [(store_path.as_posix(),) for store_path in evicted]
+            )
+
+        logger.debug("Retained %d paths, evicting %d.", len(sizes), len(evicted))
+        return evicted
@@ -0,0 +1,228 @@
+import queue
+import threading
+import time
+from collections.abc import Callable, Generator, Sequence
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Generic, Self, TypeVar
+
+from cuda_redist_find_features.utilities import get_logger
+
+from ._byte_budget import ByteBudget
+
+logger = get_logger(__name__)
+
+A = TypeVar("A")
+B = TypeVar("B")
+
+# The budgets an item holds a share of until it leaves the pipeline.
+Reservations = Sequence[tuple[ByteBudget, int]]
+
+# An item in flight: the future for its final result, the output of the previous stage, its reservations, and its
+# weight. None signals the workers of a stage to exit.
+_Item = None | tuple[Future[Any], Any, Reservations, int]
+
+
+@dataclass(frozen=True, slots=True)
+class PipelineStage:
+    """
+    A step of a `Pipeline`, run by its own pool of `workers` threads.
+    """
+
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int
+
+
+@dataclass
+class PipelineStats:
+    """
+    Running totals of the items, and their weights, which entered, are in, or left a stage or the whole of a
+    `Pipeline`, along with the time the workers of a stage spent running them.
+
+    Updated by the workers as items move through; readers see a recent, if not exact, snapshot.
+    """
+
+    submitted: int = 0
+    submitted_weight: int = 0
+    active: int = 0
+    completed: int = 0
+    completed_weight: int = 0
+    failed: int = 0
+    failed_weight: int = 0
+    busy_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record_submit(self, weight: int) -> None:
+        with self._lock:
+            self.submitted += 1
+            self.submitted_weight += weight
+
+    def record_start(self) -> None:
+        with self._lock:
+            self.active += 1
+
+    def record_cancel(self, weight: int) -> None:
+        with self._lock:
+            self.failed += 1
+            self.failed_weight += weight
+
+    def record_end(self, weight: int, seconds: float = 0.0, failed: bool = False) -> None:
+        with self._lock:
+            self.active -= 1
+            self.busy_seconds += seconds
+            if failed:
+                self.failed += 1
+                self.failed_weight += weight
+            else:
+                self.completed += 1
+                self.completed_weight += weight
+
+    @property
+    def queued(self) -> int:
+        return self.submitted - self.active - self.completed - self.failed
+
+    @property
+    def finished_weight(self) -> int:
+        return self.completed_weight + self.failed_weight
+
+
+@dataclass(frozen=True)
+class Pipeline(Generic[A, B]):
+    """
+    Runs each item through a sequence of stages, each with an independently sized pool of worker threads.
+
+    Stages are connected by bounded queues: a stage can only run ahead of the next by as many items as the next stage
+    has workers before it blocks. Items flow through independently, so while one item is in a later stage, others
+    occupy the earlier ones.
+
+    Exceptions raised by a stage are set on the future of the item, which then leaves the pipeline.
+
+    If `admit` is given, it is called with each item before it enters the first stage, and the item waits until it can
+    reserve the returned shares of each budget. The reservations are held until the item leaves the pipeline.
+
+    If `on_start` is given, it is called with the future of each item once the item starts running.
+
+    If `weigh` is given, it is called with each item on submission, and the statistics kept for each stage and the
+    pipeline as a whole include the total weight, like the number of bytes, of the items which went through them.
+    """
+
+    stages: Sequence[PipelineStage]
+    queues: Sequence["queue.Queue[_Item]"]
+    threads: list[list[threading.Thread]]
+    admit: None | Callable[[A], Reservations] = None
+    on_start: None | Callable[[Future[Any]], None] = None
+    weigh: None | Callable[[A], int] = None
+    started_at: float = field(default_factory=time.monotonic)
+    stats: PipelineStats = field(default_factory=PipelineStats)
+    stage_stats: Sequence[PipelineStats] = ()
+
+    @classmethod
+    @contextmanager
+    def start(
+        cls,
+        stages: Sequence[PipelineStage],
+        admit: None | Callable[[A], Reservations] = None,
+        on_start: None | Callable[[Future[Any]], None] = None,
+        weigh: None | Callable[[A], int] = None,
+    ) -> Generator[Self, None, None]:
+        """
+        Starts the workers of every stage, waiting for every submitted item to leave the pipeline on exit.
+        """
+        # The first queue is unbounded so submitting never blocks.
+        queues: list[queue.Queue[_Item]] = [queue.Queue()]
+        queues.extend(queue.Queue(maxsize=stage.workers) for stage in stages[1:])
+        pipeline = cls(
+            stages=stages,
+            queues=queues,
+            threads=[],
+            admit=admit,
+            on_start=on_start,
+            weigh=weigh,
+            stage_stats=[PipelineStats() for _ in stages],
+        )
+        for index, stage in enumerate(stages):
+            stage_threads = [
+                threading.Thread(target=pipeline._work, args=(index,), name=f"{stage.name}-{worker}", daemon=True)
+                for worker in range(stage.workers)
+            ]
+            for thread in stage_threads:
+                thread.start()
+            pipeline.threads.append(stage_threads)
+
+        try:
+            yield pipeline
+        finally:
+            pipeline.shutdown()
+
+    def submit(self, item: A) -> Future[B]:
+        """
+        Enqueues an item for the first stage, returning a future for the output of the last stage.
+        """
+        future: Future[B] = Future()
+        weight = 0 if self.weigh is None else self.weigh(item)
+        self.stats.record_submit(weight)
+        self.stage_stats[0].record_submit(weight)
+        self.queues[0].put((future, item, (), weight))
+        return future
+
+    def shutdown(self) -> None:
+        """
+        Stops the stages in order, so each one drains into the next before that one is stopped.
+        """
+        for stage_queue, stage_threads in zip(self.queues, self.threads, strict=True):
+            for _ in stage_threads:
+                stage_queue.put(None)
+            for thread in stage_threads:
+                thread.join()
+
+    def _work(self, index: int) -> None:
+        stage = self.stages[index]
+        stats = self.stage_stats[index]
+        inbox = self.queues[index]
+        outbox = self.queues[index + 1] if index + 1 < len(self.queues) else None
+        while (item := inbox.get()) is not None:
+            future, value, reservations, weight = item
+            # Items start running once they are admitted to the first stage.
+            if index == 0:
+                if self.admit is not None:
+                    reservations = self.admit(value)
+                    for budget, size in reservations:
+                        budget.acquire(size)
+                if not future.set_running_or_notify_cancel():
+                    self._release(reservations)
+                    self.stats.record_cancel(weight)
+                    stats.record_cancel(weight)
+                    continue
+                self.stats.record_start()
+                if self.on_start is not None:
+                    self.on_start(future)
+
+            stats.record_start()
+            start_time = time.monotonic()
+            try:
+                result = stage.fn(value)
+            except Exception as e:
+                logger.debug("Stage %s failed: %s", stage.name, e)
+                stats.record_end(weight, time.monotonic() - start_time, failed=True)
+                self._leave(reservations, weight, failed=True)
+                future.set_exception(e)
+                continue
+            stats.record_end(weight, time.monotonic() - start_time)
+
+            if outbox is None:
+                self._leave(reservations, weight)
+                future.set_result(result)
+            else:
+                self.stage_stats[index + 1].record_submit(weight)
+                outbox.put((future, result, reservations, weight))
+
+    def _leave(self, reservations: Reservations, weight: int, failed: bool = False) -> None:
+        self._release(reservations)
+        self.stats.record_end(weight, failed=failed)
+
+    @staticmethod
+    def _release(reservations: Reservations) -> None:
+        for budget, size in reservations:
+            budget.release(size)
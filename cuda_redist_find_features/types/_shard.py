@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+from typing import final
+
+
+@final
+@dataclass(frozen=True, order=True, slots=True)
+class Shard:
+    """
+    One of `count` disjoint parts of the work of a run, numbered from zero, so the work can be split across machines.
+    """
+
+    index: int
+    count: int
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.index < self.count:
+            raise ValueError(f"Shard index must be at least 0 and less than the shard count {self.count}.")
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
@@ -41,3 +41,23 @@ class Task(Generic[A, B]):
             status=FutureStatus.WAITING,
             future=executor.submit(fn, initial),
         )
+
+    @classmethod
+    def of_future(cls, initial: A, future: Future[B]) -> Task[A, B]:
+        """
+        Creates a task tracking a future which was created elsewhere, like by a `Pipeline`.
+        """
+        return cls(
+            initial=initial,
+            status=FutureStatus.of(future),
+            future=future,
+        )
+
+    @classmethod
+    def of_result(cls, initial: A, result: B) -> Task[A, B]:
+        """
+        Creates an already completed task, for results which are known without doing any work.
+        """
+        future: Future[B] = Future()
+        future.set_result(result)
+        return cls.of_future(initial, future)
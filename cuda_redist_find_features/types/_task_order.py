@@ -0,0 +1,8 @@
+from collections.abc import Sequence
+from typing import Literal, cast, get_args
+
+# - largest-first: By size, descending, which keeps the largest archives from being the last to finish.
+# - newest-first: By manifest version, descending, then by size, descending.
+# - manifest: In the order packages appear in the manifests.
+TaskOrder = Literal["largest-first", "newest-first", "manifest"]
+TaskOrders = cast(Sequence[TaskOrder], get_args(TaskOrder))
@@ -0,0 +1,118 @@
+import queue
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+
+from ._future_status import FutureStatus
+
+K = TypeVar("K")
+
+# Statuses only ever move forward, so a change reported out of order is ignored rather than undoing a later one.
+_RANKS: dict[FutureStatus, int] = {
+    FutureStatus.WAITING: 0,
+    FutureStatus.RUNNING: 1,
+    FutureStatus.DONE: 2,
+    FutureStatus.CANCELLED: 2,
+}
+
+
+def _keys_by_status() -> dict[FutureStatus, dict[Any, None]]:
+    return {status: {} for status in FutureStatus}
+
+
+@dataclass
+class TaskTracker(Generic[K]):
+    """
+    Tracks the status of keyed futures as they change, instead of polling every future for its status.
+
+    Futures report changes through callbacks, which may run on any thread; `wait` applies them on the calling thread,
+    so the statuses are only ever read and written by one thread. Several keys may share a future.
+
+    Futures report their completion on their own; whatever runs a future reports when it starts through
+    `notify_running`.
+
+    If `on_complete` is given, it is called with each key and its future once the future completes, on the thread
+    applying the change. Completed futures are no longer referenced by the tracker afterwards.
+    """
+
+    # Dictionaries are used as insertion-ordered sets, so keys are listed in the order they reached their status.
+    on_complete: None | Callable[[K, Future[Any]], None] = None
+    keys_by_status: dict[FutureStatus, dict[K, None]] = field(default_factory=_keys_by_status)
+    _statuses: dict[K, FutureStatus] = field(default_factory=dict[K, FutureStatus], repr=False)
+    _keys_by_future: dict[Future[Any], list[K]] = field(default_factory=dict[Future[Any], list[K]], repr=False)
+    _events: "queue.SimpleQueue[tuple[Future[Any], FutureStatus]]" = field(
+        default_factory=queue.SimpleQueue[tuple[Future[Any], FutureStatus]], repr=False
+    )
+
+    def track(self, key: K, future: Future[Any]) -> None:
+        """
+        Starts tracking the status of `future` under `key`.
+        """
+        keys = self._keys_by_future.setdefault(future, [])
+        keys.append(key)
+        self._set(key, FutureStatus.of(future), future)
+        # Only the first key of a future registers a callback; a callback on a completed future runs immediately.
+        if len(keys) == 1:
+            future.add_done_callback(self._notify_done)
+
+    def notify_running(self, future: Future[Any]) -> None:
+        """
+        Records that `future` has started running. Safe to call from any thread.
+        """
+        self._events.put((future, FutureStatus.RUNNING))
+
+    def _notify_done(self, future: Future[Any]) -> None:
+        self._events.put((future, FutureStatus.of(future)))
+
+    def wait(self, timeout: None | float = None) -> bool:
+        """
+        Blocks until a tracked future reports a change, then applies it along with any others which are pending.
+
+        Returns whether the status of any key changed. Returns immediately if every future is complete, and after
+        `timeout` seconds if it is given and nothing changed.
+        """
+        if self.is_complete():
+            return False
+
+        changed = False
+        try:
+            future, status = self._events.get(timeout=timeout)
+        except queue.Empty:
+            return False
+        while True:
+            # A completed future reports nothing further, so it can be forgotten.
+            if _RANKS[status] == _RANKS[FutureStatus.DONE]:
+                keys = self._keys_by_future.pop(future, [])
+            else:
+                keys = self._keys_by_future.get(future, [])
+            for key in keys:
+                changed |= self._set(key, status, future)
+            try:
+                future, status = self._events.get_nowait()
+            except queue.Empty:
+                return changed
+
+    def _set(self, key: K, status: FutureStatus, future: Future[Any]) -> bool:
+        previous = self._statuses.get(key)
+        if previous is not None:
+            if _RANKS[status] <= _RANKS[previous]:
+                return False
+            del self.keys_by_status[previous][key]
+        self._statuses[key] = status
+        self.keys_by_status[status][key] = None
+        if self.on_complete is not None and _RANKS[status] == _RANKS[FutureStatus.DONE]:
+            self.on_complete(key, future)
+        return True
+
+    def keys(self, status: FutureStatus) -> Iterator[K]:
+        """
+        Iterates over the keys with the given status, in the order they reached it.
+        """
+        return iter(self.keys_by_status[status])
+
+    def count(self, status: FutureStatus) -> int:
+        return len(self.keys_by_status[status])
+
+    def is_complete(self) -> bool:
+        return self.count(FutureStatus.WAITING) == 0 and self.count(FutureStatus.RUNNING) == 0
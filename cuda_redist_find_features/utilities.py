@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
+import secrets
+from pathlib import Path
 
 import rich.logging
 
@@ -16,3 +20,28 @@ def get_logger(name: str) -> logging.Logger:
     logger.addHandler(handler)
 
     return logger
+
+
+def write_if_changed(path: Path, content: bytes) -> bool:
+    """
+    Writes `content` to `path` unless the file already holds exactly that, returning whether it was written.
+
+    Unchanged files keep their modification time. Otherwise, the content is written to a temporary file next to `path`,
+    which then replaces it, so readers never see a partially written file, even if the process dies mid-write.
+    """
+    if path.exists() and hashlib.sha256(path.read_bytes()).digest() == hashlib.sha256(content).digest():
+        return False
+
+    temp_path = path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp")
+    # Keep the permissions of the file being replaced; new files get those `open` would give them.
+    mode = path.stat().st_mode & 0o777 if path.exists() else 0o666
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+    try:
+        with os.fdopen(fd, "wb", buffering=0) as f:
+            f.write(content)
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return True
@@ -7,9 +7,7 @@
   # propagatedBuildInputs
   annotated-types,
   click,
-  cudaPackages,
   nix,
-  patchelf,
   pydantic,
   rich,
   typing-extensions,
@@ -39,24 +37,14 @@ let
       flit-core
       makeWrapper
     ];
-    propagatedBuildInputs = [
-      cudaPackages.cuda_cuobjdump
-      nix
-      patchelf
-    ] ++ pythonPropagatedBuildInputs;
+    propagatedBuildInputs = [ nix ] ++ pythonPropagatedBuildInputs;
     pythonImportsCheck =
       builtins.map (drv: toModuleName drv.pname)
         # Check all python propagated build inputs and the package itself
         (pythonPropagatedBuildInputs ++ [ finalAttrs ]);
     postInstall = ''
       wrapProgram "$out/bin/${finalAttrs.meta.mainProgram}" \
-        --prefix PATH : "${
-          lib.strings.makeBinPath [
-            cudaPackages.cuda_cuobjdump
-            nix
-            patchelf
-          ]
-        }"
+        --prefix PATH : "${lib.strings.makeBinPath [ nix ]}"
     '';
     passthru.optional-dependencies.dev = [
       pyright
@@ -0,0 +1,121 @@
+import gzip
+import threading
+import time
+import zlib
+from collections.abc import Generator, Mapping
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+@dataclass
+class Resource:
+    """
+    A resource served by `LocalHttpServer`, with the validators, encoding, redirect or delay to serve it with.
+    """
+
+    content: bytes = b""
+    etag: None | str = None
+    last_modified: None | str = None
+    encoding: None | str = None
+    location: None | str = None
+    delay: float = 0.0
+
+
+@dataclass(frozen=True)
+class Request:
+    path: str
+    headers: Mapping[str, str]
+    port: int
+    status: int
+
+
+@dataclass
+class LocalHttpServer:
+    """
+    An HTTP/1.1 server on localhost which keeps connections alive and records every request it answers.
+    """
+
+    port: int = 0
+    resources: dict[str, Resource] = field(default_factory=dict[str, Resource])
+    requests: list[Request] = field(default_factory=list[Request])
+    in_flight: int = 0
+    max_in_flight: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    def serve(self, handler: BaseHTTPRequestHandler) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            status, headers, body = self._respond(handler)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+        request = Request(handler.path, dict(handler.headers.items()), handler.client_address[1], status)
+        with self._lock:
+            self.requests.append(request)
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _respond(self, handler: BaseHTTPRequestHandler) -> tuple[int, Mapping[str, str], bytes]:
+        resource = self.resources.get(handler.path)
+        if resource is None:
+            return 404, {}, b""
+        time.sleep(resource.delay)
+        if resource.location is not None:
+            return 301, {"Location": resource.location}, b""
+
+        headers: dict[str, str] = {}
+        if resource.etag is not None:
+            headers["ETag"] = resource.etag
+        if resource.last_modified is not None:
+            headers["Last-Modified"] = resource.last_modified
+        if_none_match = handler.headers.get("If-None-Match")
+        if_modified_since = handler.headers.get("If-Modified-Since")
+        if (if_none_match is not None and if_none_match == resource.etag) or (
+            if_none_match is None and if_modified_since is not None and if_modified_since == resource.last_modified
+        ):
+            return 304, headers, b""
+
+        body = resource.content
+        accepted = handler.headers.get("Accept-Encoding", "")
+        if resource.encoding is not None and resource.encoding in accepted:
+            headers["Content-Encoding"] = resource.encoding
+            body = gzip.compress(body) if resource.encoding == "gzip" else zlib.compress(body)
+        return 200, headers, body
+
+
+@pytest.fixture
+def http_server() -> Generator[LocalHttpServer, None, None]:
+    server = LocalHttpServer()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:
+            server.serve(self)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    server.port = httpd.server_address[1]
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join()
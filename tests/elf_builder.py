@@ -0,0 +1,147 @@
+"""
+Builds small synthetic ELF files for the tests, laid out like those produced by a linker: the ELF header, the program
+headers, the contents of the sections, and finally the section headers.
+"""
+
+import struct
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Literal
+
+_VADDR = 0x400000
+_ALIGN = 8
+
+_SHT_PROGBITS = 1
+_SHT_STRTAB = 3
+_SHT_DYNAMIC = 6
+_PT_LOAD = 1
+_PT_DYNAMIC = 2
+_DT_NULL = 0
+_DT_NEEDED = 1
+_DT_STRTAB = 5
+_DT_SONAME = 14
+
+
+@dataclass(frozen=True)
+class _Section:
+    name: str
+    type: int
+    offset: int
+    size: int
+    link: int
+
+
+@dataclass
+class _ElfBuilder:
+    is_64_bit: bool
+    byte_order: Literal["<", ">"]
+    phnum: int
+    data: bytearray = field(default_factory=bytearray)
+    sections: list[_Section] = field(default_factory=list[_Section])
+
+    def __post_init__(self) -> None:
+        self.data.extend(b"\0" * (self.ehsize + self.phnum * self.phentsize))
+        self._align()
+
+    @property
+    def ehsize(self) -> int:
+        return 64 if self.is_64_bit else 52
+
+    @property
+    def phentsize(self) -> int:
+        return 56 if self.is_64_bit else 32
+
+    @property
+    def shentsize(self) -> int:
+        return 64 if self.is_64_bit else 40
+
+    def pack(self, format_64: str, format_32: str, *values: int) -> bytes:
+        return struct.pack(self.byte_order + (format_64 if self.is_64_bit else format_32), *values)
+
+    def add_section(self, name: str, type: int, content: bytes, link: int = 0) -> int:
+        offset = len(self.data)
+        self.data.extend(content)
+        self._align()
+        self.sections.append(_Section(name, type, offset, len(content), link))
+        return offset
+
+    def add_dynamic(self, soname: None | str, needed: Sequence[str]) -> _Section:
+        dynstr = bytearray(b"\0")
+        entries: list[tuple[int, int]] = []
+        for tag, name in [*([(_DT_SONAME, soname)] if soname is not None else []), *((_DT_NEEDED, n) for n in needed)]:
+            entries.append((tag, len(dynstr)))
+            dynstr.extend(name.encode() + b"\0")
+        # The string table is the first section after the null section, as the link of the dynamic section says.
+        dynstr_offset = self.add_section(".dynstr", _SHT_STRTAB, bytes(dynstr))
+        entries += [(_DT_STRTAB, _VADDR + dynstr_offset), (_DT_NULL, 0)]
+        content = b"".join(self.pack("qQ", "iI", tag, value) for tag, value in entries)
+        self.add_section(".dynamic", _SHT_DYNAMIC, content, link=1)
+        return self.sections[-1]
+
+    def add_section_headers(self) -> int:
+        shstrtab = bytearray(b"\0")
+        names: list[int] = []
+        for name in [*(section.name for section in self.sections), ".shstrtab"]:
+            names.append(len(shstrtab))
+            shstrtab.extend(name.encode() + b"\0")
+        self.add_section(".shstrtab", _SHT_STRTAB, bytes(shstrtab))
+
+        shoff = len(self.data)
+        self.data.extend(self.pack("IIQQQQIIQQ", "IIIIIIIIII", *[0] * 10))
+        for name, section in zip(names, self.sections, strict=True):
+            self.data.extend(
+                self.pack(
+                    "IIQQQQIIQQ",
+                    "IIIIIIIIII",
+                    *(name, section.type, 0, _VADDR + section.offset, section.offset, section.size),
+                    *(section.link, 0, 1, 0),
+                )
+            )
+        return shoff
+
+    def program_header(self, type: int, offset: int, size: int) -> bytes:
+        vaddr = _VADDR + offset
+        if self.is_64_bit:
+            return self.pack("IIQQQQQQ", "", type, 0, offset, vaddr, vaddr, size, size, _ALIGN)
+        return self.pack("", "IIIIIIII", type, offset, vaddr, vaddr, size, size, 0, _ALIGN)
+
+    def _align(self) -> None:
+        self.data.extend(b"\0" * (-len(self.data) % _ALIGN))
+
+
+def build_elf(
+    is_64_bit: bool = True,
+    byte_order: Literal["<", ">"] = "<",
+    soname: None | str = None,
+    needed: Sequence[str] = (),
+    dynamic: bool = True,
+    section_headers: bool = True,
+    sections: Mapping[str, bytes] = {},
+    flags: int = 0,
+) -> bytes:
+    """
+    Builds a shared library, or a statically linked executable without `dynamic`, with the given extra sections.
+
+    Without `section_headers`, the section headers are left out, as `strip --strip-section-headers` does.
+    """
+    builder = _ElfBuilder(is_64_bit, byte_order, phnum=2 if dynamic else 1)
+    dynamic_section = builder.add_dynamic(soname, needed) if dynamic else None
+    for name, content in sections.items():
+        builder.add_section(name, _SHT_PROGBITS, content)
+    shoff = builder.add_section_headers() if section_headers else 0
+    shnum = len(builder.sections) + 1 if section_headers else 0
+
+    program_headers = builder.program_header(_PT_LOAD, 0, len(builder.data))
+    if dynamic_section is not None:
+        program_headers += builder.program_header(_PT_DYNAMIC, dynamic_section.offset, dynamic_section.size)
+    builder.data[builder.ehsize : builder.ehsize + len(program_headers)] = program_headers
+
+    ident = b"\x7fELF" + bytes([2 if is_64_bit else 1, 2 if byte_order == ">" else 1, 1]) + b"\0" * 9
+    header = builder.pack(
+        "HHIQQQIHHHHHH",
+        "HHIIIIIHHHHHH",
+        *(3 if dynamic else 2, 0, 1, 0, builder.ehsize, shoff, flags),
+        *(builder.ehsize, builder.phentsize, builder.phnum, builder.shentsize, shnum, max(0, shnum - 1)),
+    )
+    builder.data[: builder.ehsize] = ident + header
+    return bytes(builder.data)
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any
+
+import pytest
+
+from cuda_redist_find_features.types import AsyncPipeline, ByteBudget, PipelineStage, Reservations
+
+WORKERS = 48
+# `on_start` raises for the second item to start.
+FAILING_START = 2
+
+
+async def double(value: int) -> int:
+    await asyncio.sleep(0)
+    return value * 2
+
+
+def test_items_flow_through_stages() -> None:
+    stages = [PipelineStage("double", double, 2), PipelineStage("double", double, 1)]
+    with AsyncPipeline[int, int].start(stages) as pipeline:
+        futures = [pipeline.submit(value) for value in range(8)]
+    assert [future.result() for future in futures] == [value * 4 for value in range(8)]
+    assert (pipeline.stats.completed, pipeline.stats.failed) == (8, 0)
+
+
+def test_stages_are_not_limited_by_the_default_executor() -> None:
+    # Every worker blocks a thread until all of them are running, which the default executor, with at most 32 threads,
+    # would never allow.
+    barrier = threading.Barrier(WORKERS)
+
+    async def wait(value: int) -> int:
+        await asyncio.to_thread(barrier.wait, 10)
+        return value
+
+    with AsyncPipeline[int, int].start([PipelineStage("wait", wait, WORKERS)]) as pipeline:
+        futures = [pipeline.submit(value) for value in range(WORKERS)]
+    assert [future.result() for future in futures] == list(range(WORKERS))
+
+
+def test_admission_failures_are_set_on_their_futures() -> None:
+    budget = ByteBudget("test", 1024)
+
+    def admit(value: int) -> Reservations:
+        if value == 1:
+            raise ValueError(value)
+        return [(budget, 512)]
+
+    started: list[Future[Any]] = []
+
+    def on_start(future: Future[Any]) -> None:
+        started.append(future)
+        # Items start in the order they were submitted, so this is the third item, the second having failed to admit.
+        if len(started) == FAILING_START:
+            raise RuntimeError("on_start")
+
+    with AsyncPipeline[int, int].start([PipelineStage("double", double, 1)], admit, on_start) as pipeline:
+        futures = [pipeline.submit(value) for value in range(4)]
+
+    assert [futures[0].result(), futures[3].result()] == [0, 6]
+    with pytest.raises(ValueError, match="1"):
+        futures[1].result()
+    with pytest.raises(RuntimeError, match="on_start"):
+        futures[2].result()
+    # The budget of the item which failed to start was released.
+    assert budget.used == 0
+    assert (pipeline.stats.completed, pipeline.stats.failed, pipeline.stats.active) == (2, 2, 0)
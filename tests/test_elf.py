@@ -0,0 +1,74 @@
+from pathlib import Path
+from typing import Literal
+
+import pytest
+from elf_builder import build_elf
+
+from cuda_redist_find_features.manifest.feature.detectors.utilities import ElfDynamic, ElfFile
+
+FLAGS = 0x5A5A
+
+LAYOUTS = pytest.mark.parametrize(
+    ("is_64_bit", "byte_order"),
+    [(False, "<"), (False, ">"), (True, "<"), (True, ">")],
+    ids=["ELFCLASS32-LSB", "ELFCLASS32-MSB", "ELFCLASS64-LSB", "ELFCLASS64-MSB"],
+)
+
+
+def read_dynamic(path: Path) -> ElfDynamic:
+    with ElfFile.open(path) as elf:
+        assert elf is not None
+        return elf.dynamic()
+
+
+@LAYOUTS
+def test_dynamic(tmp_path: Path, is_64_bit: bool, byte_order: Literal["<", ">"]) -> None:
+    path = tmp_path / "libfoo.so.1"
+    path.write_bytes(
+        build_elf(is_64_bit, byte_order, soname="libfoo.so.1", needed=["libcudart.so.12", "libc.so.6"], flags=FLAGS)
+    )
+    with ElfFile.open(path) as elf:
+        assert elf is not None
+        assert elf.flags == FLAGS
+        assert elf.section(".dynamic") is not None
+        assert elf.section(".nv_fatbin") is None
+        assert elf.dynamic() == ElfDynamic(soname="libfoo.so.1", needed=["libcudart.so.12", "libc.so.6"])
+
+
+@LAYOUTS
+def test_dynamic_without_section_headers(tmp_path: Path, is_64_bit: bool, byte_order: Literal["<", ">"]) -> None:
+    # With the section headers stripped, the dynamic section is found through PT_DYNAMIC and the string table
+    # through DT_STRTAB.
+    path = tmp_path / "libfoo.so.1"
+    path.write_bytes(
+        build_elf(is_64_bit, byte_order, soname="libfoo.so.1", needed=["libc.so.6"], section_headers=False)
+    )
+    with ElfFile.open(path) as elf:
+        assert elf is not None
+        assert elf.sections == []
+        assert elf.dynamic() == ElfDynamic(soname="libfoo.so.1", needed=["libc.so.6"])
+
+
+@LAYOUTS
+def test_static(tmp_path: Path, is_64_bit: bool, byte_order: Literal["<", ">"]) -> None:
+    path = tmp_path / "foo"
+    path.write_bytes(build_elf(is_64_bit, byte_order, dynamic=False, sections={".text": b"\x90" * 16}))
+    assert read_dynamic(path) == ElfDynamic(soname=None, needed=[])
+
+
+def test_without_soname(tmp_path: Path) -> None:
+    path = tmp_path / "foo"
+    path.write_bytes(build_elf(needed=["libc.so.6"]))
+    assert read_dynamic(path) == ElfDynamic(soname=None, needed=["libc.so.6"])
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"", b"\x7fELF", b"\x7fELF\x02\x01\x01", b"#!/bin/sh\necho hello, world\n"],
+    ids=["empty", "magic-only", "truncated-ident", "script"],
+)
+def test_not_elf(tmp_path: Path, content: bytes) -> None:
+    path = tmp_path / "foo"
+    path.write_bytes(content)
+    with ElfFile.open(path) as elf:
+        assert elf is None
@@ -0,0 +1,83 @@
+import struct
+from pathlib import Path
+
+from elf_builder import build_elf
+
+from cuda_redist_find_features.manifest.feature.detectors.utilities import ElfFile, fatbin_entries
+
+FATBIN_MAGIC = 0xBA55ED50
+FATBIN_HEADER = struct.Struct("<IHHQ")
+ENTRY_HEADER = struct.Struct("<HHIQIIHHIIIQQQ")
+
+KIND_PTX = 1
+KIND_ELF = 2
+FLAG_COMPRESSED = 0x2000
+EF_CUDA_ACCELERATORS = 0x800
+
+PTX = b"//\n// Generated by NVIDIA NVVM Compiler\n//\n\n.version 8.4\n.target sm_90a\n.address_size 64\n"
+
+
+def entry(kind: int, arch: int, payload: bytes, flags: int = 0, header_size: int = ENTRY_HEADER.size) -> bytes:
+    header = ENTRY_HEADER.pack(kind, 0x0101, header_size, len(payload), 0, 0, 0, 0, arch, 0, 0, flags, 0, 0)
+    return header + payload
+
+
+def container(*entries: bytes, header_size: int = FATBIN_HEADER.size) -> bytes:
+    body = b"".join(entries)
+    return FATBIN_HEADER.pack(FATBIN_MAGIC, 1, header_size, len(body)) + body
+
+
+def cubin(arch: int, accelerators: bool = False) -> bytes:
+    return build_elf(dynamic=False, flags=arch | (EF_CUDA_ACCELERATORS if accelerators else 0))
+
+
+def cuda_archs(tmp_path: Path, fatbin: bytes) -> list[str]:
+    path = tmp_path / "libfoo.so"
+    path.write_bytes(build_elf(soname="libfoo.so", sections={".nv_fatbin": fatbin}))
+    with ElfFile.open(path) as elf:
+        assert elf is not None
+        return [entry.cuda_arch for entry in fatbin_entries(elf)]
+
+
+def test_entries(tmp_path: Path) -> None:
+    fatbin = container(
+        entry(KIND_PTX, 90, PTX),
+        entry(KIND_ELF, 90, cubin(90, accelerators=True)),
+        entry(KIND_ELF, 80, cubin(80)),
+    )
+    assert cuda_archs(tmp_path, fatbin) == ["sm_90a", "sm_90a", "sm_80"]
+
+
+def test_compressed_entries_lose_their_suffix(tmp_path: Path) -> None:
+    # Unlike cuobjdump, which decompresses the payload, a compressed sm_90a cubin is reported as sm_90.
+    fatbin = container(entry(KIND_ELF, 90, b"\x00compressed\x00", flags=FLAG_COMPRESSED))
+    assert cuda_archs(tmp_path, fatbin) == ["sm_90"]
+
+
+def test_padding_between_containers_is_skipped(tmp_path: Path) -> None:
+    fatbin = container(entry(KIND_PTX, 90, PTX)) + b"\0" * 24 + container(entry(KIND_ELF, 80, cubin(80)))
+    assert cuda_archs(tmp_path, fatbin) == ["sm_90a", "sm_80"]
+
+
+def test_other_entry_kinds_are_skipped(tmp_path: Path) -> None:
+    fatbin = container(entry(4, 90, b"\0" * 16), entry(KIND_ELF, 80, cubin(80)))
+    assert cuda_archs(tmp_path, fatbin) == ["sm_80"]
+
+
+def test_zero_header_sizes_are_not_followed(tmp_path: Path) -> None:
+    fatbin = (
+        container(entry(KIND_ELF, 70, cubin(70)), header_size=0)
+        + container(entry(KIND_ELF, 75, cubin(75), header_size=0), entry(KIND_ELF, 86, cubin(86)))
+        + container(entry(KIND_ELF, 80, cubin(80)))
+    )
+    # The first container is skipped over in steps of its alignment, so its entries are not reported; the walk of
+    # the second stops at its corrupt entry.
+    assert cuda_archs(tmp_path, fatbin) == ["sm_80"]
+
+
+def test_without_fatbin(tmp_path: Path) -> None:
+    path = tmp_path / "libfoo.so"
+    path.write_bytes(build_elf(soname="libfoo.so"))
+    with ElfFile.open(path) as elf:
+        assert elf is not None
+        assert list(fatbin_entries(elf)) == []
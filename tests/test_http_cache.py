@@ -0,0 +1,107 @@
+from collections.abc import Generator
+from http import HTTPStatus
+from pathlib import Path
+
+import pytest
+from conftest import LocalHttpServer, Resource
+from pydantic import HttpUrl
+
+from cuda_redist_find_features.manifest.nvidia import NvidiaManifestRef
+from cuda_redist_find_features.types import HttpCache, HttpClient, HttpUrlTA, VersionConstraint, VersionTA
+
+MANIFEST_PATH = "/redist/redistrib_12.0.0.json"
+LAST_MODIFIED = "Sun, 01 Jan 2023 00:00:00 GMT"
+
+
+@pytest.fixture
+def http_cache(tmp_path: Path) -> Generator[HttpCache, None, None]:
+    with HttpCache.open(tmp_path / "http.sqlite") as http_cache:
+        yield http_cache
+
+
+def manifest_ref(http_server: LocalHttpServer) -> NvidiaManifestRef[HttpUrl]:
+    return NvidiaManifestRef[HttpUrl](
+        ref=HttpUrlTA.validate_python(http_server.url(MANIFEST_PATH)), version=VersionTA.validate_strings("12.0.0")
+    )
+
+
+def retrieve(http_server: LocalHttpServer, http_cache: HttpCache) -> bytes:
+    return manifest_ref(http_server).retrieve(http_cache=http_cache)
+
+
+def test_etag(http_server: LocalHttpServer, http_cache: HttpCache) -> None:
+    http_server.resources[MANIFEST_PATH] = Resource(b'{"v": 1}', etag='"v1"')
+    assert retrieve(http_server, http_cache) == b'{"v": 1}'
+    assert retrieve(http_server, http_cache) == b'{"v": 1}'
+
+    first, second = http_server.requests
+    assert (first.status, "If-None-Match" in first.headers) == (HTTPStatus.OK, False)
+    assert (second.status, second.headers.get("If-None-Match")) == (HTTPStatus.NOT_MODIFIED, '"v1"')
+
+    # Once the content changes, it is downloaded, and later requests are conditional on the new ETag.
+    http_server.resources[MANIFEST_PATH] = Resource(b'{"v": 2}', etag='"v2"')
+    assert retrieve(http_server, http_cache) == b'{"v": 2}'
+    assert retrieve(http_server, http_cache) == b'{"v": 2}'
+    assert [request.status for request in http_server.requests[2:]] == [HTTPStatus.OK, HTTPStatus.NOT_MODIFIED]
+    assert http_server.requests[3].headers.get("If-None-Match") == '"v2"'
+
+
+def test_last_modified(http_server: LocalHttpServer, http_cache: HttpCache) -> None:
+    http_server.resources[MANIFEST_PATH] = Resource(b'{"v": 1}', last_modified=LAST_MODIFIED)
+    assert retrieve(http_server, http_cache) == b'{"v": 1}'
+    assert retrieve(http_server, http_cache) == b'{"v": 1}'
+
+    first, second = http_server.requests
+    assert (first.status, "If-Modified-Since" in first.headers) == (HTTPStatus.OK, False)
+    assert (second.status, second.headers.get("If-Modified-Since")) == (HTTPStatus.NOT_MODIFIED, LAST_MODIFIED)
+
+    http_server.resources[MANIFEST_PATH] = Resource(b'{"v": 2}', last_modified="Mon, 02 Jan 2023 00:00:00 GMT")
+    assert retrieve(http_server, http_cache) == b'{"v": 2}'
+    assert http_server.requests[-1].status == HTTPStatus.OK
+
+
+def test_without_validators(http_server: LocalHttpServer, http_cache: HttpCache) -> None:
+    http_server.resources[MANIFEST_PATH] = Resource(b'{"v": 1}')
+    assert retrieve(http_server, http_cache) == b'{"v": 1}'
+    assert retrieve(http_server, http_cache) == b'{"v": 1}'
+    assert [request.status for request in http_server.requests] == [HTTPStatus.OK, HTTPStatus.OK]
+    assert http_cache.get(http_server.url(MANIFEST_PATH)) is None
+
+
+def test_cache_outlives_connection(http_server: LocalHttpServer, tmp_path: Path) -> None:
+    http_server.resources[MANIFEST_PATH] = Resource(b'{"v": 1}', etag='"v1"')
+    for _ in range(2):
+        with HttpCache.open(tmp_path / "http.sqlite") as http_cache:
+            assert retrieve(http_server, http_cache) == b'{"v": 1}'
+    assert [request.status for request in http_server.requests] == [HTTPStatus.OK, HTTPStatus.NOT_MODIFIED]
+
+
+def test_download_unchanged(http_server: LocalHttpServer, http_cache: HttpCache, tmp_path: Path) -> None:
+    http_server.resources[MANIFEST_PATH] = Resource(b'{"v": 1}', etag='"v1"')
+    manifest_dir = tmp_path / "manifests"
+    manifest_dir.mkdir()
+
+    with HttpClient.open() as http_client:
+        downloaded = manifest_ref(http_server).download(manifest_dir, http_client, http_cache)
+        stat = downloaded.ref.stat()
+
+        # A 304 is answered from the cache, and the manifest, whose content did not change, is not rewritten.
+        manifest_ref(http_server).download(manifest_dir, http_client, http_cache)
+        assert http_server.requests[-1].status == HTTPStatus.NOT_MODIFIED
+        assert (downloaded.ref.stat().st_ino, downloaded.ref.stat().st_mtime_ns) == (stat.st_ino, stat.st_mtime_ns)
+
+        http_server.resources[MANIFEST_PATH] = Resource(b'{"v": 2}', etag='"v2"')
+        manifest_ref(http_server).download(manifest_dir, http_client, http_cache)
+        assert http_server.requests[-1].status == HTTPStatus.OK
+        assert downloaded.ref.read_bytes() == b'{"v": 2}'
+
+
+def test_directory_listing(http_server: LocalHttpServer, http_cache: HttpCache) -> None:
+    listing = b'<a href="redistrib_12.0.0.json">redistrib_12.0.0.json</a>\n'
+    http_server.resources["/redist"] = Resource(listing, etag='"listing"')
+    url = HttpUrlTA.validate_python(http_server.url("/redist"))
+
+    for _ in range(2):
+        refs = NvidiaManifestRef[HttpUrl].from_ref(url, VersionConstraint(), http_cache=http_cache)
+        assert [str(ref.version) for ref in refs] == ["12.0.0"]
+    assert [request.status for request in http_server.requests] == [HTTPStatus.OK, HTTPStatus.NOT_MODIFIED]
@@ -0,0 +1,86 @@
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from conftest import LocalHttpServer, Resource
+
+from cuda_redist_find_features.types import HttpClient
+
+CONTENT = b'{"release_date": "2023-01-01"}\n' * 64
+
+
+def test_connections_are_reused(http_server: LocalHttpServer) -> None:
+    http_server.resources["/a"] = Resource(CONTENT)
+    http_server.resources["/b"] = Resource(CONTENT)
+
+    with HttpClient.open() as http_client:
+        for path in ("/a", "/b", "/a"):
+            assert http_client.get(http_server.url(path)).content == CONTENT
+        assert [len(pool.idle) for pool in http_client.pools.values()] == [1]
+
+    assert len({request.port for request in http_server.requests}) == 1
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "deflate"])
+def test_encodings_are_decoded(http_server: LocalHttpServer, encoding: str) -> None:
+    http_server.resources["/a"] = Resource(CONTENT, encoding=encoding)
+
+    with HttpClient.open() as http_client:
+        response = http_client.get(http_server.url("/a"))
+
+    assert response.headers.get("Content-Encoding") == encoding
+    assert response.content == CONTENT
+    assert http_server.requests[0].headers.get("Accept-Encoding") == "gzip, deflate"
+
+
+def test_redirects_are_followed(http_server: LocalHttpServer) -> None:
+    http_server.resources["/redist"] = Resource(location="/redist/")
+    http_server.resources["/redist/"] = Resource(CONTENT)
+
+    with HttpClient.open() as http_client:
+        response = http_client.get(http_server.url("/redist"))
+
+    assert (response.status, response.content) == (HTTPStatus.OK, CONTENT)
+    assert [request.path for request in http_server.requests] == ["/redist", "/redist/"]
+
+
+def test_redirect_loops_fail(http_server: LocalHttpServer) -> None:
+    http_server.resources["/loop"] = Resource(location="/loop")
+
+    with HttpClient.open() as http_client, pytest.raises(RuntimeError, match="redirects"):
+        http_client.get(http_server.url("/loop"))
+
+
+def test_connections_per_host_are_capped(http_server: LocalHttpServer) -> None:
+    max_connections_per_host = 2
+    http_server.resources["/slow"] = Resource(CONTENT, delay=0.2)
+
+    with (
+        HttpClient.open(max_connections_per_host=max_connections_per_host) as http_client,
+        ThreadPoolExecutor(8) as pool,
+    ):
+        responses = list(pool.map(http_client.get, [http_server.url("/slow")] * 8))
+
+    assert all(response.content == CONTENT for response in responses)
+    # Requests beyond the cap waited for a connection to free up rather than opening their own.
+    assert http_server.max_in_flight == max_connections_per_host
+    assert len({request.port for request in http_server.requests}) == max_connections_per_host
+
+
+def test_closed_connections_are_replaced(http_server: LocalHttpServer) -> None:
+    http_server.resources["/a"] = Resource(CONTENT)
+
+    with HttpClient.open() as http_client:
+        http_client.get(http_server.url("/a"))
+        # Simulate the kept-alive connection being torn down while it sat idle.
+        for pool in http_client.pools.values():
+            for connection in pool.idle:
+                assert connection.sock is not None
+                connection.sock.shutdown(socket.SHUT_RDWR)
+        assert http_client.get(http_server.url("/a")).content == CONTENT
+
+    # Both requests were answered, the second on a new connection.
+    first, second = http_server.requests
+    assert (first.status, second.status) == (HTTPStatus.OK, HTTPStatus.OK)
+    assert first.port != second.port
@@ -0,0 +1,72 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from cuda_redist_find_features.cmd import process_manifests_impl
+from cuda_redist_find_features.cmd.process_manifests_impl import (
+    load_unchanged_features,
+    sha256_manifest_path_of,
+    write_feature_manifest,
+)
+from cuda_redist_find_features.manifest.feature import FeaturePackageDepsUnresolved
+from cuda_redist_find_features.manifest.nvidia import NvidiaManifest
+from cuda_redist_find_features.types import PackageId, VersionTA
+
+VERSION = VersionTA.validate_strings("12.0.0")
+
+NVIDIA_MANIFEST = {
+    "release_date": "2023-01-01",
+    "cuda_cccl": {
+        "name": "CXX Core Compute Libraries",
+        "license": "CUDA Toolkit",
+        "version": "12.0.90",
+        "linux-x86_64": {
+            "relative_path": "cuda_cccl/linux-x86_64/cuda_cccl-linux-x86_64-12.0.90-archive.tar.xz",
+            "sha256": "0" * 64,
+            "md5": "0" * 32,
+            "size": "1234",
+        },
+    },
+}
+
+FEATURE_PACKAGE = FeaturePackageDepsUnresolved.model_validate({
+    "outputs": {"bin": False, "dev": True, "doc": False, "lib": False, "static": False, "sample": False},
+    "cudaArchitectures": [],
+    "providedLibs": [],
+    "neededLibs": [],
+})
+
+
+@pytest.fixture
+def manifest_dir(tmp_path: Path) -> Path:
+    file_path = tmp_path / "redistrib_12.0.0.json"
+    file_path.write_text(json.dumps(NVIDIA_MANIFEST))
+    manifest = NvidiaManifest.model_validate(NVIDIA_MANIFEST)
+    package_id = PackageId("linux-x86_64", "cuda_cccl", VERSION)
+    write_feature_manifest(file_path, VERSION, manifest, {package_id: FEATURE_PACKAGE})
+    return tmp_path
+
+
+def load(manifest_dir: Path) -> dict[PackageId, FeaturePackageDepsUnresolved]:
+    file_path = manifest_dir / "redistrib_12.0.0.json"
+    manifest = NvidiaManifest.model_validate_json(file_path.read_bytes())
+    return dict(load_unchanged_features({file_path: (VERSION, manifest)}))
+
+
+def test_unchanged_features_are_loaded(manifest_dir: Path) -> None:
+    assert load(manifest_dir) == {PackageId("linux-x86_64", "cuda_cccl", VERSION): FEATURE_PACKAGE}
+
+
+def test_features_of_other_detector_versions_are_not_loaded(
+    manifest_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(process_manifests_impl, "DETECTOR_VERSION", process_manifests_impl.DETECTOR_VERSION + 1)
+    assert load(manifest_dir) == {}
+
+
+def test_features_without_a_detector_version_are_not_loaded(manifest_dir: Path) -> None:
+    sha256_manifest_path = sha256_manifest_path_of(manifest_dir / "feature_12.0.0.json")
+    sha256_manifest = json.loads(sha256_manifest_path.read_bytes())
+    sha256_manifest_path.write_text(json.dumps(sha256_manifest["sha256s"]))
+    assert load(manifest_dir) == {}
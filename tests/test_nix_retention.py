@@ -0,0 +1,56 @@
+from pathlib import Path
+
+from cuda_redist_find_features.types import NixStoreRetention
+
+CAPACITY = 100
+
+
+def store_paths(tmp_path: Path, *names: str) -> list[Path]:
+    paths = [tmp_path / name for name in names]
+    for path in paths:
+        path.touch()
+    return paths
+
+
+def test_least_recently_used_paths_are_evicted(tmp_path: Path) -> None:
+    old, new = store_paths(tmp_path, "old", "new")
+    with NixStoreRetention.open(tmp_path / "retention.sqlite", CAPACITY) as retention:
+        assert retention.use({old: 60}) == {}
+        assert retention.use({new: 60}) == {old: 60}
+
+
+def test_pinned_paths_are_kept_until_used(tmp_path: Path) -> None:
+    old, new = store_paths(tmp_path, "old", "new")
+    with NixStoreRetention.open(tmp_path / "retention.sqlite", CAPACITY) as retention:
+        retention.use({old: 60})
+        retention.pin([old])
+        assert retention.use({new: 60}) == {}
+        # Using the pinned path unpins it, leaving the other to be evicted.
+        assert retention.use({old: 60}) == {new: 60}
+
+
+def test_unpacked_paths_are_pinned_with_their_archives(tmp_path: Path) -> None:
+    archive, unpacked, other = store_paths(tmp_path, "archive", "unpacked", "other")
+    with NixStoreRetention.open(tmp_path / "retention.sqlite", CAPACITY) as retention:
+        retention.pin_unpacked(archive, unpacked)
+        assert retention.use({unpacked: 60}) == {}
+        assert retention.use({archive: 10}) == {}
+
+    # A later run which finds the archive in the Nix store keeps its unpacked archive until it is used again.
+    with NixStoreRetention.open(tmp_path / "retention.sqlite", CAPACITY, pinned=[archive]) as retention:
+        assert retention.pinned == {archive, unpacked}
+        assert retention.use({other: 60}) == {}
+
+    with NixStoreRetention.open(tmp_path / "retention.sqlite", CAPACITY) as retention:
+        assert retention.use({other: 60}) == {unpacked: 60}
+
+
+def test_paths_no_longer_in_the_store_are_forgotten(tmp_path: Path) -> None:
+    archive, unpacked = store_paths(tmp_path, "archive", "unpacked")
+    with NixStoreRetention.open(tmp_path / "retention.sqlite", CAPACITY) as retention:
+        retention.pin_unpacked(archive, unpacked)
+        retention.use({archive: 10, unpacked: 60})
+
+    unpacked.unlink()
+    with NixStoreRetention.open(tmp_path / "retention.sqlite", CAPACITY, pinned=[archive]) as retention:
+        assert retention.pinned == {archive}
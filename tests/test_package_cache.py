@@ -0,0 +1,33 @@
+from pathlib import Path
+
+import pytest
+
+from cuda_redist_find_features.manifest.feature import FeaturePackageCache, FeaturePackageDepsUnresolved
+from cuda_redist_find_features.types import Sha256TA
+
+SHA256 = Sha256TA.validate_python("0" * 64)
+
+FEATURE_PACKAGE = FeaturePackageDepsUnresolved.model_validate({
+    "outputs": {"bin": False, "dev": True, "doc": False, "lib": True, "static": False, "sample": False},
+    "cudaArchitectures": ["sm_80"],
+    "providedLibs": ["libcudart.so.12"],
+    "neededLibs": [],
+})
+
+
+def test_put_survives_exception(tmp_path: Path) -> None:
+    path = tmp_path / "features.sqlite"
+    with pytest.raises(RuntimeError), FeaturePackageCache.open(path) as cache:
+        cache.put(SHA256, FEATURE_PACKAGE)
+        raise RuntimeError("run failed")
+
+    with FeaturePackageCache.open(path) as cache:
+        assert cache.get(SHA256) == FEATURE_PACKAGE
+
+
+def test_put_is_visible_to_other_connections(tmp_path: Path) -> None:
+    path = tmp_path / "features.sqlite"
+    with FeaturePackageCache.open(path) as cache, FeaturePackageCache.open(path) as other:
+        cache.put(SHA256, FEATURE_PACKAGE)
+        assert other.get(SHA256) == FEATURE_PACKAGE
+        assert other.stats().entries == 1